@@ -1,18 +1,20 @@
-from app.config.database import get_db_session
+from app.config.database import get_read_session
 from app.controllers.analytics import contacts_by_manager, fetch_portfolio
-from fastapi import APIRouter, Depends
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
 @router.get("/portfolio")
-async def get_portfolio(db: AsyncSession = Depends(get_db_session)):
-    return await fetch_portfolio(db)
+async def get_portfolio(request: Request, db: AsyncSession = Depends(get_read_session)):
+    payload = await kpi_cache.get("portfolio", lambda: fetch_portfolio(db))
+    return await payload.response(request)
 
 
 @router.get("/managers/contacts")
-async def get_contacts_by_manager(db: AsyncSession = Depends(get_db_session)):
+async def get_contacts_by_manager(db: AsyncSession = Depends(get_read_session)):
     data = await contacts_by_manager(db)
     # Adapt the shape to expose manager name, client list and total unique clients
     adapted = []
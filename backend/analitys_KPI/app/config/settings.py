@@ -1,4 +1,5 @@
 import logging  # para manejar los logs o mensajes de error
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -39,10 +40,37 @@ class Stats2Settings(BaseSettings):
     DB_PORT: int = Field(default=1433, env="DB_PORT")
     DB_NAME: str = Field(..., env="DB_NAME")
 
+    # Read replica (optional). When set, reporting and KPI reads use it; user,
+    # password, port and database default to the primary's.
+    DB_READ_HOST: Optional[str] = Field(default=None, env="DB_READ_HOST")
+    DB_READ_PORT: Optional[int] = Field(default=None, env="DB_READ_PORT")
+    DB_READ_USER: Optional[str] = Field(default=None, env="DB_READ_USER")
+    DB_READ_PASSWORD: Optional[str] = Field(default=None, env="DB_READ_PASSWORD")
+    DB_READ_NAME: Optional[str] = Field(default=None, env="DB_READ_NAME")
+    # Staleness policy: maximum replica lag tolerated before reads fall back
+    # to the primary (negative disables the check), and how often it is measured
+    DB_READ_MAX_LAG_SECONDS: int = Field(default=30, env="DB_READ_MAX_LAG_SECONDS")
+    DB_READ_LAG_CHECK_SECONDS: int = Field(default=10, env="DB_READ_LAG_CHECK_SECONDS")
+
+    # Seconds KPI results are served from memory before being recomputed
+    KPI_CACHE_SECONDS: int = Field(default=60, env="KPI_CACHE_SECONDS")
+    # Most KPI results kept; the least recently used are evicted beyond it
+    KPI_CACHE_ENTRIES: int = Field(default=256, env="KPI_CACHE_ENTRIES")
+
     @property
     def DATABASE_URL(self) -> str:
         return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes"
 
+    @property
+    def READ_DATABASE_URL(self) -> Optional[str]:
+        if not self.DB_READ_HOST:
+            return None
+        user = self.DB_READ_USER or self.DB_USER
+        password = self.DB_READ_PASSWORD or self.DB_PASSWORD
+        port = self.DB_READ_PORT or self.DB_PORT
+        name = self.DB_READ_NAME or self.DB_NAME
+        return f"{self.DB_DRIVER}://{user}:{password}@{self.DB_READ_HOST}:{port}/{name}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes&ApplicationIntent=ReadOnly"
+
     @property
     def fast_kwargs(self) -> dict:
         return {
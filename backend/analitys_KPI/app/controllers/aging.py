@@ -0,0 +1,252 @@
+import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models.client import Client
+from app.models.credit import Credit
+from app.models.installment import Installment
+from app.models.manager import Manager
+from app.models.portafolio import Portfolio
+from sqlalchemy import Select, Subquery, and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+INSTALLMENT_PAID = "Pagada"
+
+# Rangos de días de mora: etiqueta y último día (None: abierto)
+AGING_BUCKETS = (
+    ("0-30 días", 30),
+    ("31-60 días", 60),
+    ("61-90 días", 90),
+    ("Más de 90 días", None),
+)
+
+
+def _overdue(as_of: datetime.date) -> Subquery:
+    """
+    Cuotas sin pagar vencidas a ``as_of`` por crédito: la fecha de la más
+    antigua (la antigüedad del crédito), cuántas son y su valor. Usa el
+    índice ``ix_installment_state_due_date``.
+    """
+    return (
+        select(
+            Installment.credit_id,
+            func.min(Installment.due_date).label("oldest_due_date"),
+            func.count(Installment.id).label("overdue_installments"),
+            func.sum(Installment.installments_value).label("overdue_amount"),
+        )
+        .where(
+            Installment.installment_state != INSTALLMENT_PAID,
+            Installment.due_date < as_of,
+        )
+        .group_by(Installment.credit_id)
+        .subquery("overdue")
+    )
+
+
+def _ranked_managers() -> Subquery:
+    """
+    Gestores de cada crédito, el de la gestión más reciente primero: el de
+    ``manager_rank`` 1 es el responsable.
+    """
+    return (
+        select(
+            Installment.credit_id,
+            Manager.id.label("manager_id"),
+            Manager.name.label("manager_name"),
+            func.row_number()
+            .over(
+                partition_by=Installment.credit_id,
+                order_by=(Portfolio.management_date.desc(), Portfolio.id.desc()),
+            )
+            .label("manager_rank"),
+        )
+        .join(Portfolio, Portfolio.installment_id == Installment.id)
+        .join(Manager, Manager.id == Portfolio.manager_id)
+        .subquery("ranked_managers")
+    )
+
+
+def _aged_credits(
+    as_of: datetime.date,
+    zone: Optional[str],
+    manager_id: Optional[int],
+    with_manager: bool,
+) -> Select:
+    """
+    Créditos en mora a ``as_of`` con su rango (posición en ``AGING_BUCKETS``).
+    El rango compara la fecha con límites fijos, sin calcular diferencias de
+    días por fila. El gestor responsable solo se busca cuando hace falta.
+    """
+    overdue = _overdue(as_of)
+    bucket = case(
+        *(
+            (overdue.c.oldest_due_date >= as_of - datetime.timedelta(days=days), i)
+            for i, (_, days) in enumerate(AGING_BUCKETS)
+            if days is not None
+        ),
+        else_=len(AGING_BUCKETS) - 1,
+    )
+    query = (
+        select(
+            Credit.id.label("credit_id"),
+            Credit.payment_reference,
+            Client.name.label("client_name"),
+            Client.zone.label("client_zone"),
+            overdue.c.oldest_due_date,
+            overdue.c.overdue_installments,
+            overdue.c.overdue_amount,
+            bucket.label("bucket"),
+        )
+        .join(overdue, overdue.c.credit_id == Credit.id)
+        .join(Client, Client.id == Credit.client_id)
+    )
+    if zone:
+        query = query.where(Client.zone == zone)
+    if with_manager or manager_id:
+        ranked = _ranked_managers()
+        query = query.add_columns(ranked.c.manager_id, ranked.c.manager_name).outerjoin(
+            ranked, and_(ranked.c.credit_id == Credit.id, ranked.c.manager_rank == 1)
+        )
+        if manager_id:
+            query = query.where(ranked.c.manager_id == manager_id)
+    return query
+
+
+def _empty_buckets() -> List[Dict]:
+    return [
+        {"label": label, "credits": 0, "installments": 0, "amount": 0.0}
+        for label, _ in AGING_BUCKETS
+    ]
+
+
+def _summary(buckets: List[Dict]) -> Dict:
+    return {
+        "overdue_credits": sum(b["credits"] for b in buckets),
+        "overdue_installments": sum(b["installments"] for b in buckets),
+        "overdue_amount": sum(b["amount"] for b in buckets),
+        "buckets": buckets,
+    }
+
+
+async def calculate_aging_buckets(
+    session: AsyncSession,
+    group_by: Optional[str] = None,
+    zone: Optional[str] = None,
+    manager_id: Optional[int] = None,
+) -> Dict:
+    """
+    Créditos, cuotas y saldo vencido por rango de días de mora, en una sola
+    consulta agrupada. Un crédito tiene la antigüedad de su cuota vencida más
+    antigua y todo su saldo vencido cae en ese rango. Con ``group_by``
+    ("zone" o "manager", el gestor de la gestión más reciente) también los
+    rangos de cada grupo, el de mayor saldo primero.
+    """
+    today = datetime.date.today()
+    aged = _aged_credits(today, zone, manager_id, group_by == "manager").subquery(
+        "aged"
+    )
+    if group_by == "zone":
+        group_columns = [aged.c.client_zone]
+    elif group_by == "manager":
+        group_columns = [aged.c.manager_id, aged.c.manager_name]
+    else:
+        group_columns = []
+
+    # Se agrupa por la columna del rango calculada en la subconsulta: SQL
+    # Server no reconoce un CASE con parámetros repetido en SELECT y GROUP BY
+    query = select(
+        *group_columns,
+        aged.c.bucket,
+        func.count(aged.c.credit_id).label("credits"),
+        func.sum(aged.c.overdue_installments).label("installments"),
+        func.sum(aged.c.overdue_amount).label("amount"),
+    ).group_by(*group_columns, aged.c.bucket)
+    rows = (await session.execute(query)).mappings().all()
+
+    totals = _empty_buckets()
+    groups: Dict[Any, Dict] = {}
+    for r in rows:
+        targets = [totals]
+        if group_by == "zone":
+            group = groups.setdefault(
+                r["client_zone"],
+                {"zone": r["client_zone"] or "Sin zona", "buckets": _empty_buckets()},
+            )
+            targets.append(group["buckets"])
+        elif group_by == "manager":
+            group = groups.setdefault(
+                r["manager_id"],
+                {
+                    "manager_id": r["manager_id"],
+                    "manager_name": r["manager_name"] or "Sin asignar",
+                    "buckets": _empty_buckets(),
+                },
+            )
+            targets.append(group["buckets"])
+        for buckets in targets:
+            bucket = buckets[r["bucket"]]
+            bucket["credits"] += r["credits"]
+            bucket["installments"] += int(r["installments"] or 0)
+            bucket["amount"] += float(r["amount"] or 0)
+
+    items = []
+    for group in groups.values():
+        buckets = group.pop("buckets")
+        items.append({**group, **_summary(buckets)})
+    items.sort(key=lambda x: x["overdue_amount"], reverse=True)
+
+    return {
+        "as_of": today.strftime("%Y-%m-%d"),
+        "group_by": group_by,
+        **_summary(totals),
+        "items": items,
+        "count": len(items),
+    }
+
+
+async def list_aged_credits(
+    session: AsyncSession,
+    bucket: Optional[int] = None,
+    zone: Optional[str] = None,
+    manager_id: Optional[int] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> Dict:
+    """
+    Créditos en mora con sus días de mora y rango, los más antiguos primero,
+    una página a la vez; ``total`` cuenta todos los del filtro en la misma
+    consulta.
+    """
+    today = datetime.date.today()
+    aged = _aged_credits(today, zone, manager_id, True).subquery("aged")
+    query = select(aged, func.count().over().label("total"))
+    if bucket is not None:
+        query = query.where(aged.c.bucket == bucket)
+    query = (
+        query.order_by(aged.c.oldest_due_date, aged.c.credit_id)
+        .offset(offset)
+        .limit(limit)
+    )
+    rows = (await session.execute(query)).mappings().all()
+
+    items = [
+        {
+            "credit_id": r["credit_id"],
+            "payment_reference": r["payment_reference"],
+            "client_name": r["client_name"],
+            "client_zone": r["client_zone"],
+            "manager_id": r["manager_id"],
+            "manager_name": r["manager_name"],
+            "oldest_due_date": r["oldest_due_date"].strftime("%Y-%m-%d"),
+            "days_past_due": (today - r["oldest_due_date"]).days,
+            "bucket": AGING_BUCKETS[r["bucket"]][0],
+            "overdue_installments": r["overdue_installments"],
+            "overdue_amount": float(r["overdue_amount"] or 0),
+        }
+        for r in rows
+    ]
+    return {
+        "as_of": today.strftime("%Y-%m-%d"),
+        "items": items,
+        "count": len(items),
+        "total": rows[0]["total"] if rows else 0,
+    }
@@ -0,0 +1,161 @@
+import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+# Tramos de portfolio_snapshot.bucket, en orden (ver SNAPSHOT_BUCKETS en
+# credit_management/app/utils/PortfolioSnapshotService.py)
+SNAPSHOT_STATES = (
+    "Al día",
+    "1-30 días",
+    "31-60 días",
+    "61-90 días",
+    "Más de 90 días",
+)
+# Fila de los créditos que no estaban en la primera fecha y columna de los
+# que ya no están en la segunda (cerrados)
+NEW_STATE = "Nuevo"
+CLOSED_STATE = "Cerrado"
+
+# Ventana por defecto entre las dos instantáneas
+DEFAULT_WINDOW_DAYS = 30
+
+COLUMNS = ["snapshot_date", "credit_id", "bucket", "balance"]
+
+
+async def resolve_snapshot_dates(
+    session: AsyncSession,
+    from_date: Optional[datetime.date] = None,
+    to_date: Optional[datetime.date] = None,
+) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """
+    Instantáneas a comparar: la más reciente en o antes de cada fecha pedida.
+    Sin ``to_date`` se toma la última; sin ``from_date``, la de
+    ``DEFAULT_WINDOW_DAYS`` días antes. ``None`` si no hay ninguna.
+    """
+
+    def latest(until: Optional[datetime.date]):
+        query = select(func.max(PortfolioSnapshot.snapshot_date))
+        if until is not None:
+            query = query.where(PortfolioSnapshot.snapshot_date <= until)
+        return query.scalar_subquery()
+
+    to_snapshot = (await session.execute(select(latest(to_date)))).scalar()
+    if to_snapshot is None:
+        return None, None
+    if from_date is None:
+        from_date = to_snapshot - datetime.timedelta(days=DEFAULT_WINDOW_DAYS)
+    from_snapshot = (await session.execute(select(latest(from_date)))).scalar()
+    return from_snapshot, to_snapshot
+
+
+async def fetch_snapshot_frame(
+    session: AsyncSession, dates: Tuple[datetime.date, ...]
+) -> pd.DataFrame:
+    """Filas de las instantáneas de ``dates``, en una sola consulta."""
+    query = select(
+        PortfolioSnapshot.snapshot_date,
+        PortfolioSnapshot.credit_id,
+        PortfolioSnapshot.bucket,
+        PortfolioSnapshot.balance,
+    ).where(PortfolioSnapshot.snapshot_date.in_(dates))
+    result = await session.execute(query)
+    return pd.DataFrame.from_records(result.all(), columns=COLUMNS)
+
+
+def _format(date: Optional[datetime.date]) -> Optional[str]:
+    return date.strftime("%Y-%m-%d") if date else None
+
+
+def roll_rate_matrix(
+    frame: pd.DataFrame,
+    from_date: Optional[datetime.date],
+    to_date: Optional[datetime.date],
+) -> Dict:
+    """
+    Matriz de rodamiento entre las instantáneas ``from_date`` y ``to_date``.
+
+    Filas: tramo de cada crédito en ``from_date`` (más ``NEW_STATE`` para los
+    que aparecen después); columnas: su tramo en ``to_date`` (más
+    ``CLOSED_STATE`` para los que salieron de la cartera). Cada celda cuenta
+    créditos y su saldo en la fila de origen (el de ``to_date`` para los
+    nuevos); ``rates`` es la proporción de créditos de la fila.
+
+    Los créditos se emparejan por ``credit_id`` y se cuentan con un
+    ``bincount`` sobre el índice plano origen × destino, sin recorrer filas
+    en Python. Sin alguna de las dos instantáneas la matriz queda en ceros.
+    """
+    states = len(SNAPSHOT_STATES)
+    size = states + 1
+    before = frame[frame["snapshot_date"] == from_date]
+    after = frame[frame["snapshot_date"] == to_date]
+    pairs = before[["credit_id", "bucket", "balance"]].merge(
+        after[["credit_id", "bucket", "balance"]],
+        on="credit_id",
+        how="outer",
+        suffixes=("_from", "_to"),
+    )
+
+    origin = pairs["bucket_from"].fillna(states).to_numpy(dtype=np.int64)
+    target = pairs["bucket_to"].fillna(states).to_numpy(dtype=np.int64)
+    balance = (
+        pairs["balance_from"]
+        .fillna(pairs["balance_to"])
+        .fillna(0)
+        .to_numpy(dtype=np.float64)
+    )
+    cell = origin * size + target
+
+    credits = np.bincount(cell, minlength=size * size).reshape(size, size)
+    amounts = np.bincount(cell, weights=balance, minlength=size * size).reshape(
+        size, size
+    )
+    totals = credits.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.round(credits / totals[:, None], 4)
+    # Filas sin créditos: sin proporciones
+    rates = [
+        row if total else None for row, total in zip(rates.tolist(), totals.tolist())
+    ]
+
+    # Créditos presentes en ambas fechas, por dirección del movimiento
+    both = credits[:states, :states]
+    worse = np.triu(both, 1).sum()
+    better = np.tril(both, -1).sum()
+
+    return {
+        "from_date": _format(from_date),
+        "to_date": _format(to_date),
+        "from_states": [*SNAPSHOT_STATES, NEW_STATE],
+        "to_states": [*SNAPSHOT_STATES, CLOSED_STATE],
+        "credits": credits.tolist(),
+        "balance": np.round(amounts, 2).tolist(),
+        "rates": rates,
+        "summary": {
+            "credits": int(totals[:states].sum()),
+            "rolled_forward": int(worse),
+            "improved": int(better),
+            "cured": int(both[1:, 0].sum()),
+            "stable": int(np.trace(both)),
+            "closed": int(credits[:states, states].sum()),
+            "new": int(totals[states]),
+        },
+    }
+
+
+async def calculate_roll_rates(
+    session: AsyncSession,
+    from_date: Optional[datetime.date],
+    to_date: Optional[datetime.date],
+) -> Dict:
+    """Matriz de rodamiento entre dos instantáneas (ver ``roll_rate_matrix``)."""
+    if from_date is None or to_date is None:
+        frame = pd.DataFrame(columns=COLUMNS)
+    else:
+        frame = await fetch_snapshot_frame(session, (from_date, to_date))
+    return await run_in_threadpool(roll_rate_matrix, frame, from_date, to_date)
@@ -1,10 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.routes.aging import router as aging
 from .api.routes.money_recovery import router as money_recovery
 from .api.routes.num_clients import router as num_clients
+from .api.routes.roll_rate import router as roll_rate
 from .api.routes.stats_by_month_mora import router as stats_by_month_mora
+from .api.routes.vintage import router as vintage
+from .config.database import sessionmanager
 from .models import *  # noqa: F401,F403 - ensure all mappers are imported
+from .utils.Compression import CompressionMiddleware
+from .utils.Metrics import MetricsMiddleware, metrics_endpoint, register_pool_metrics
 
 
 def create_app() -> FastAPI:
@@ -17,9 +23,16 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(CompressionMiddleware)
+    application.add_middleware(MetricsMiddleware)
+    application.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    register_pool_metrics(sessionmanager.pools)
     application.include_router(stats_by_month_mora, prefix="/stats2", tags=["Stats2"])
     application.include_router(money_recovery, prefix="/stats2", tags=["Stats2"])
     application.include_router(num_clients, prefix="/stats2", tags=["Stats2"])
+    application.include_router(aging, prefix="/stats2", tags=["Stats2"])
+    application.include_router(vintage, prefix="/stats2", tags=["Stats2"])
+    application.include_router(roll_rate, prefix="/stats2", tags=["Stats2"])
     return application
 
 
@@ -1,5 +1,10 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
+# Agrupación de los rangos de mora, ver controllers/aging.py
+AgingGroupBy = Literal["zone", "manager"]
+
 
 class MesSeleccion(BaseModel):
     Enero: bool = False
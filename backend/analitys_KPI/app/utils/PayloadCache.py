@@ -0,0 +1,98 @@
+"""
+In-process cache of KPI results.
+
+The KPI endpoints aggregate the whole portfolio and their results change
+slowly, while dashboards request them on every page load. Results are kept
+for ``KPI_CACHE_SECONDS`` as ``PrecompressedPayload`` objects, so a hit costs
+neither the queries nor the JSON encoding nor the compression. Concurrent
+misses for the same key wait for a single computation.
+
+Results that are expensive to compute but whose data can be versioned (see
+``controllers/vintage.py``) are kept while the version does not change,
+whatever their age; an entry is replaced by the result of a newer version.
+
+Keys include request parameters (zones, pages, dates), so the cache holds at
+most ``KPI_CACHE_ENTRIES`` results and evicts the least recently used; the
+lock of a key only exists while a computation for it is pending.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.Compression import PrecompressedPayload
+
+# Expiry, version and payload of a cached result
+_Entry = Tuple[float, Optional[Hashable], PrecompressedPayload]
+
+
+class PayloadCache:
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # Lock of each key being computed and how many requests hold or await it
+        self._locks: Dict[Hashable, List[Any]] = {}
+
+    def _fresh(self, key: Hashable, version: Optional[Hashable]):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, entry_version, payload = entry
+        if version is not None:
+            fresh = entry_version == version
+        else:
+            fresh = expires > time.monotonic()
+        if not fresh:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _store(
+        self, key: Hashable, version: Optional[Hashable], payload: PrecompressedPayload
+    ):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, version, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        version: Optional[Hashable] = None,
+    ) -> PrecompressedPayload:
+        """
+        Cached payload for ``key``, computing it with ``compute`` when stale:
+        older than the TTL or, with ``version``, of another version.
+        """
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return PrecompressedPayload(await compute())
+
+        payload = self._fresh(key, version)
+        if payload is not None:
+            return payload
+
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # Another request may have filled it while this one waited
+                payload = self._fresh(key, version)
+                if payload is None:
+                    payload = PrecompressedPayload(await compute())
+                    self._store(key, version, payload)
+                return payload
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+kpi_cache = PayloadCache(settings.KPI_CACHE_SECONDS, settings.KPI_CACHE_ENTRIES)
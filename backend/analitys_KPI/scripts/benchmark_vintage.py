@@ -0,0 +1,195 @@
+"""
+Benchmark of the vintage (cohort) matrix.
+
+Builds a synthetic portfolio of ``credits`` credits disbursed over ``years``
+years (6 to 36 monthly installments each, paid on time, late or not at all)
+as the rows the single ``fetch_vintage_frame`` query returns, and times:
+
+- building the column frame from the rows;
+- ``vintage_matrix``, vectorized over the column arrays;
+- the same matrix computed row by row in pure Python (the reference the
+  vectorized result is checked against);
+- encoding the result, which the KPI cache then serves until the data
+  version changes.
+
+No database or service settings are needed.
+
+Usage:
+    python scripts/benchmark_vintage.py [credits] [years]
+"""
+
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the service directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..")))
+
+from app.controllers.vintage import (
+    COLUMNS,
+    DELINQUENCY_DAYS,
+    INSTALLMENT_PAID,
+    vintage_matrix,
+)
+from app.utils.Compression import PrecompressedPayload
+
+QUOTAS = np.array([6, 12, 18, 24, 36])
+
+
+def portfolio(credits: int, years: int, today: datetime.date) -> list:
+    """Installment rows with their credit, as returned by the database."""
+    rng = np.random.default_rng(7)
+    as_of = np.datetime64(today, "D")
+    disbursed = as_of - rng.integers(0, years * 365, credits).astype("timedelta64[D]")
+    amount = rng.integers(1, 50, credits) * 100_000
+    quotas = rng.choice(QUOTAS, credits)
+    # Share of installments each credit pays late and leaves unpaid
+    late_rate = rng.beta(1, 6, credits)
+    default_rate = rng.beta(1, 12, credits)
+
+    credit = np.repeat(np.arange(credits), quotas)
+    number = np.concatenate([np.arange(1, n + 1) for n in quotas])
+    due = disbursed[credit] + (number * 30).astype("timedelta64[D]")
+    value = np.round(amount[credit] * 1.2 / quotas[credit], 2)
+
+    draw = rng.random(len(credit))
+    unpaid = draw < default_rate[credit]
+    delay = np.where(
+        draw < default_rate[credit] + late_rate[credit],
+        rng.integers(1, 120, len(credit)),
+        -rng.integers(0, 5, len(credit)),
+    )
+    payment = due + delay.astype("timedelta64[D]")
+    paid = ~unpaid & (payment <= as_of)
+    state = np.where(
+        paid, INSTALLMENT_PAID, np.where(due < as_of, "Vencida", "Pendiente")
+    )
+
+    disbursed_dates = disbursed.astype(object)
+    return list(
+        zip(
+            (credit + 1).tolist(),
+            disbursed_dates[credit].tolist(),
+            amount[credit].tolist(),
+            due.astype(object).tolist(),
+            value.tolist(),
+            state.tolist(),
+            np.where(paid, payment, np.datetime64("NaT")).astype(object).tolist(),
+        )
+    )
+
+
+def vintage_loop(rows: list, today: datetime.date) -> dict:
+    """``vintage_matrix`` one installment at a time, in pure Python."""
+
+    def month(date: datetime.date) -> int:
+        return date.year * 12 + date.month - 1
+
+    first = min(month(row[1]) for row in rows)
+    months = month(today) - first + 1
+    scheduled = [0.0] * months
+    due_by = [[0.0] * (months + 1) for _ in range(months)]
+    collected = [[0.0] * (months + 1) for _ in range(months)]
+    overdue = [[0.0] * (months + 1) for _ in range(months)]
+    late_after = datetime.timedelta(days=DELINQUENCY_DAYS + 1)
+
+    for _, disbursed, _, due, value, state, payment in rows:
+        if due is None:
+            continue
+        cohort = month(disbursed) - first
+
+        def offset(date: datetime.date) -> int:
+            return min(max(month(date) - first - cohort, 0), months)
+
+        paid = state == INSTALLMENT_PAID
+        due_on_book = offset(due)
+        paid_on_book = offset(payment or due) if paid else months
+        late = due + late_after
+        late_on_book = min(offset(late) if late <= today else months, paid_on_book)
+
+        scheduled[cohort] += value
+        due_by[cohort][due_on_book] += value
+        collected[cohort][max(due_on_book, paid_on_book)] += value
+        overdue[cohort][late_on_book] += value
+        overdue[cohort][paid_on_book] -= value
+
+    matrix = {}
+    for cohort in range(months):
+        due_total = collected_total = overdue_total = 0.0
+        delinquency, recovery = [], []
+        for k in range(months - cohort):
+            due_total += due_by[cohort][k]
+            collected_total += collected[cohort][k]
+            overdue_total += overdue[cohort][k]
+            delinquency.append(
+                round(overdue_total / scheduled[cohort], 4)
+                if scheduled[cohort]
+                else None
+            )
+            recovery.append(
+                round(collected_total / due_total, 4) if due_total else None
+            )
+        matrix[cohort] = (delinquency, recovery)
+    return matrix
+
+
+def same(vectorized: list, reference: list) -> bool:
+    return all(
+        (a is None and b is None)
+        or (a is not None and b is not None and abs(a - b) <= 1e-4)
+        for a, b in zip(vectorized, reference)
+    )
+
+
+def benchmark(credits: int, years: int):
+    today = datetime.date.today()
+    started = time.perf_counter()
+    rows = portfolio(credits, years, today)
+    print(
+        f"Créditos: {credits:,}, años: {years}, cuotas: {len(rows):,} "
+        f"(generadas en {time.perf_counter() - started:.1f} s)"
+    )
+
+    started = time.perf_counter()
+    frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+    print(f"  DataFrame desde filas   {time.perf_counter() - started:7.2f} s")
+
+    started = time.perf_counter()
+    result = vintage_matrix(frame, today)
+    print(f"  matriz vectorizada      {time.perf_counter() - started:7.2f} s")
+
+    started = time.perf_counter()
+    reference = vintage_loop(rows, today)
+    print(f"  matriz fila por fila    {time.perf_counter() - started:7.2f} s")
+
+    started = time.perf_counter()
+    payload = PrecompressedPayload(result)
+    print(
+        f"  JSON de la respuesta    {time.perf_counter() - started:7.2f} s"
+        f"  ({len(payload.body) / 1024:.0f} KB, "
+        f"{len(result['cohorts'])} cohortes)"
+    )
+
+    first = min(row[1] for row in rows)
+    first_month = first.year * 12 + first.month - 1
+    for cohort in result["cohorts"]:
+        year, month = map(int, cohort["cohort"].split("-"))
+        delinquency, recovery = reference[year * 12 + month - 1 - first_month]
+        if not (
+            same(cohort["delinquency"], delinquency)
+            and same(cohort["recovery"], recovery)
+        ):
+            sys.exit(f"La matriz vectorizada difiere en la cohorte {cohort['cohort']}")
+    print("  matrices iguales")
+
+
+if __name__ == "__main__":
+    benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -10,10 +10,12 @@ from ....models import (
     Credit,
     Installment,
     Manager,
+    PaymentAllocation,
     Portfolio,
     Reconciliation,
 )
 from ....models.base import Base
+from ....utils.QueryInstrumentation import query_stats_registry
 
 router = APIRouter()
 
@@ -28,6 +30,7 @@ async def create_tables():
         "portfolio",
         "alert",
         "reconciliation",
+        "payment_allocation",
     ]
 
     created_tables = []
@@ -109,3 +112,9 @@ async def debug_foreign_keys():
         return {"foreign_key_relationships": fk_info}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analizando FK: {str(e)}")
+
+
+@router.get("/query-stats")
+async def get_query_stats():
+    """SQL statements and database time per route since the process started."""
+    return query_stats_registry.snapshot()
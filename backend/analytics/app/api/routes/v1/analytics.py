@@ -1,23 +1,50 @@
+import json
 import os
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....config.database import get_db_session
-from ....schemas.Report import ReportFilters
-from ....utils.ReportGeneratorService import ReportGeneratorService
+from ....config.database import get_read_session
+from ....schemas.Report import (
+    BatchReportType,
+    PartitionBy,
+    ReportBatchResponse,
+    ReportFilters,
+    ReportJobResponse,
+    ReportType,
+)
+from ....utils.ReportExportService import (
+    EXPORT_FORMATS,
+    ReportExportService,
+    available_formats,
+)
+from ....utils.ReportGeneratorService import (
+    STREAM_PART_CREDITS,
+    ReportGeneratorService,
+    iter_spooled,
+)
+from ....utils.ReportJobService import FINISHED_STATES, report_jobs
+from ....utils.ReportStore import report_store
 
 router = APIRouter()
 
+# Seconds between keep-alive comments on the job event stream, below the
+# usual proxy idle timeouts
+EVENTS_KEEPALIVE_SECONDS = 15
+
 
 class GenerateReportRequest(BaseModel):
     """Request para generar un reporte"""
 
     report_title: str = Field("Reporte de Cartera", description="Título del reporte")
+    report_type: ReportType = Field(
+        "portfolio",
+        description="Tipo de reporte: cartera, antigüedad de la mora o desempeño de gestores",
+    )
     period_start: date = Field(..., description="Fecha de inicio del período")
     period_end: date = Field(..., description="Fecha de fin del período")
     filters: Optional[ReportFilters] = Field(None, description="Filtros opcionales")
@@ -26,15 +53,28 @@ class GenerateReportRequest(BaseModel):
         from_attributes = True
 
 
+class GenerateBatchRequest(GenerateReportRequest):
+    """Request para generar un lote de reportes por gestor o zona"""
+
+    report_type: BatchReportType = Field(
+        "portfolio", description="Tipo de reporte: cartera o antigüedad de la mora"
+    )
+    partition_by: PartitionBy = Field(
+        "manager", description="Un reporte por gestor responsable o por zona"
+    )
+
+
 @router.post("/generate")
 async def generate_report(
     request: GenerateReportRequest,
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Generate and download a portfolio report as PDF
+    Generate and download a report as PDF
 
     - **report_title**: Custom title for the report (default: "Reporte de Cartera")
+    - **report_type**: "portfolio" (default), "overdue_aging" (overdue balance by
+      days past due) or "manager_performance" (managements and recovery per manager)
     - **period_start**: Start date for the report period (required, format: YYYY-MM-DD)
     - **period_end**: End date for the report period (required, format: YYYY-MM-DD)
     - **filters**: Optional filters object
@@ -45,8 +85,11 @@ async def generate_report(
     - manager_id (integer): Filter by manager ID
     - debt_age_min (integer): Minimum debt age in days (based on disbursement date)
     - debt_age_max (integer): Maximum debt age in days (based on disbursement date)
+    - days_past_due_min (integer): Minimum days past due (oldest overdue installment)
+    - days_past_due_max (integer): Maximum days past due (oldest overdue installment)
 
-    **Returns:** PDF file download
+    **Returns:** PDF file download. Identical requests on unchanged data are
+    served from the report cache (`X-Report-Cache: hit`).
     """
     try:
         # Initialize service
@@ -59,6 +102,7 @@ async def generate_report(
             filters=request.filters,
             period_start=request.period_start,
             period_end=request.period_end,
+            report_type=request.report_type,
         )
 
         # Check if generation failed
@@ -77,15 +121,18 @@ async def generate_report(
                 status_code=500, detail="Report file was generated but not found"
             )
 
-        # Generate clean filename for download
-        filename = os.path.basename(file_path)
+        # Stored files are named by content; download with a readable name
+        filename = result["filename"]
 
         # Return file as download response
         return FileResponse(
             path=file_path,
             media_type="application/pdf",
             filename=filename,
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Report-Cache": "hit" if result["cached"] else "miss",
+            },
         )
 
     except HTTPException:
@@ -94,3 +141,299 @@ async def generate_report(
         raise HTTPException(
             status_code=500, detail=f"Error generating report: {str(e)}"
         )
+
+
+@router.post("/generate/stream")
+async def generate_report_stream(
+    request: GenerateReportRequest,
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Generate a portfolio report as PDF with every credit in the detail table
+    (`/generate` lists the first 100) and stream it in the response.
+
+    Takes the same body as `/generate`, with `report_type` "portfolio".
+    Credits are read from a server-side cursor one page at a time. Up to
+    5,000 credits the response is a single PDF, sent once rendered. Larger
+    selections are returned as a zip archive of PDF parts of 5,000 credits
+    each (the first with the summary), sent part by part while the next
+    is rendered, so server memory does not grow with the selection. The file
+    is not stored or cached.
+    """
+    if request.report_type != "portfolio":
+        raise HTTPException(
+            status_code=422,
+            detail="Solo el reporte de cartera se puede generar en streaming",
+        )
+
+    service = ReportGeneratorService()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = f"{request.report_title.replace(' ', '_')}_{timestamp}"
+    try:
+        statistics = await service.portfolio_statistics(
+            session, request.filters, request.period_start, request.period_end
+        )
+        if statistics["total_credits"] > STREAM_PART_CREDITS:
+            return StreamingResponse(
+                service.stream_report_parts(
+                    request.report_title,
+                    statistics,
+                    request.filters,
+                    request.period_start,
+                    request.period_end,
+                    stem,
+                ),
+                media_type="application/zip",
+                headers={"Content-Disposition": f'attachment; filename="{stem}.zip"'},
+            )
+
+        output, statistics = await service.stream_report(
+            session=session,
+            report_name=request.report_title,
+            statistics=statistics,
+            filters=request.filters,
+            period_start=request.period_start,
+            period_end=request.period_end,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error generating report: {str(e)}"
+        )
+
+    return StreamingResponse(
+        iter_spooled(output),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{stem}.pdf"',
+            "Content-Length": str(statistics["file_size"]),
+        },
+    )
+
+
+@router.post("/export/{export_format}")
+async def export_report(
+    export_format: Literal["csv", "xlsx", "parquet"],
+    request: GenerateReportRequest,
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Export the credits of a portfolio report as CSV, XLSX or Parquet.
+
+    Takes the same body as `/generate` (`report_type` is ignored) and exports
+    every credit selected by its filters, with client and responsible manager, streamed from the database
+    in blocks. CSV is sent while it is produced; XLSX and Parquet are sent
+    once written. Parquet requires `pyarrow` on the server.
+    """
+    if export_format not in available_formats():
+        raise HTTPException(
+            status_code=501,
+            detail=f"Formato {export_format} no disponible en este servidor",
+        )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{request.report_title.replace(' ', '_')}_{timestamp}.{extension}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    service = ReportExportService()
+
+    if export_format == "csv":
+        return StreamingResponse(
+            service.stream_csv(
+                request.filters, request.period_start, request.period_end
+            ),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    try:
+        output = await service.export_file(
+            session,
+            export_format,
+            request.filters,
+            request.period_start,
+            request.period_end,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error exportando reporte: {str(e)}"
+        )
+
+    headers["Content-Length"] = str(output.seek(0, 2))
+    output.seek(0)
+    return StreamingResponse(
+        iter_spooled(output), media_type=media_type, headers=headers
+    )
+
+
+@router.post("/reports/jobs", response_model=ReportJobResponse, status_code=202)
+async def submit_report_job(request: GenerateReportRequest):
+    """
+    Queue the generation of a report and return its job immediately.
+
+    Takes the same body as `/generate`. Follow the job with
+    `GET /reports/jobs/{job_id}` (polling) or `GET /reports/jobs/{job_id}/events`
+    (server-sent events) and download it from
+    `GET /reports/jobs/{job_id}/download` once its status is `completed`.
+    """
+    return report_jobs.submit(
+        request.report_title,
+        request.filters,
+        request.period_start,
+        request.period_end,
+        request.report_type,
+    )
+
+
+async def _get_job(job_id: str, kind: str = "report") -> dict:
+    job = await report_jobs.get(job_id)
+    if job is None or job.get("kind", "report") != kind:
+        raise HTTPException(status_code=404, detail="Trabajo de reporte no encontrado")
+    return job
+
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(job_id: str):
+    return await _get_job(job_id)
+
+
+@router.get("/reports/jobs/{job_id}/events")
+async def stream_report_job(job_id: str):
+    """
+    Server-sent events with the job state: a `status` event with the job on
+    every change, ending after `completed` or `failed`.
+    """
+    job = await _get_job(job_id)
+
+    async def events():
+        current = job
+        last_update = None
+        while True:
+            if current is None:
+                return
+            if current["updated_at"] != last_update:
+                last_update = current["updated_at"]
+                yield f"event: status\ndata: {json.dumps(current, default=str)}\n\n"
+                if current["status"] in FINISHED_STATES:
+                    return
+            else:
+                yield ": keep-alive\n\n"
+            await report_jobs.wait_for_change(job_id, EVENTS_KEEPALIVE_SECONDS)
+            current = await report_jobs.get(job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/reports/jobs/{job_id}/download")
+async def download_report_job(job_id: str):
+    job = await _get_job(job_id)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=409, detail=job["error_message"])
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409, detail=f"El reporte aún no está listo ({job['status']})"
+        )
+
+    stored = report_store.get(job["result"]["digest"])
+    if stored is None:
+        raise HTTPException(
+            status_code=410, detail="El reporte expiró; genere uno nuevo"
+        )
+
+    filename = job["result"]["filename"]
+    return FileResponse(
+        path=stored.path,
+        media_type="application/pdf",
+        filename=filename,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "ETag": f'"{stored.digest}"',
+        },
+    )
+
+
+@router.post("/reports/batches", response_model=ReportBatchResponse, status_code=202)
+async def submit_report_batch(request: GenerateBatchRequest):
+    """
+    Queue a batch with one report per responsible manager (`partition_by`
+    "manager") or per client zone ("zone") and return its job immediately.
+
+    The credits selected by the filters are read once and split in memory,
+    instead of one `/generate` per manager; the reports are rendered in
+    parallel by the report workers. Once `completed`, the job lists every
+    partition, downloadable from
+    `GET /reports/batches/{job_id}/partitions/{partition}/download`.
+    """
+    return report_jobs.submit_batch(
+        request.report_title,
+        request.filters,
+        request.period_start,
+        request.period_end,
+        request.report_type,
+        request.partition_by,
+    )
+
+
+@router.get(
+    "/reports/batches/latest/{report_type}/{partition_by}",
+    response_model=ReportBatchResponse,
+)
+async def get_latest_report_batch(
+    report_type: BatchReportType, partition_by: PartitionBy
+):
+    """Last completed batch of a report type and partition, e.g. the scheduled one"""
+    job = await report_jobs.latest_batch(report_type, partition_by)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail="No hay lotes de reportes recientes"
+        )
+    return job
+
+
+@router.get("/reports/batches/{job_id}", response_model=ReportBatchResponse)
+async def get_report_batch(job_id: str):
+    return await _get_job(job_id, "batch")
+
+
+@router.get("/reports/batches/{job_id}/partitions/{partition}/download")
+async def download_report_batch_partition(job_id: str, partition: str):
+    job = await _get_job(job_id, "batch")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=409, detail=job["error_message"])
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409, detail=f"El lote aún no está listo ({job['status']})"
+        )
+
+    entry = next(
+        (
+            entry
+            for entry in job["result"]["partitions"]
+            if entry["partition"] == partition
+        ),
+        None,
+    )
+    if entry is None:
+        raise HTTPException(
+            status_code=404, detail="Partición no encontrada en el lote"
+        )
+
+    stored = report_store.get(entry["digest"])
+    if stored is None:
+        raise HTTPException(
+            status_code=410, detail="El reporte expiró; genere un nuevo lote"
+        )
+
+    filename = entry["filename"]
+    return FileResponse(
+        path=stored.path,
+        media_type="application/pdf",
+        filename=filename,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "ETag": f'"{stored.digest}"',
+        },
+    )
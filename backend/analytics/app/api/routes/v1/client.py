@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.client import ClientController
-from ....schemas.base import PaginationParams
+from ....schemas.base import ListParams
 from ....schemas.Client import (
     ClientCompleteResponse,
     ClientCreate,
@@ -11,6 +11,7 @@ from ....schemas.Client import (
     ClientResponse,
     ClientUpdate,
 )
+from ....utils.FastJSONResponse import FastJSONResponse
 
 router = APIRouter()
 
@@ -27,10 +28,14 @@ async def get_client_by_id(
 
 @router.post("/get_clients", response_model=ClientList, tags=["Clients"])
 async def get_clients(
-    pagination: PaginationParams, session: AsyncSession = Depends(get_db_session)
+    pagination: ListParams, session: AsyncSession = Depends(get_db_session)
 ):
     controller = ClientController()
-    return await controller.get_multi_paginated(session, pagination)
+    return FastJSONResponse(
+        await controller.get_multi_paginated(
+            session, pagination, fields=pagination.fields
+        )
+    )
 
 
 @router.post("/create_client", response_model=ClientResponse, tags=["Clients"])
@@ -62,4 +67,6 @@ async def get_client_complete_data(
     client_id: int, session: AsyncSession = Depends(get_db_session)
 ):
     controller = ClientController()
-    return await controller.get_client_complete_data(session, client_id)
+    return FastJSONResponse(
+        await controller.get_client_complete_data(session, client_id)
+    )
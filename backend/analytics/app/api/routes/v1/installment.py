@@ -3,12 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.installment import InstallmentController
-from ....schemas.base import PaginationParams
+from ....schemas.base import ChangeFeedParams, ListParams
 from ....schemas.Installment import (
+    InstallmentChanges,
     InstallmentCreate,
     InstallmentList,
     InstallmentResponse,
 )
+from ....utils.FastJSONResponse import FastJSONResponse
 
 router = APIRouter()
 
@@ -27,10 +29,24 @@ async def get_installment_by_id(
 
 @router.post("/get_installments", response_model=InstallmentList, tags=["Installments"])
 async def get_installments(
-    pagination: PaginationParams, session: AsyncSession = Depends(get_db_session)
+    pagination: ListParams, session: AsyncSession = Depends(get_db_session)
 ):
     controller = InstallmentController()
-    return await controller.get_multi_paginated(session, pagination)
+    return FastJSONResponse(
+        await controller.get_multi_paginated(
+            session, pagination, fields=pagination.fields
+        )
+    )
+
+
+@router.post(
+    "/get_installment_changes", response_model=InstallmentChanges, tags=["Installments"]
+)
+async def get_installment_changes(
+    params: ChangeFeedParams, session: AsyncSession = Depends(get_db_session)
+):
+    controller = InstallmentController()
+    return await controller.get_changes(session, params)
 
 
 @router.post(
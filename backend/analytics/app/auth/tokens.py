@@ -0,0 +1,188 @@
+"""
+Verification of the bearer tokens presented to the API.
+
+Verifying a signature (HMAC, and much more so RSA/ECDSA) dominates the cost of
+authenticating a request, and dashboards send the same token on dozens of
+parallel calls per page. ``TokenVerifier`` verifies each token once and keeps
+its claims in a bounded LRU until the token's ``exp`` (or ``JWT_CACHE_TTL_SECONDS``,
+whichever comes first). Rejected tokens are never cached.
+
+Keys are built once: the shared secret for ``HS*`` algorithms, or for
+asymmetric ones (``RS*``, ``ES*``, ``PS*``) either ``JWT_PUBLIC_KEY`` or the
+key set published at ``JWT_JWKS_URL``, which is downloaded every
+``JWT_JWKS_CACHE_SECONDS`` and also when a token names an unknown ``kid``
+(key rotation).
+
+Everything runs on the event loop thread, so the cache needs no locks.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from ..config.logger import logger
+from ..config.settings import settings
+
+# Minimum time between key set downloads triggered by an unknown ``kid``, so
+# forged tokens cannot make every request hit the identity provider
+JWKS_MIN_REFRESH_SECONDS = 30
+JWKS_TIMEOUT_SECONDS = 5
+
+
+class TokenCache:
+    """LRU of verified token -> claims that never outlives the token's ``exp``."""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            self._entries.pop(token, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        self._entries[token] = (expires_at, claims)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class KeySet:
+    """Verification keys by ``kid``, built once and refreshed from a JWKS URL."""
+
+    def __init__(
+        self,
+        algorithm: str,
+        key: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        cache_seconds: int = 3600,
+    ):
+        self.algorithm = algorithm
+        self.jwks_url = jwks_url
+        self.cache_seconds = cache_seconds
+        self._keys: Dict[Optional[str], Key] = {}
+        self._fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+        if jwks_url is None and key:
+            self._keys[None] = jwk.construct(key, algorithm)
+
+    async def get(self, kid: Optional[str]) -> Key:
+        if self.jwks_url is not None:
+            age = time.monotonic() - self._fetched_at
+            if age >= self.cache_seconds or (
+                kid not in self._keys and age >= JWKS_MIN_REFRESH_SECONDS
+            ):
+                await self._refresh()
+
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            # Tokens without ``kid`` are accepted when there is a single key
+            key = next(iter(self._keys.values()))
+        if key is None:
+            raise JWTError(f"No verification key for kid {kid!r}")
+        return key
+
+    async def _refresh(self):
+        async with self._lock:
+            # Another request may have refreshed while this one waited
+            if time.monotonic() - self._fetched_at < JWKS_MIN_REFRESH_SECONDS:
+                return
+
+            try:
+                async with httpx.AsyncClient(timeout=JWKS_TIMEOUT_SECONDS) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    published = response.json().get("keys", [])
+            except (httpx.HTTPError, ValueError) as e:
+                # Keep verifying with the keys already known and retry later
+                logger.error(f"Error descargando las claves JWKS: {str(e)}")
+                self._fetched_at = (
+                    time.monotonic() - self.cache_seconds + JWKS_MIN_REFRESH_SECONDS
+                )
+                return
+
+            keys: Dict[Optional[str], Key] = {}
+            for entry in published:
+                if entry.get("use", "sig") != "sig":
+                    continue
+                try:
+                    keys[entry.get("kid")] = jwk.construct(
+                        entry, entry.get("alg", self.algorithm)
+                    )
+                except JWTError as e:
+                    logger.warning(f"Clave JWKS {entry.get('kid')} ignorada: {str(e)}")
+
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            logger.info(f"Claves JWKS actualizadas: {len(keys)} claves")
+
+
+class TokenVerifier:
+    def __init__(self, algorithm: str, key_set: KeySet, cache: TokenCache):
+        self.algorithm = algorithm
+        self.key_set = key_set
+        self.cache = cache
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Claims of ``token``; raises ``JWTError`` when it is not valid."""
+        claims = self.cache.get(token)
+        if claims is not None:
+            return claims
+
+        header = jwt.get_unverified_header(token)
+        key = await self.key_set.get(header.get("kid"))
+        claims = jwt.decode(token, key, algorithms=[self.algorithm])
+
+        self.cache.put(token, claims)
+        return claims
+
+
+def build_token_verifier() -> TokenVerifier:
+    algorithm = settings.JWT_ALGORITHM
+    symmetric = algorithm.startswith("HS")
+    key_set = KeySet(
+        algorithm,
+        key=settings.JWT_SECRET_KEY if symmetric else settings.JWT_PUBLIC_KEY,
+        jwks_url=None if symmetric else settings.JWT_JWKS_URL,
+        cache_seconds=settings.JWT_JWKS_CACHE_SECONDS,
+    )
+    cache = TokenCache(settings.JWT_CACHE_SIZE, settings.JWT_CACHE_TTL_SECONDS)
+    return TokenVerifier(algorithm, key_set, cache)
+
+
+token_verifier = build_token_verifier()
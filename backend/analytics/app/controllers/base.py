@@ -1,17 +1,23 @@
-from typing import Any, Generic, Optional, Type, TypeVar
+from typing import Any, Generic, List, Optional, Type, TypeVar
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.base import Base
 from ..repository.base import BaseRepository
-from ..schemas.base import BaseResponseSchema, BaseSchema, PaginationParams
+from ..schemas.base import (
+    BaseResponseSchema,
+    BaseSchema,
+    ChangeFeedParams,
+    PaginationParams,
+)
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseSchema)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseSchema)
 GetSchemaType = TypeVar("GetSchemaType", bound=BaseResponseSchema)
 ListSchemaType = TypeVar("ListSchemaType")
+ChangesSchemaType = TypeVar("ChangesSchemaType")
 
 
 class BaseController(
@@ -30,6 +36,7 @@ class BaseController(
         create_schema: Type[CreateSchemaType],
         update_schema: Optional[Type[UpdateSchemaType]] = None,
         list_schema: Optional[Type[ListSchemaType]] = None,
+        changes_schema: Optional[Type[ChangesSchemaType]] = None,
         not_found_message: str = "Resource not found",
     ):
         self.model = model
@@ -37,12 +44,16 @@ class BaseController(
         self.create_schema = create_schema
         self.update_schema = update_schema
         self.list_schema = list_schema
+        self.changes_schema = changes_schema
         self.not_found_message = not_found_message
 
     def _get_repository(self) -> BaseRepository:
         """Create and return a repository instance."""
         return BaseRepository(
-            model=self.model, get_schema=self.get_schema, list_schema=self.list_schema
+            model=self.model,
+            get_schema=self.get_schema,
+            list_schema=self.list_schema,
+            changes_schema=self.changes_schema,
         )
 
     async def get_by_id(self, session: AsyncSession, resource_id: int) -> GetSchemaType:
@@ -54,11 +65,29 @@ class BaseController(
         return resource
 
     async def get_multi_paginated(
-        self, session: AsyncSession, pagination: PaginationParams
+        self,
+        session: AsyncSession,
+        pagination: PaginationParams,
+        fields: Optional[List[str]] = None,
     ) -> ListSchemaType:
-        """Get multiple resources with pagination."""
+        """Get multiple resources with pagination, optionally only ``fields``."""
+        repository = self._get_repository()
+        try:
+            return await repository.get_multi_paginated(
+                session, pagination, fields=fields
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from None
+
+    async def get_changes(
+        self, session: AsyncSession, params: ChangeFeedParams
+    ) -> ChangesSchemaType:
+        """Get resources changed since the given watermark."""
+        if not self.changes_schema or not hasattr(self.model, "updated_at"):
+            raise HTTPException(status_code=405, detail="Change feed not supported")
+
         repository = self._get_repository()
-        return await repository.get_multi_paginated(session, pagination)
+        return await repository.get_changes(session, params)
 
     async def create(
         self, session: AsyncSession, resource_data: CreateSchemaType
@@ -1,5 +1,11 @@
 from ..models.Credit import Credit
-from ..schemas.Credit import CreditCreate, CreditList, CreditResponse, CreditUpdate
+from ..schemas.Credit import (
+    CreditChanges,
+    CreditCreate,
+    CreditList,
+    CreditResponse,
+    CreditUpdate,
+)
 from .base import BaseController
 
 
@@ -13,5 +19,6 @@ class CreditController(BaseController):
             create_schema=CreditCreate,
             update_schema=CreditUpdate,
             list_schema=CreditList,
+            changes_schema=CreditChanges,
             not_found_message="Credit not found",
         )
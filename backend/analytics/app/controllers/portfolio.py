@@ -1,5 +1,6 @@
 from ..models.Portfolio import Portfolio
 from ..schemas.Portfolio import (
+    PortfolioChanges,
     PortfolioCreate,
     PortfolioList,
     PortfolioResponse,
@@ -18,5 +19,6 @@ class PortfolioController(BaseController):
             create_schema=PortfolioCreate,
             update_schema=PortfolioUpdate,
             list_schema=PortfolioList,
+            changes_schema=PortfolioChanges,
             not_found_message="Portfolio not found",
         )
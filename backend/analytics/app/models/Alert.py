@@ -1,7 +1,7 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, Date, ForeignKey, Integer, String, text
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.mssql import DATETIME2
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,15 @@ from .base import Base
 
 class Alert(Base):
     __tablename__ = "alert"
+    __table_args__ = (
+        Index("ix_alert_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_alert_credit_id_alert_type_alert_date",
+            "credit_id",
+            "alert_type",
+            "alert_date",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     credit_id: Mapped[int] = mapped_column(ForeignKey("credit.id"), nullable=False)
@@ -8,7 +8,7 @@ class Manager(Base):
     __tablename__ = "manager"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     # I think that the document is necesary for the manager
     # document: Mapped[str] = mapped_column(String(20), nullable=False, unique=True)
     manager_zone: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -1,7 +1,7 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import Date, Integer, String, text
+from sqlalchemy import Date, Index, Integer, String, text
 from sqlalchemy.dialects.mssql import DATETIME2
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,10 +10,13 @@ from .base import Base
 
 class Reconciliation(Base):
     __tablename__ = "reconciliation"
+    __table_args__ = (Index("ix_reconciliation_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     transaction_date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
-    payment_reference: Mapped[str] = mapped_column(String(50), nullable=False)
+    payment_reference: Mapped[str] = mapped_column(
+        String(50), nullable=False, index=True
+    )
     payment_amount: Mapped[int] = mapped_column(Integer, nullable=False)
     payment_channel: Mapped[str] = mapped_column(String(50), nullable=False)
     observation: Mapped[Optional[str]] = mapped_column(String(500))
@@ -1,8 +1,13 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+# Report templates, see utils/ReportTemplates.py
+ReportType = Literal["portfolio", "overdue_aging", "manager_performance"]
+BatchReportType = Literal["portfolio", "overdue_aging"]
+PartitionBy = Literal["manager", "zone"]
+
 
 class ReportFilters(BaseModel):
     """Filtros para generar reportes de cartera"""
@@ -17,6 +22,81 @@ class ReportFilters(BaseModel):
     debt_age_max: Optional[int] = Field(
         None, ge=0, description="Máximo de días de antigüedad de deuda"
     )
+    days_past_due_min: Optional[int] = Field(
+        None, ge=0, description="Mínimo de días de mora (cuota vencida más antigua)"
+    )
+    days_past_due_max: Optional[int] = Field(
+        None, ge=0, description="Máximo de días de mora (cuota vencida más antigua)"
+    )
 
     class Config:
         from_attributes = True
+
+
+class ReportJobResult(BaseModel):
+    """Resultado de un trabajo de reporte completado"""
+
+    digest: str = Field(..., description="SHA-256 del archivo generado")
+    filename: str = Field(..., description="Nombre sugerido para la descarga")
+    file_size: int
+    total_clients: int
+    total_credits: int
+    total_amount: float
+    cached: bool = Field(
+        False, description="Servido desde la caché de reportes sin regenerarlo"
+    )
+
+
+class ReportJobResponse(BaseModel):
+    """Estado de un trabajo de generación de reporte"""
+
+    job_id: str
+    status: Literal["queued", "collecting", "rendering", "completed", "failed"]
+    report_type: ReportType = "portfolio"
+    report_title: str
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    filters: Optional[ReportFilters] = None
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[ReportJobResult] = None
+    error_message: Optional[str] = None
+
+
+class ReportBatchPartition(BaseModel):
+    """Reporte de una partición (gestor o zona) de un lote"""
+
+    partition: str = Field(
+        ..., description="ID del gestor, zona, sin_asignar o sin_zona"
+    )
+    label: str = Field(..., description="Nombre del gestor o de la zona")
+    filename: str
+    digest: str
+    file_size: int
+    total_clients: int
+    total_credits: int
+    total_amount: float
+
+
+class ReportBatchResult(BaseModel):
+    """Resultado de un lote de reportes completado"""
+
+    total_credits: int = Field(..., description="Créditos leídos para el lote")
+    partitions: List[ReportBatchPartition]
+
+
+class ReportBatchResponse(BaseModel):
+    """Estado de un lote de reportes por gestor o zona"""
+
+    job_id: str
+    status: Literal["queued", "collecting", "rendering", "completed", "failed"]
+    report_type: BatchReportType
+    partition_by: PartitionBy
+    report_title: str
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    filters: Optional[ReportFilters] = None
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[ReportBatchResult] = None
+    error_message: Optional[str] = None
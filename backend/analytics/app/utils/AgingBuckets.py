@@ -0,0 +1,125 @@
+"""
+Delinquency aging buckets: overdue balance by days past due.
+
+A credit is as old as its oldest unpaid installment past due, and its whole
+overdue balance goes to the bucket of that age. ``bucket_case`` classifies
+credits in SQL, so a single grouped query returns the buckets of every zone
+and manager; ``AgingTable`` rolls those groups (or credits read one by one)
+up into the totals, per zone and per manager that the aging report shows.
+"""
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case
+from sqlalchemy.sql import ColumnElement
+
+# Days-past-due buckets: label and last day (None: open)
+AGING_BUCKETS = (
+    ("0-30 días", 30),
+    ("31-60 días", 60),
+    ("61-90 días", 90),
+    ("Más de 90 días", None),
+)
+
+# Breakdown labels of the credits without a zone or responsible manager
+NO_ZONE_LABEL = "Sin zona"
+UNASSIGNED_LABEL = "Sin asignar"
+
+
+def aging_bucket(days_past_due: int) -> int:
+    """Position in ``AGING_BUCKETS`` of a credit that many days past due"""
+    for position, (_, days) in enumerate(AGING_BUCKETS):
+        if days is None or days_past_due <= days:
+            return position
+    return len(AGING_BUCKETS) - 1
+
+
+def bucket_case(oldest_due_date: ColumnElement, as_of: datetime.date) -> ColumnElement:
+    """
+    SQL expression with the ``AGING_BUCKETS`` position of a credit whose
+    oldest overdue installment fell due on ``oldest_due_date``. It compares
+    the date against fixed bounds instead of computing a day difference per
+    row.
+
+    SQL Server does not match a parametrized CASE in SELECT and GROUP BY:
+    label it in a subquery and group by that column.
+    """
+    return case(
+        *(
+            (oldest_due_date >= as_of - datetime.timedelta(days=days), position)
+            for position, (_, days) in enumerate(AGING_BUCKETS)
+            if days is not None
+        ),
+        else_=len(AGING_BUCKETS) - 1,
+    )
+
+
+class AgingTable:
+    """Credits, installments and balance per bucket: totals, zones and managers."""
+
+    def __init__(self):
+        self.totals = self._empty()
+        self.zones: Dict[str, List[List[Any]]] = {}
+        self.managers: Dict[str, List[List[Any]]] = {}
+
+    @staticmethod
+    def _empty() -> List[List[Any]]:
+        return [[0, 0, 0] for _ in AGING_BUCKETS]
+
+    def add(
+        self,
+        bucket: int,
+        credits: int,
+        installments: int,
+        amount: Any,
+        zone: Optional[str],
+        manager: Optional[str],
+    ):
+        for counters in (
+            self.totals,
+            self.zones.setdefault(zone or NO_ZONE_LABEL, self._empty()),
+            self.managers.setdefault(manager or UNASSIGNED_LABEL, self._empty()),
+        ):
+            counters[bucket][0] += credits
+            counters[bucket][1] += installments
+            counters[bucket][2] += amount or 0
+
+    @staticmethod
+    def _buckets(counters: List[List[Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "label": label,
+                "credits": credits,
+                "installments": installments,
+                "amount": amount,
+            }
+            for (label, _), (credits, installments, amount) in zip(
+                AGING_BUCKETS, counters
+            )
+        ]
+
+    def _groups(self, groups: Dict[str, List[List[Any]]]) -> List[Dict[str, Any]]:
+        # Largest overdue balance first
+        items = [
+            {
+                "label": label,
+                "credits": sum(bucket[0] for bucket in counters),
+                "amount": sum(bucket[2] for bucket in counters),
+                "buckets": self._buckets(counters),
+            }
+            for label, counters in groups.items()
+        ]
+        items.sort(key=lambda item: (-item["amount"], item["label"]))
+        return items
+
+    def data(self) -> Dict[str, Any]:
+        """
+        ``buckets`` with the totals, and ``zones`` and ``managers`` with the
+        credits, balance and buckets of each, largest balance first
+        """
+        return {
+            "buckets": self._buckets(self.totals),
+            "zones": self._groups(self.zones),
+            "managers": self._groups(self.managers),
+        }
@@ -4,9 +4,10 @@ import pandas as pd
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config.logger import logger
+from ..config.logger import logger, row_logger
 from ..models.Credit import Credit
 from ..models.Reconciliation import Reconciliation
+from .PaymentAllocationService import PaymentAllocationService
 
 
 class ReconciliationExcelService:
@@ -57,8 +58,9 @@ class ReconciliationExcelService:
                 "warnings": [],
                 "created_ids": [],  # Lista de IDs de reconciliaciones creadas
                 "invalid_references": [],  # Referencias de pago no encontradas
-                "credits_updated": 0,  # Número de créditos actualizados a "Cancelado"
-                "updated_credit_ids": [],  # IDs de créditos actualizados
+                "credits_updated": 0,  # Créditos cancelados al aplicar los pagos
+                "updated_credit_ids": [],  # IDs de los créditos cancelados
+                "allocation": None,  # Resultado de la aplicación de pagos a cuotas
             }
 
             # Validate required columns
@@ -159,19 +161,13 @@ class ReconciliationExcelService:
                     session.add(reconciliation)
                     await session.flush()  # Flush to get the ID before commit
 
-                    # Update credit state to "Cancelado"
-                    credit.credit_state = "Cancelado"
-                    session.add(credit)
-
-                    # Store the generated ID and track updated credit
+                    # Store the generated ID
                     results["created_ids"].append(reconciliation.id)
-                    results["updated_credit_ids"].append(credit.id)
-                    results["credits_updated"] += 1
                     results["reconciliations_loaded"] += 1
 
                 except Exception as e:
                     error_msg = f"Fila {i}: Error procesando registro: {str(e)}"
-                    logger.error(error_msg)
+                    row_logger.error(error_msg)
                     results["errors"].append(error_msg)
                     results["reconciliations_skipped"] += 1
 
@@ -179,6 +175,13 @@ class ReconciliationExcelService:
 
             # Commit all changes
             await session.commit()
+
+            # Apply the new payments to the credits' installments, oldest first
+            allocation = await PaymentAllocationService().allocate_pending(session)
+            results["allocation"] = allocation
+            results["credits_updated"] = allocation["credits_closed"]
+            results["updated_credit_ids"] = allocation["closed_credit_ids"]
+
             logger.info(
                 f"Proceso completado: {results['reconciliations_loaded']} registros cargados, "
                 f"{results['reconciliations_skipped']} omitidos. "
@@ -0,0 +1,283 @@
+"""
+Batch report runs: the same report for every manager or client zone.
+
+Requesting one report per manager through ``/generate`` runs the report
+queries once per manager. A batch reads the filtered portfolio once, from a
+server-side cursor, and partitions it in memory by the responsible manager
+(credits without one go to "Sin asignar") or by client zone. Each partition
+keeps only what its report shows: the statistics, the aging buckets (see
+``AgingTable``) and the first ``DETAIL_ROWS`` detail rows, so memory does not grow with the number
+of credits.
+
+The partitions are rendered in parallel by the report worker processes,
+``BATCH_RENDER_SIZE`` reports per worker call, and every file goes to the
+content-addressed ``ReportStore``. The batch manifest (one entry per
+partition with its digest and statistics) is the result of the batch job;
+see ``ReportJobManager.submit_batch``.
+
+Batches cover the credit-level reports (portfolio and overdue aging); the
+manager performance report already compares every manager in one file.
+"""
+
+import asyncio
+import datetime
+import heapq
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from ..config.logger import logger
+from ..schemas.Report import ReportFilters
+from .AgingBuckets import AgingTable, aging_bucket
+from .Metrics import REPORT_RENDER_SECONDS
+from .ReportGeneratorService import (
+    DETAIL_ROWS,
+    ReportGeneratorService,
+    blocking_rows,
+    render_batch,
+)
+from .ReportStore import ReportStore, report_store
+from .ReportTemplates import chunked
+
+BATCH_REPORT_TYPES = ("portfolio", "overdue_aging")
+PARTITION_BY = ("manager", "zone")
+
+# Partition keys of the credits without a responsible manager or zone
+UNASSIGNED = "sin_asignar"
+NO_ZONE = "sin_zona"
+
+# Reports rendered per worker call: large enough to amortize the round trip
+# to the pool, small enough to spread a batch over every worker
+BATCH_RENDER_SIZE = 8
+
+
+class _Partition:
+    """Statistics and detail rows of one partition, accumulated row by row."""
+
+    def __init__(self, key: str, label: str, filters: Optional[ReportFilters]):
+        self.key = key
+        self.label = label
+        self.filters = filters
+        self.clients = set()
+        self.credits = 0
+        self.amount = 0
+        self.rows: List[Dict[str, Any]] = []
+        # Aging: the buckets in total, per zone and per manager, and a
+        # bounded max-heap of the most overdue credits, keyed by (-oldest due
+        # date, -credit id)
+        self.aging = AgingTable()
+        self.overdue: List[Tuple[Tuple[int, int], Dict[str, Any]]] = []
+
+    def add_credit(self, row: Mapping[str, Any]):
+        self.clients.add(row["client_id"])
+        self.credits += 1
+        self.amount += row["disbursement_amount"]
+
+    def add_row(self, row: Mapping[str, Any]):
+        # Credits arrive ordered by id, as in the single report
+        if len(self.rows) < DETAIL_ROWS:
+            self.rows.append(dict(row))
+
+    def add_overdue(self, row: Mapping[str, Any], today: datetime.date):
+        days_past_due = (today - row["oldest_due_date"]).days
+        self.aging.add(
+            aging_bucket(days_past_due),
+            1,
+            row["overdue_installments"],
+            row["overdue_amount"],
+            row["client_zone"],
+            row["manager_name"],
+        )
+
+        # Most overdue first: oldest due date, then lowest credit id
+        item = ((-row["oldest_due_date"].toordinal(), -row["credit_id"]), dict(row))
+        if len(self.overdue) < DETAIL_ROWS:
+            heapq.heappush(self.overdue, item)
+        elif item[0] > self.overdue[0][0]:
+            heapq.heapreplace(self.overdue, item)
+
+    def data(self, report_type: str, today: datetime.date) -> Dict[str, Any]:
+        statistics = {
+            "total_clients": len(self.clients),
+            "total_credits": self.credits,
+            "total_amount": self.amount,
+        }
+        if report_type == "portfolio":
+            return {"rows": self.rows, "statistics": statistics}
+
+        rows = [
+            {**row, "days_past_due": (today - row["oldest_due_date"]).days}
+            for _, row in sorted(self.overdue, reverse=True)
+        ]
+        breakdown = self.aging.data()
+        buckets = breakdown["buckets"]
+        statistics["overdue_credits"] = sum(bucket["credits"] for bucket in buckets)
+        statistics["overdue_amount"] = sum(bucket["amount"] for bucket in buckets)
+        return {"rows": rows, "statistics": statistics, **breakdown}
+
+
+def partition_credits(
+    rows: Iterator[Mapping[str, Any]],
+    report_type: str,
+    partition_by: str,
+    filters: Optional[ReportFilters],
+    today: datetime.date,
+) -> List[_Partition]:
+    """
+    Split the credits of a batch into partitions in a single pass. Runs in a
+    worker thread, reading the rows with ``blocking_rows``.
+    """
+    base = filters or ReportFilters()
+    partitions: Dict[Any, _Partition] = {}
+    for row in rows:
+        if partition_by == "manager":
+            value = row["manager_id"]
+        else:
+            value = row["client_zone"]
+
+        partition = partitions.get(value)
+        if partition is None:
+            if value is None:
+                partition = (
+                    _Partition(UNASSIGNED, "Sin asignar", filters)
+                    if partition_by == "manager"
+                    else _Partition(NO_ZONE, "Sin zona", filters)
+                )
+            elif partition_by == "zone":
+                partition = _Partition(
+                    value, value, base.model_copy(update={"client_zone": value})
+                )
+            else:
+                partition = _Partition(
+                    str(value),
+                    row["manager_name"],
+                    base.model_copy(update={"manager_id": value}),
+                )
+            partitions[value] = partition
+
+        partition.add_credit(row)
+        if report_type == "portfolio":
+            partition.add_row(row)
+        elif row["oldest_due_date"] is not None:
+            partition.add_overdue(row, today)
+
+    return sorted(partitions.values(), key=lambda partition: partition.label)
+
+
+class ReportBatchService:
+    def __init__(
+        self,
+        store: ReportStore = report_store,
+        reports: Optional[ReportGeneratorService] = None,
+    ):
+        self.store = store
+        self.reports = reports or ReportGeneratorService(store)
+
+    async def run(
+        self,
+        session: AsyncSession,
+        report_name: str,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        report_type: str = "portfolio",
+        partition_by: str = "manager",
+        on_status: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate the report of every partition and keep them in the report
+        store.
+
+        Returns:
+            Batch manifest: the credits read and, per partition, its key,
+            label, download name, digest and statistics
+        """
+        if report_type not in BATCH_REPORT_TYPES:
+            raise ValueError(f"Tipo de reporte no disponible en lote: {report_type}")
+        if partition_by not in PARTITION_BY:
+            raise ValueError(f"Partición no soportada: {partition_by}")
+
+        logger.info(f"Starting report batch: {report_name} by {partition_by}")
+        if on_status:
+            on_status("collecting")
+        today = datetime.date.today()
+        rows = await self.reports.stream_credits(
+            session,
+            filters,
+            period_start,
+            period_end,
+            overdue_as_of=today if report_type == "overdue_aging" else None,
+        )
+        try:
+            partitions = await run_in_threadpool(
+                partition_credits,
+                blocking_rows(rows, asyncio.get_running_loop()),
+                report_type,
+                partition_by,
+                filters,
+                today,
+            )
+        finally:
+            await rows.close()
+
+        if on_status:
+            on_status("rendering")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        render_started = time.perf_counter()
+
+        async def render_group(group: List[_Partition]) -> List[Dict[str, Any]]:
+            reports = [
+                (
+                    f"{report_name} - {partition.label}",
+                    partition.data(report_type, today),
+                    partition.filters,
+                )
+                for partition in group
+            ]
+            contents = await render_batch(
+                report_type, reports, period_start, period_end
+            )
+            entries = []
+            for partition, (_, data, _), content in zip(group, reports, contents):
+                stored = await run_in_threadpool(self.store.put, content)
+                entries.append(
+                    {
+                        "partition": partition.key,
+                        "label": partition.label,
+                        "filename": f"{report_name}_{partition.label}_{timestamp}.pdf".replace(
+                            " ", "_"
+                        ),
+                        "digest": stored.digest,
+                        "file_size": stored.size,
+                        "total_clients": data["statistics"]["total_clients"],
+                        "total_credits": data["statistics"]["total_credits"],
+                        "total_amount": data["statistics"]["total_amount"],
+                    }
+                )
+            return entries
+
+        try:
+            groups = await asyncio.gather(
+                *(
+                    render_group(group)
+                    for group in chunked(iter(partitions), BATCH_RENDER_SIZE)
+                )
+            )
+        except Exception:
+            REPORT_RENDER_SECONDS.labels("pdf_batch", "failed").observe(
+                time.perf_counter() - render_started
+            )
+            raise
+        REPORT_RENDER_SECONDS.labels("pdf_batch", "completed").observe(
+            time.perf_counter() - render_started
+        )
+        await run_in_threadpool(self.store.maybe_cleanup)
+
+        entries = [entry for group in groups for entry in group]
+        logger.info(f"Report batch generated: {len(entries)} reports by {partition_by}")
+        return {
+            "total_credits": sum(entry["total_credits"] for entry in entries),
+            "partitions": entries,
+        }
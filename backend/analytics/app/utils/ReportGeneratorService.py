@@ -1,30 +1,299 @@
+import asyncio
 import datetime
-import os
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import (
-    PageBreak,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
 )
-from sqlalchemy import and_, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    Subquery,
+    and_,
+    case,
+    cast,
+    func,
+    select,
+    true,
+)
+from sqlalchemy.ext.asyncio import AsyncMappingResult, AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from ..config.database import sessionmanager
 from ..config.logger import logger
+from ..config.settings import settings
 from ..models.Client import Client
 from ..models.Credit import Credit
 from ..models.Installment import Installment
 from ..models.Manager import Manager
 from ..models.Portfolio import Portfolio
 from ..schemas.Report import ReportFilters
+from .AgingBuckets import AgingTable, bucket_case
+from .Metrics import REPORT_CACHE_REQUESTS, REPORT_RENDER_SECONDS
+from .ReportStore import ReportStore, report_store
+from .ReportTemplates import REPORT_TEMPLATES
+
+# Rendering is CPU bound and holds the GIL for seconds on large reports, so it
+# runs in worker processes. "spawn" keeps the workers independent of the
+# parent's event loop and logging threads.
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+# Result fields kept in the report cache records
+CACHED_FIELDS = (
+    "digest",
+    "file_size",
+    "filename",
+    "total_clients",
+    "total_credits",
+    "total_amount",
+)
+_cache_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _render_executor() -> Optional[ProcessPoolExecutor]:
+    global _render_pool
+    if _render_pool is None and settings.REPORT_WORKERS > 0:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.REPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def render_report_pdf(
+    report_type: str,
+    report_name: str,
+    data: Dict[str, Any],
+    filters: Optional[ReportFilters],
+    period_start: Optional[datetime.date],
+    period_end: Optional[datetime.date],
+) -> bytes:
+    """Render the report to PDF bytes; runs inside the worker processes."""
+    buffer = io.BytesIO()
+    REPORT_TEMPLATES[report_type].render(
+        buffer, report_name, data, filters, period_start, period_end
+    )
+    return buffer.getvalue()
+
+
+def render_report_batch(
+    report_type: str,
+    reports: List[Tuple[str, Dict[str, Any], Optional[ReportFilters]]],
+    period_start: Optional[datetime.date],
+    period_end: Optional[datetime.date],
+) -> List[bytes]:
+    """
+    Render several reports of one type (e.g. one per manager) in a single
+    worker call; ``reports`` holds the name, data and filters of each. The
+    compiled styles are shared by the whole batch, and the batch costs one
+    round trip to the pool instead of one per report.
+    """
+    return [
+        render_report_pdf(
+            report_type, report_name, data, filters, period_start, period_end
+        )
+        for report_name, data, filters in reports
+    ]
+
+
+async def _in_render_pool(function: Callable, *args):
+    global _render_pool
+    pool = _render_executor()
+    if pool is None:
+        return await run_in_threadpool(function, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, function, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a new pool next time
+        _render_pool = None
+        raise
+
+
+async def render_report(*args) -> bytes:
+    """``render_report_pdf`` in the worker pool (or the threadpool without one)."""
+    return await _in_render_pool(render_report_pdf, *args)
+
+
+async def render_batch(*args) -> List[bytes]:
+    """``render_report_batch`` in the worker pool (or the threadpool without one)."""
+    return await _in_render_pool(render_report_batch, *args)
+
+
+# The stored PDF lists the first DETAIL_ROWS rows of its detail table
+DETAIL_ROWS = 100
+
+# Streaming mode: rows fetched from the database per round trip, and PDF
+# bytes kept in memory before spilling the output to a temporary file
+STREAM_FETCH_ROWS = 1000
+STREAM_SPOOL_BYTES = 8 * 1024 * 1024
+STREAM_READ_BYTES = 64 * 1024
+# ReportLab keeps every finished page until the document is saved (about
+# 16 MB at 20k credits), so larger selections are split into PDF parts of this
+# many credits, each rendered and sent on its own inside a zip archive
+STREAM_PART_CREDITS = 5_000
+# Deflate level of the parts: PDF streams are already compressed
+STREAM_ZIP_LEVEL = 1
+
+
+INSTALLMENT_PAID = "Pagada"
+
+
+def render_report_pdf_stream(
+    target: IO[bytes],
+    report_name: str,
+    statistics: Dict[str, Any],
+    credits: Iterator[Mapping[str, Any]],
+    filters: Optional[ReportFilters],
+    period_start: Optional[datetime.date],
+    period_end: Optional[datetime.date],
+    part: Optional[int] = None,
+):
+    """
+    Render the portfolio report with every credit of ``credits`` into
+    ``target``, building the detail one page-sized table at a time as rows
+    arrive. With ``part``, only the first part carries the summary.
+    """
+    REPORT_TEMPLATES["portfolio"].render_stream(
+        target,
+        report_name,
+        statistics,
+        credits,
+        filters,
+        period_start,
+        period_end,
+        part,
+    )
+
+
+class ZipSink(io.RawIOBase):
+    """
+    Write-only, unseekable target of a ``zipfile.ZipFile``: keeps what the
+    archive writes until ``take`` hands it to the response. Being unseekable,
+    entries are written with data descriptors and nothing is rewritten later.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def blocking_rows(
+    rows: AsyncMappingResult, loop: asyncio.AbstractEventLoop
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Iterate an async result from a worker thread: each block of
+    ``STREAM_FETCH_ROWS`` rows is fetched on the event loop, which stays free
+    while the thread formats the previous one.
+    """
+    while True:
+        block = asyncio.run_coroutine_threadsafe(
+            rows.fetchmany(STREAM_FETCH_ROWS), loop
+        ).result()
+        if not block:
+            return
+        yield from block
+
+
+async def iter_spooled(output: IO[bytes]) -> AsyncIterator[bytes]:
+    """Read a rendered report in blocks for a streaming response, then close it."""
+    try:
+        while True:
+            chunk = await run_in_threadpool(output.read, STREAM_READ_BYTES)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        output.close()
+
+
+def report_cache_key(
+    report_name: str,
+    filters: Optional[ReportFilters],
+    period_start: Optional[datetime.date],
+    period_end: Optional[datetime.date],
+    report_type: str = "portfolio",
+) -> str:
+    """
+    Fingerprint of the request behind a report. Unset filters and field order
+    do not change it; debt age and days past due filters and the aging report
+    are relative to today, so the date is part of it when they are used.
+    """
+    values = {
+        "type": report_type,
+        "title": report_name.strip(),
+        "filters": filters.model_dump(exclude_none=True) if filters else None,
+        "period_start": period_start,
+        "period_end": period_end,
+    }
+    if report_type == "overdue_aging" or (
+        filters
+        and any(
+            value is not None
+            for value in (
+                filters.debt_age_min,
+                filters.debt_age_max,
+                filters.days_past_due_min,
+                filters.days_past_due_max,
+            )
+        )
+    ):
+        values["today"] = datetime.date.today()
+    normalized = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _ranked_managers() -> Subquery:
+    """
+    Managers of every credit ranked by management, most recent first; the one
+    with ``manager_rank`` 1 is the responsible manager.
+    """
+    return (
+        select(
+            Installment.credit_id,
+            Manager.id.label("manager_id"),
+            Manager.name.label("manager_name"),
+            func.row_number()
+            .over(
+                partition_by=Installment.credit_id,
+                order_by=(Portfolio.management_date.desc(), Portfolio.id.desc()),
+            )
+            .label("manager_rank"),
+        )
+        .join(Portfolio, Portfolio.installment_id == Installment.id)
+        .join(Manager, Manager.id == Portfolio.manager_id)
+        .subquery("ranked_managers")
+    )
 
 
 class ReportGeneratorService:
@@ -32,9 +301,8 @@ class ReportGeneratorService:
     Service for generating PDF reports with customizable filters.
     """
 
-    def __init__(self, output_dir: str = "reports"):
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, store: ReportStore = report_store):
+        self.store = store
 
     async def generate_report(
         self,
@@ -43,9 +311,11 @@ class ReportGeneratorService:
         filters: Optional[ReportFilters] = None,
         period_start: Optional[datetime.date] = None,
         period_end: Optional[datetime.date] = None,
+        report_type: str = "portfolio",
+        on_status: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
-        Generate a PDF report with given filters.
+        Generate a PDF report with given filters and keep it in the report store.
 
         Args:
             session: Database session
@@ -53,6 +323,12 @@ class ReportGeneratorService:
             filters: Filters to apply
             period_start: Start date for period filter
             period_end: End date for period filter
+            report_type: Report template (see ``ReportTemplates``)
+            on_status: Called with "collecting" and "rendering" as work progresses
+
+        A report already generated for the same type, title, filters and period is
+        returned from the store while the data behind it is unchanged (see
+        ``_data_version``) and it is younger than ``REPORT_CACHE_SECONDS``.
 
         Returns:
             Dictionary with report metadata and statistics
@@ -60,37 +336,53 @@ class ReportGeneratorService:
         try:
             logger.info(f"Starting report generation: {report_name}")
 
-            # Collect data based on filters
-            data = await self._collect_data(session, filters, period_start, period_end)
-
-            # Generate filename
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{report_name.replace(' ', '_')}_{timestamp}.pdf"
-            filepath = self.output_dir / filename
-
-            # Generate PDF
-            self._generate_pdf(
-                filepath=str(filepath),
-                report_name=report_name,
-                data=data,
-                filters=filters,
-                period_start=period_start,
-                period_end=period_end,
-            )
-
-            # Get file size
-            file_size = os.path.getsize(filepath)
-
-            logger.info(f"Report generated successfully: {filepath}")
+            if settings.REPORT_CACHE_SECONDS <= 0:
+                return await self._build_report(
+                    session,
+                    report_name,
+                    filters,
+                    period_start,
+                    period_end,
+                    report_type,
+                    on_status,
+                )
 
-            return {
-                "file_path": str(filepath),
-                "file_size": file_size,
-                "total_clients": data["statistics"]["total_clients"],
-                "total_credits": data["statistics"]["total_credits"],
-                "total_amount": data["statistics"]["total_amount"],
-                "status": "completed",
-            }
+            version = await self._data_version(session)
+            cache_name = hashlib.sha256(
+                f"{report_cache_key(report_name, filters, period_start, period_end, report_type)}"
+                f":{version}".encode()
+            ).hexdigest()
+            cached = await run_in_threadpool(self._cached_result, cache_name)
+            if cached is None:
+                # Identical requests arriving together wait for a single render
+                try:
+                    async with _cache_locks.setdefault(cache_name, asyncio.Lock()):
+                        cached = await run_in_threadpool(
+                            self._cached_result, cache_name
+                        )
+                        if cached is None:
+                            REPORT_CACHE_REQUESTS.labels("miss").inc()
+                            result = await self._build_report(
+                                session,
+                                report_name,
+                                filters,
+                                period_start,
+                                period_end,
+                                report_type,
+                                on_status,
+                            )
+                            record = {key: result[key] for key in CACHED_FIELDS}
+                            record["cached_at"] = time.time()
+                            await run_in_threadpool(
+                                self.store.write_record, "cache", cache_name, record
+                            )
+                            return result
+                finally:
+                    _cache_locks.pop(cache_name, None)
+
+            REPORT_CACHE_REQUESTS.labels("hit").inc()
+            logger.info(f"Report served from cache: {cached['file_path']}")
+            return cached
 
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
@@ -99,34 +391,352 @@ class ReportGeneratorService:
                 "error_message": str(e),
             }
 
-    async def _collect_data(
+    def _cached_result(self, cache_name: str) -> Optional[Dict[str, Any]]:
+        record = self.store.read_record("cache", cache_name)
+        if record is None:
+            return None
+        if time.time() - record["cached_at"] > settings.REPORT_CACHE_SECONDS:
+            return None
+        stored = self.store.get(record["digest"])
+        if stored is None:
+            return None
+        return {
+            **{key: record[key] for key in CACHED_FIELDS},
+            "file_path": str(stored.path),
+            "cached": True,
+            "status": "completed",
+        }
+
+    async def _data_version(self, session: AsyncSession) -> str:
+        """
+        Token that changes whenever the data behind a report may have changed:
+        the latest ``updated_at`` of credits, installments and managements
+        (indexed, kept by triggers) plus row count and highest id of clients
+        and managers, which have no ``updated_at``. In-place edits of a
+        client or manager are only picked up when the entry reaches
+        ``REPORT_CACHE_SECONDS``.
+        """
+        query = select(
+            *(
+                select(expression).scalar_subquery()
+                for expression in (
+                    func.max(Credit.updated_at),
+                    func.max(Installment.updated_at),
+                    func.max(Portfolio.updated_at),
+                    func.count(Client.id),
+                    func.max(Client.id),
+                    func.count(Manager.id),
+                    func.max(Manager.id),
+                )
+            )
+        )
+        row = (await session.execute(query)).one()
+        return "|".join(str(value) for value in row)
+
+    async def _build_report(
         self,
         session: AsyncSession,
+        report_name: str,
         filters: Optional[ReportFilters],
         period_start: Optional[datetime.date],
         period_end: Optional[datetime.date],
+        report_type: str,
+        on_status: Optional[Callable[[str], None]],
     ) -> Dict[str, Any]:
-        """Collect data from database based on filters"""
+        # Collect data based on filters
+        if on_status:
+            on_status("collecting")
+        data = await self._collect_data(
+            session, filters, period_start, period_end, report_type
+        )
 
-        # Simple approach: Get credits with client info, then get manager separately if needed
-        query = (
+        # Download name; the stored file is named after its content
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{report_name.replace(' ', '_')}_{timestamp}.pdf"
+
+        # Generate PDF
+        if on_status:
+            on_status("rendering")
+        render_started = time.perf_counter()
+        try:
+            content = await render_report(
+                report_type, report_name, data, filters, period_start, period_end
+            )
+        except Exception:
+            REPORT_RENDER_SECONDS.labels("pdf", "failed").observe(
+                time.perf_counter() - render_started
+            )
+            raise
+        REPORT_RENDER_SECONDS.labels("pdf", "completed").observe(
+            time.perf_counter() - render_started
+        )
+
+        stored = await run_in_threadpool(self.store.put, content)
+        await run_in_threadpool(self.store.maybe_cleanup)
+
+        logger.info(f"Report generated successfully: {stored.path}")
+
+        return {
+            "file_path": str(stored.path),
+            "file_size": stored.size,
+            "digest": stored.digest,
+            "filename": filename,
+            "total_clients": data["statistics"]["total_clients"],
+            "total_credits": data["statistics"]["total_credits"],
+            "total_amount": data["statistics"]["total_amount"],
+            "cached": False,
+            "status": "completed",
+        }
+
+    async def portfolio_statistics(
+        self,
+        session: AsyncSession,
+        filters: Optional[ReportFilters] = None,
+        period_start: Optional[datetime.date] = None,
+        period_end: Optional[datetime.date] = None,
+    ) -> Dict[str, Any]:
+        """Statistics of the portfolio report, from an aggregate query."""
+        return await self._statistics(
+            session, self._credits_query(filters, period_start, period_end)
+        )
+
+    async def stream_report(
+        self,
+        session: AsyncSession,
+        report_name: str,
+        statistics: Dict[str, Any],
+        filters: Optional[ReportFilters] = None,
+        period_start: Optional[datetime.date] = None,
+        period_end: Optional[datetime.date] = None,
+    ) -> Tuple[IO[bytes], Dict[str, Any]]:
+        """
+        Render the portfolio report with every credit, not only the first 100,
+        as a single PDF. Meant for selections of up to ``STREAM_PART_CREDITS``
+        credits (see ``portfolio_statistics``); larger ones go through
+        ``stream_report_parts``, since ReportLab keeps every page of a
+        document until it is saved.
+
+        Credits are read from a server-side cursor in blocks of
+        ``STREAM_FETCH_ROWS`` by the rendering thread and laid out one
+        page-sized table at a time. The PDF is written to a spooled file (in
+        memory up to ``STREAM_SPOOL_BYTES``, then on disk), returned
+        positioned at the start together with the statistics; serve it with
+        ``iter_spooled``.
+        """
+        rows = await self.stream_credits(session, filters, period_start, period_end)
+
+        output = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+        render_started = time.perf_counter()
+        try:
+            await run_in_threadpool(
+                render_report_pdf_stream,
+                output,
+                report_name,
+                statistics,
+                blocking_rows(rows, asyncio.get_running_loop()),
+                filters,
+                period_start,
+                period_end,
+            )
+        except Exception:
+            output.close()
+            REPORT_RENDER_SECONDS.labels("pdf_stream", "failed").observe(
+                time.perf_counter() - render_started
+            )
+            raise
+        finally:
+            await rows.close()
+        REPORT_RENDER_SECONDS.labels("pdf_stream", "completed").observe(
+            time.perf_counter() - render_started
+        )
+
+        statistics["file_size"] = output.tell()
+        output.seek(0)
+        return output, statistics
+
+    async def stream_report_parts(
+        self,
+        report_name: str,
+        statistics: Dict[str, Any],
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        part_prefix: str,
+    ) -> AsyncIterator[bytes]:
+        """
+        Zip archive of the portfolio report split into PDF documents of
+        ``STREAM_PART_CREDITS`` credits (``<part_prefix>_parte_001.pdf``...;
+        the first carries the summary), produced while it is sent.
+
+        Each part is rendered from the same server-side cursor into a spooled
+        file and copied into the archive before the next one starts, so memory
+        is bounded by one part whatever the number of credits, and the first
+        bytes go out as soon as the first part is rendered. Uses its own read
+        session: a streaming response outlives the request's dependencies.
+        """
+        started = time.perf_counter()
+        status = "failed"
+        sink = ZipSink()
+        archive = zipfile.ZipFile(
+            sink, "w", zipfile.ZIP_DEFLATED, compresslevel=STREAM_ZIP_LEVEL
+        )
+        try:
+            async with sessionmanager.read_session() as session:
+                rows = await self.stream_credits(
+                    session, filters, period_start, period_end
+                )
+                try:
+                    credits = blocking_rows(rows, asyncio.get_running_loop())
+                    part = 1
+                    while True:
+                        # Every part after the first needs at least one credit
+                        first = await run_in_threadpool(next, credits, None)
+                        if first is None and part > 1:
+                            break
+                        part_rows = itertools.chain(
+                            [first] if first is not None else [],
+                            itertools.islice(credits, STREAM_PART_CREDITS - 1),
+                        )
+                        with tempfile.SpooledTemporaryFile(
+                            max_size=STREAM_SPOOL_BYTES
+                        ) as output:
+                            await run_in_threadpool(
+                                render_report_pdf_stream,
+                                output,
+                                report_name,
+                                statistics,
+                                part_rows,
+                                filters,
+                                period_start,
+                                period_end,
+                                part,
+                            )
+                            output.seek(0)
+                            with archive.open(
+                                f"{part_prefix}_parte_{part:03d}.pdf", "w"
+                            ) as entry:
+                                while True:
+                                    chunk = await run_in_threadpool(
+                                        output.read, STREAM_READ_BYTES
+                                    )
+                                    if not chunk:
+                                        break
+                                    await run_in_threadpool(entry.write, chunk)
+                                    yield sink.take()
+                        yield sink.take()
+                        part += 1
+                finally:
+                    await rows.close()
+            archive.close()
+            yield sink.take()
+            status = "completed"
+        finally:
+            REPORT_RENDER_SECONDS.labels("pdf_parts", status).observe(
+                time.perf_counter() - started
+            )
+
+    async def stream_credits(
+        self,
+        session: AsyncSession,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        overdue_as_of: Optional[datetime.date] = None,
+    ) -> AsyncMappingResult:
+        """
+        Filtered credits with their responsible manager, ordered by id, from a
+        server-side cursor. The caller must close the result.
+
+        With ``overdue_as_of``, every credit also carries its overdue
+        installments on that date (``oldest_due_date``,
+        ``overdue_installments`` and ``overdue_amount``, NULL if none).
+        """
+        query = self._with_manager(
+            self._credits_query(filters, period_start, period_end)
+        )
+        if overdue_as_of is not None:
+            overdue = self._overdue(overdue_as_of)
+            query = query.add_columns(
+                overdue.c.oldest_due_date,
+                overdue.c.overdue_installments,
+                overdue.c.overdue_amount,
+            ).outerjoin(overdue, overdue.c.credit_id == Credit.id)
+        result = await session.stream(
+            query.order_by(Credit.id).execution_options(yield_per=STREAM_FETCH_ROWS)
+        )
+        return result.mappings()
+
+    @staticmethod
+    async def _statistics(session: AsyncSession, query: Select) -> Dict[str, Any]:
+        row = (await session.execute(ReportGeneratorService._totals(query))).one()
+        return dict(row._mapping)
+
+    @staticmethod
+    def _totals(query: Select) -> Select:
+        """Report statistics of the credits selected by ``query``"""
+        credits = query.subquery("credits")
+        return select(
+            func.count(func.distinct(credits.c.client_id)).label("total_clients"),
+            func.count(credits.c.credit_id).label("total_credits"),
+            # SUM of an INT column is an INT in SQL Server and would overflow
+            func.coalesce(
+                func.sum(cast(credits.c.disbursement_amount, BigInteger)), 0
+            ).label("total_amount"),
+        )
+
+    @staticmethod
+    def _with_manager(query: Select) -> Select:
+        """
+        Add the responsible manager (``manager_id`` and ``manager_name``,
+        NULL if none)
+        """
+        ranked = _ranked_managers()
+        return query.add_columns(ranked.c.manager_id, ranked.c.manager_name).outerjoin(
+            ranked, and_(ranked.c.credit_id == Credit.id, ranked.c.manager_rank == 1)
+        )
+
+    @staticmethod
+    def _overdue(as_of: datetime.date) -> Subquery:
+        """
+        Unpaid installments past due on ``as_of``, per credit: the oldest due
+        date (a credit is as old as its oldest one), how many and their value
+        """
+        return (
             select(
-                Credit.id.label("credit_id"),
-                Credit.payment_reference,
-                Credit.disbursement_amount,
-                Credit.disbursement_date,
-                Credit.credit_state,
-                Credit.total_quotas,
-                Client.id.label("client_id"),
-                Client.name.label("client_name"),
-                Client.document.label("client_document"),
-                Client.zone.label("client_zone"),
-                Client.status.label("client_status"),
+                Installment.credit_id,
+                func.min(Installment.due_date).label("oldest_due_date"),
+                func.count(Installment.id).label("overdue_installments"),
+                func.sum(Installment.installments_value).label("overdue_amount"),
+            )
+            .where(
+                Installment.installment_state != INSTALLMENT_PAID,
+                Installment.due_date < as_of,
             )
-            .join(Client, Credit.client_id == Client.id)
-            .distinct()
+            .group_by(Installment.credit_id)
+            .subquery("overdue")
         )
 
+    @staticmethod
+    def _credits_query(
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+    ) -> Select:
+        """Credits with their client for the report filters"""
+        query = select(
+            Credit.id.label("credit_id"),
+            Credit.payment_reference,
+            Credit.disbursement_amount,
+            Credit.disbursement_date,
+            Credit.credit_state,
+            Credit.total_quotas,
+            Client.id.label("client_id"),
+            Client.name.label("client_name"),
+            Client.document.label("client_document"),
+            Client.zone.label("client_zone"),
+            Client.status.label("client_status"),
+        ).join(Client, Credit.client_id == Client.id)
+
         conditions = []
 
         # Apply filters
@@ -146,6 +756,31 @@ class ReportGeneratorService:
                     max_date = today - datetime.timedelta(days=filters.debt_age_max)
                     conditions.append(Credit.disbursement_date >= max_date)
 
+            # Actual days past due: the age of the oldest overdue installment
+            # (credits without one are 0 days past due)
+            if filters.days_past_due_min or filters.days_past_due_max is not None:
+                today = datetime.date.today()
+                overdue = ReportGeneratorService._overdue(today)
+                aged = select(overdue.c.credit_id)
+                if filters.days_past_due_min:
+                    aged = aged.where(
+                        overdue.c.oldest_due_date
+                        <= today - datetime.timedelta(days=filters.days_past_due_min)
+                    )
+                    if filters.days_past_due_max is not None:
+                        aged = aged.where(
+                            overdue.c.oldest_due_date
+                            >= today
+                            - datetime.timedelta(days=filters.days_past_due_max)
+                        )
+                    conditions.append(Credit.id.in_(aged))
+                else:
+                    aged = aged.where(
+                        overdue.c.oldest_due_date
+                        < today - datetime.timedelta(days=filters.days_past_due_max)
+                    )
+                    conditions.append(Credit.id.not_in(aged))
+
         # Apply period filters
         if period_start:
             conditions.append(Credit.disbursement_date >= period_start)
@@ -165,257 +800,192 @@ class ReportGeneratorService:
 
         if conditions:
             query = query.where(and_(*conditions))
+        return query
 
-        # Execute query
-        result = await session.execute(query)
-        records = result.all()
-
-        # If manager info is needed, get it separately for each credit
-        credit_managers = {}
-        if records:
-            # Get manager info for all credits
-            credit_ids = [r.credit_id for r in records]
-            manager_query = (
-                select(Credit.id.label("credit_id"), Manager.name.label("manager_name"))
-                .join(Installment, Credit.id == Installment.credit_id)
-                .join(Portfolio, Installment.id == Portfolio.installment_id)
-                .join(Manager, Portfolio.manager_id == Manager.id)
-                .where(Credit.id.in_(credit_ids))
-                .distinct()
-            )
-            manager_result = await session.execute(manager_query)
-            for row in manager_result:
-                if row.credit_id not in credit_managers:
-                    credit_managers[row.credit_id] = row.manager_name
-
-        # Process data
-        credits_data = []
-        total_amount = 0
-        clients_set = set()
-
-        for record in records:
-            manager_name = credit_managers.get(record.credit_id, "Sin asignar")
-
-            credits_data.append(
-                {
-                    "credit_id": record.credit_id,
-                    "payment_reference": record.payment_reference,
-                    "client_name": record.client_name,
-                    "client_document": record.client_document,
-                    "disbursement_amount": record.disbursement_amount,
-                    "disbursement_date": record.disbursement_date,
-                    "credit_state": record.credit_state,
-                    "client_zone": record.client_zone,
-                    "manager_name": manager_name,
-                }
-            )
-            total_amount += record.disbursement_amount or 0
-            clients_set.add(record.client_id)
-
-        return {
-            "credits": credits_data,
-            "statistics": {
-                "total_clients": len(clients_set),
-                "total_credits": len(credits_data),
-                "total_amount": total_amount,
-            },
-        }
-
-    def _generate_pdf(
+    async def _collect_data(
         self,
-        filepath: str,
-        report_name: str,
-        data: Dict[str, Any],
+        session: AsyncSession,
         filters: Optional[ReportFilters],
         period_start: Optional[datetime.date],
         period_end: Optional[datetime.date],
-    ):
-        """Generate PDF document"""
-
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-        story = []
-        styles = getSampleStyleSheet()
-
-        # Custom styles
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            textColor=colors.HexColor("#1a237e"),
-            spaceAfter=30,
-            alignment=1,  # Center
-        )
-
-        heading_style = ParagraphStyle(
-            "CustomHeading",
-            parent=styles["Heading2"],
-            fontSize=14,
-            textColor=colors.HexColor("#283593"),
-            spaceAfter=12,
-        )
+        report_type: str = "portfolio",
+    ) -> Dict[str, Any]:
+        """
+        Collect the data of a report type: ``statistics`` (the portfolio
+        totals plus those of the type), the ``rows`` of its detail table and
+        any extra section data.
+        """
+        collectors = {
+            "portfolio": self._collect_portfolio,
+            "overdue_aging": self._collect_overdue_aging,
+            "manager_performance": self._collect_manager_performance,
+        }
+        credits = self._credits_query(filters, period_start, period_end)
+        return await collectors[report_type](session, credits, filters)
 
-        # Title
-        story.append(Paragraph(report_name, title_style))
-        story.append(
-            Paragraph(
-                f"Generado el: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M')}",
-                styles["Normal"],
-            )
+    async def _totals_with_rows(
+        self,
+        session: AsyncSession,
+        credits: Select,
+        page: Select,
+        order_by: Callable[[Subquery], Iterable[Any]],
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Statistics of ``credits`` and the rows of ``page`` in a single
+        statement: the aggregate row is outer joined with the page, so it
+        comes back even when the page is empty.
+        """
+        totals = self._totals(credits).subquery("totals")
+        page = page.subquery("page")
+        query = (
+            select(totals, page)
+            .select_from(totals)
+            .outerjoin(page, true())
+            .order_by(*order_by(page))
         )
-        story.append(Spacer(1, 0.3 * inch))
-
-        # Period information
-        if period_start or period_end:
-            period_text = "Período: "
-            if period_start:
-                period_text += f"Desde {period_start.strftime('%d/%m/%Y')} "
-            if period_end:
-                period_text += f"Hasta {period_end.strftime('%d/%m/%Y')}"
-            story.append(Paragraph(period_text, styles["Normal"]))
-            story.append(Spacer(1, 0.2 * inch))
-
-        # Filters applied
-        if filters:
-            story.append(Paragraph("Filtros Aplicados:", heading_style))
-            filter_data = []
-            if filters.credit_state:
-                filter_data.append(["Estado de Crédito:", filters.credit_state])
-            if filters.client_zone:
-                filter_data.append(["Zona de Cliente:", filters.client_zone])
-            if filters.manager_id:
-                filter_data.append(["ID de Gestor:", str(filters.manager_id)])
-            if filters.debt_age_min is not None:
-                filter_data.append(
-                    ["Antigüedad Mínima (días):", str(filters.debt_age_min)]
-                )
-            if filters.debt_age_max is not None:
-                filter_data.append(
-                    ["Antigüedad Máxima (días):", str(filters.debt_age_max)]
-                )
+        result = (await session.execute(query)).mappings().all()
 
-            if filter_data:
-                filter_table = Table(filter_data, colWidths=[2.5 * inch, 3 * inch])
-                filter_table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-                            ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                            ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                            ("FONTSIZE", (0, 0), (-1, -1), 10),
-                            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        ]
-                    )
-                )
-                story.append(filter_table)
-                story.append(Spacer(1, 0.3 * inch))
-
-        # Statistics
-        story.append(Paragraph("Resumen Estadístico:", heading_style))
-        stats = data["statistics"]
-        stats_data = [
-            ["Total de Clientes:", f"{stats['total_clients']:,}"],
-            ["Total de Créditos:", f"{stats['total_credits']:,}"],
-            [
-                "Monto Total:",
-                f"${stats['total_amount']:,}",
-            ],
+        columns = page.c.keys()
+        rows = [
+            {column: row[column] for column in columns}
+            for row in result
+            if row[columns[0]] is not None
         ]
+        statistics = {key: result[0][key] for key in totals.c.keys()}
+        return statistics, rows
 
-        stats_table = Table(stats_data, colWidths=[2.5 * inch, 3 * inch])
-        stats_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#e3f2fd")),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                    ("ALIGN", (0, 0), (0, -1), "LEFT"),
-                    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 11),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-            )
+    async def _collect_portfolio(
+        self,
+        session: AsyncSession,
+        credits: Select,
+        filters: Optional[ReportFilters],
+    ) -> Dict[str, Any]:
+        """
+        Statistics and the first ``DETAIL_ROWS`` credits (the ones the PDF
+        lists). ``stream_report`` covers every credit.
+        """
+        page = self._with_manager(credits).order_by(Credit.id).limit(DETAIL_ROWS)
+        statistics, rows = await self._totals_with_rows(
+            session, credits, page, lambda page: (page.c.credit_id,)
         )
-        story.append(stats_table)
-        story.append(Spacer(1, 0.4 * inch))
-
-        # Credits table
-        if data["credits"]:
-            story.append(Paragraph("Detalle de Créditos:", heading_style))
-            story.append(Spacer(1, 0.1 * inch))
-
-            # Table headers
-            table_data = [
-                [
-                    "Ref. Pago",
-                    "Cliente",
-                    "Documento",
-                    "Monto",
-                    "Fecha",
-                    "Estado",
-                    "Gestor",
-                ]
-            ]
-
-            # Add data rows
-            for credit in data["credits"][:100]:  # Limit to first 100 for PDF size
-                table_data.append(
-                    [
-                        credit["payment_reference"][:15],
-                        credit["client_name"][:20],
-                        credit["client_document"],
-                        f"${credit['disbursement_amount']:,}",
-                        credit["disbursement_date"].strftime("%d/%m/%Y"),
-                        credit["credit_state"],
-                        credit["manager_name"][:15],
-                    ]
-                )
+        return {"rows": rows, "statistics": statistics}
 
-            credits_table = Table(
-                table_data,
-                colWidths=[
-                    1 * inch,
-                    1.2 * inch,
-                    0.9 * inch,
-                    0.9 * inch,
-                    0.8 * inch,
-                    0.8 * inch,
-                    1 * inch,
-                ],
-            )
-            credits_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a237e")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 9),
-                        ("FONTSIZE", (0, 1), (-1, -1), 8),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        (
-                            "ROWBACKGROUNDS",
-                            (0, 1),
-                            (-1, -1),
-                            [colors.white, colors.lightgrey],
-                        ),
-                    ]
-                )
+    async def _collect_overdue_aging(
+        self,
+        session: AsyncSession,
+        credits: Select,
+        filters: Optional[ReportFilters],
+    ) -> Dict[str, Any]:
+        """
+        Overdue balance per ``AGING_BUCKETS`` bucket, in total and per zone
+        and manager, and the ``DETAIL_ROWS`` most overdue credits (see
+        ``_overdue``).
+        """
+        today = datetime.date.today()
+        overdue = self._overdue(today)
+        overdue_credits = credits.add_columns(
+            overdue.c.oldest_due_date,
+            overdue.c.overdue_installments,
+            overdue.c.overdue_amount,
+        ).join(overdue, overdue.c.credit_id == Credit.id)
+
+        page = (
+            self._with_manager(overdue_credits)
+            .order_by(overdue.c.oldest_due_date, Credit.id)
+            .limit(DETAIL_ROWS)
+        )
+        statistics, rows = await self._totals_with_rows(
+            session,
+            credits,
+            page,
+            lambda page: (page.c.oldest_due_date, page.c.credit_id),
+        )
+        for row in rows:
+            row["days_past_due"] = (today - row["oldest_due_date"]).days
+
+        # Buckets per zone and manager in one grouped query, bucket labelled
+        # in a subquery (see ``bucket_case``)
+        aged = (
+            self._with_manager(overdue_credits)
+            .add_columns(bucket_case(overdue.c.oldest_due_date, today).label("bucket"))
+            .subquery("aged")
+        )
+        groups_query = select(
+            aged.c.bucket,
+            aged.c.client_zone,
+            aged.c.manager_name,
+            func.count(aged.c.credit_id).label("credits"),
+            func.sum(aged.c.overdue_installments).label("installments"),
+            func.sum(aged.c.overdue_amount).label("amount"),
+        ).group_by(
+            aged.c.bucket, aged.c.client_zone, aged.c.manager_id, aged.c.manager_name
+        )
+        aging = AgingTable()
+        for row in (await session.execute(groups_query)).all():
+            aging.add(
+                row.bucket,
+                row.credits,
+                row.installments,
+                row.amount,
+                row.client_zone,
+                row.manager_name,
             )
-            story.append(credits_table)
-
-            if len(data["credits"]) > 100:
-                story.append(Spacer(1, 0.2 * inch))
-                story.append(
-                    Paragraph(
-                        f"<i>Mostrando los primeros 100 créditos de {len(data['credits'])} totales.</i>",
-                        styles["Italic"],
+
+        breakdown = aging.data()
+        buckets = breakdown["buckets"]
+        statistics["overdue_credits"] = sum(bucket["credits"] for bucket in buckets)
+        statistics["overdue_amount"] = sum(bucket["amount"] for bucket in buckets)
+        return {"rows": rows, "statistics": statistics, **breakdown}
+
+    async def _collect_manager_performance(
+        self,
+        session: AsyncSession,
+        credits: Select,
+        filters: Optional[ReportFilters],
+    ) -> Dict[str, Any]:
+        """
+        Managements of every manager over the reported credits: how many,
+        on how many credits and installments, the payment promises obtained
+        and how many of the managed installments are paid.
+        """
+        reported = credits.subquery("reported_credits")
+        page = (
+            select(
+                Manager.id.label("manager_id"),
+                Manager.name.label("manager_name"),
+                Manager.manager_zone,
+                func.count(Portfolio.id).label("managements"),
+                func.count(func.distinct(Installment.credit_id)).label(
+                    "credits_managed"
+                ),
+                func.count(Portfolio.payment_promise_date).label("promises"),
+                func.count(func.distinct(Installment.id)).label("managed_installments"),
+                func.count(
+                    func.distinct(
+                        case(
+                            (
+                                Installment.installment_state == INSTALLMENT_PAID,
+                                Installment.id,
+                            )
+                        )
                     )
-                )
+                ).label("paid_installments"),
+                func.max(Portfolio.management_date).label("last_management_date"),
+            )
+            .join(Portfolio, Portfolio.manager_id == Manager.id)
+            .join(Installment, Installment.id == Portfolio.installment_id)
+            .join(reported, reported.c.credit_id == Installment.credit_id)
+            .group_by(Manager.id, Manager.name, Manager.manager_zone)
+        )
+        if filters and filters.manager_id:
+            page = page.where(Manager.id == filters.manager_id)
 
-        # Build PDF
-        doc.build(story)
+        statistics, rows = await self._totals_with_rows(
+            session,
+            credits,
+            page,
+            lambda page: (page.c.managements.desc(), page.c.manager_id),
+        )
+        statistics["total_managers"] = len(rows)
+        statistics["total_managements"] = sum(row["managements"] for row in rows)
+        return {"rows": rows, "statistics": statistics}
@@ -0,0 +1,257 @@
+"""
+Asynchronous report generation jobs.
+
+``/generate`` collects the data and renders the whole PDF inside the request,
+which big portfolio reports cannot finish before the proxy timeout. A job
+submitted to ``/reports/jobs`` is accepted immediately and runs in the
+background with its own read session; rendering happens in the report worker
+processes (see ``render_report``) and the file goes to the content-addressed
+``ReportStore``.
+
+Job records are written as JSON next to the stored reports
+(``<REPORTS_DIR>/jobs/<id>.json``), so any API worker sharing the directory
+can answer status and download requests, and they expire with the same
+retention as the files. Workers also keep their own jobs in memory and
+notify waiters of every status change, which backs the event stream. Records
+are written in the thread pool, never on the event loop: each change
+schedules a write of the job as it is at that moment, chained after the
+previous write of the same job so they land in order, and a finished job
+stays in memory until its final record is on disk.
+
+Batch jobs (``submit_batch``) generate a report per manager or client zone
+with ``ReportBatchService``; their result is the batch manifest. The last
+completed batch of every report type and partition is also recorded as
+``<REPORTS_DIR>/batches/latest-<type>-<partition>.json``, so scheduled
+batches can be found without their id.
+"""
+
+import asyncio
+import datetime
+import uuid
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config.database import sessionmanager
+from ..config.logger import logger
+from ..schemas.Report import ReportFilters
+from .ReportBatchService import ReportBatchService
+from .ReportGeneratorService import ReportGeneratorService
+from .ReportStore import ReportStore, report_store
+
+FINISHED_STATES = ("completed", "failed")
+
+
+class ReportJobManager:
+    def __init__(self, store: ReportStore = report_store):
+        self.store = store
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        # Last scheduled record write of each job
+        self._writes: Dict[str, asyncio.Task] = {}
+        # Strong references, so running jobs are not garbage collected
+        self._tasks = set()
+
+    def _save(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        self._writes[job_id] = self._start(
+            self._write(job_id, dict(job), self._writes.get(job_id))
+        )
+
+    async def _write(
+        self,
+        job_id: str,
+        record: Dict[str, Any],
+        previous: Optional[asyncio.Task],
+    ):
+        if previous is not None:
+            await previous
+        try:
+            await run_in_threadpool(self.store.write_record, "jobs", job_id, record)
+        except Exception as e:
+            logger.error(f"Error guardando el trabajo de reporte {job_id}: {str(e)}")
+
+        if self._writes.get(job_id) is asyncio.current_task():
+            # Last pending write: finished jobs can now be read from disk
+            del self._writes[job_id]
+            if record["status"] in FINISHED_STATES:
+                self._jobs.pop(job_id, None)
+
+    def _update(self, job_id: str, **changes):
+        job = self._jobs[job_id]
+        job.update(changes, updated_at=datetime.datetime.now().isoformat())
+        self._save(job)
+        # Wake up every waiter and arm a new event for the next change
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+        if job["status"] not in FINISHED_STATES:
+            self._changed[job_id] = asyncio.Event()
+
+    def _create(
+        self,
+        kind: str,
+        report_name: str,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        report_type: str,
+        **fields,
+    ) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        now = datetime.datetime.now().isoformat()
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "report_type": report_type,
+            "report_title": report_name,
+            "period_start": period_start,
+            "period_end": period_end,
+            "filters": filters.model_dump(exclude_none=True) if filters else None,
+            **fields,
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error_message": None,
+        }
+        self._jobs[job_id] = job
+        self._changed[job_id] = asyncio.Event()
+        self._save(job)
+        return job
+
+    def _start(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def submit(
+        self,
+        report_name: str,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        report_type: str = "portfolio",
+    ) -> Dict[str, Any]:
+        args = (report_name, filters, period_start, period_end, report_type)
+        job = self._create("report", *args)
+        self._start(self._run(job["job_id"], *args))
+        return dict(job)
+
+    def submit_batch(
+        self,
+        report_name: str,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        report_type: str = "portfolio",
+        partition_by: str = "manager",
+    ) -> Dict[str, Any]:
+        args = (report_name, filters, period_start, period_end, report_type)
+        job = self._create("batch", *args, partition_by=partition_by)
+        self._start(self._run_batch(job["job_id"], *args, partition_by))
+        return dict(job)
+
+    async def run_batch(self, *args) -> Dict[str, Any]:
+        """``submit_batch`` waiting for the batch; returns the finished job."""
+        job = self.submit_batch(*args)
+        while job["status"] not in FINISHED_STATES:
+            await self.wait_for_change(job["job_id"], 5)
+            job = await self.get(job["job_id"])
+        return job
+
+    async def _run(self, job_id: str, *args):
+        try:
+            async with sessionmanager.read_session() as session:
+                result = await ReportGeneratorService(self.store).generate_report(
+                    session,
+                    *args,
+                    on_status=lambda status: self._update(job_id, status=status),
+                )
+        except Exception as e:
+            result = {"status": "failed", "error_message": str(e)}
+
+        if result["status"] == "failed":
+            logger.error(
+                f"Trabajo de reporte {job_id} fallido: {result['error_message']}"
+            )
+            self._update(job_id, status="failed", error_message=result["error_message"])
+            return
+
+        result.pop("status")
+        result.pop("file_path")
+        self._update(job_id, status="completed", result=result)
+
+    async def _run_batch(
+        self,
+        job_id: str,
+        report_name: str,
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        report_type: str,
+        partition_by: str,
+    ):
+        try:
+            async with sessionmanager.read_session() as session:
+                result = await ReportBatchService(self.store).run(
+                    session,
+                    report_name,
+                    filters,
+                    period_start,
+                    period_end,
+                    report_type,
+                    partition_by,
+                    on_status=lambda status: self._update(job_id, status=status),
+                )
+        except Exception as e:
+            logger.error(f"Lote de reportes {job_id} fallido: {str(e)}")
+            self._update(job_id, status="failed", error_message=str(e))
+            return
+
+        self._update(job_id, status="completed", result=result)
+        await run_in_threadpool(
+            self.store.write_record,
+            "batches",
+            f"latest-{report_type}-{partition_by}",
+            {"job_id": job_id},
+        )
+
+    async def latest_batch(
+        self, report_type: str, partition_by: str
+    ) -> Optional[Dict[str, Any]]:
+        """Last completed batch of a report type and partition, if not expired."""
+        record = await run_in_threadpool(
+            self.store.read_record, "batches", f"latest-{report_type}-{partition_by}"
+        )
+        if record is None:
+            return None
+        return await self.get(record["job_id"])
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, from memory or from its record on disk."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+        # Ids come from the URL; anything but our own hex ids is not a job
+        if len(job_id) != 32 or not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        return await run_in_threadpool(self.store.read_record, "jobs", job_id)
+
+    async def wait_for_change(self, job_id: str, timeout: float):
+        """
+        Wait until the job changes state or ``timeout`` elapses. Jobs run by
+        another worker have no local event and are simply re-read afterwards.
+        """
+        event = self._changed.get(job_id)
+        try:
+            if event is None:
+                await asyncio.sleep(timeout)
+            else:
+                await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+report_jobs = ReportJobManager()
@@ -0,0 +1,120 @@
+"""
+Content-addressed storage for generated reports.
+
+Each file is stored once under ``<root>/<aa>/<sha256><suffix>``, where ``aa``
+are the first two hex digits of its SHA-256, so identical outputs share a
+single file and a digest is enough to serve it again. Files are written to a
+temporary name and renamed into place, so readers never see a partial file.
+
+Storing an existing digest again only refreshes its modification time, which
+is what retention is measured against: ``cleanup`` removes files not written
+for longer than ``retention_seconds``. It runs at most every
+``cleanup_interval_seconds`` from ``maybe_cleanup``, called after every new
+report, so the directory no longer grows without bound.
+
+Small JSON records about the reports (job states, cache entries) live in
+``<root>/<kind>/<name>.json`` and follow the same retention.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config.logger import logger
+from ..config.settings import settings
+
+
+class StoredReport:
+    def __init__(self, digest: str, path: Path, size: int):
+        self.digest = digest
+        self.path = path
+        self.size = size
+
+
+class ReportStore:
+    def __init__(
+        self,
+        root: str,
+        retention_seconds: int,
+        cleanup_interval_seconds: int = 600,
+    ):
+        self.root = Path(root)
+        self.retention_seconds = retention_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._cleaned_at = 0.0
+
+    def _path(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def put(self, data: bytes, suffix: str = ".pdf") -> StoredReport:
+        """Store ``data`` under its digest; blocking, call it off the event loop."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, suffix)
+        if path.exists():
+            os.utime(path)
+            return StoredReport(digest, path, path.stat().st_size)
+
+        self._write_atomic(path, data)
+        return StoredReport(digest, path, len(data))
+
+    def get(self, digest: str, suffix: str = ".pdf") -> Optional[StoredReport]:
+        path = self._path(digest, suffix)
+        try:
+            return StoredReport(digest, path, path.stat().st_size)
+        except FileNotFoundError:
+            return None
+
+    def write_record(self, kind: str, name: str, record: Dict[str, Any]):
+        data = json.dumps(record, default=str).encode("utf-8")
+        self._write_atomic(self.root / kind / f"{name}.json", data)
+
+    def read_record(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.root / kind / f"{name}.json", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def cleanup(self) -> int:
+        """Remove files older than the retention period; returns how many."""
+        if self.retention_seconds <= 0 or not self.root.exists():
+            return 0
+
+        expires_before = time.time() - self.retention_seconds
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime < expires_before:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                # Removed concurrently by another worker
+                continue
+        self._cleaned_at = time.monotonic()
+        if removed:
+            logger.info(f"Reportes expirados eliminados: {removed}")
+        return removed
+
+    def maybe_cleanup(self) -> int:
+        if time.monotonic() - self._cleaned_at < self.cleanup_interval_seconds:
+            return 0
+        return self.cleanup()
+
+
+report_store = ReportStore(settings.REPORTS_DIR, settings.REPORT_RETENTION_HOURS * 3600)
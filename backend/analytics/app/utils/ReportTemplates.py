@@ -0,0 +1,550 @@
+"""
+Report templates: the layout of every report type.
+
+Building a report used to start by creating a sample stylesheet, the custom
+paragraph styles and a ``TableStyle`` per table. For a batch of per-manager
+reports that setup was repeated for every file. Styles are now compiled once
+per process (``report_styles``) and shared by every table and paragraph; a
+template only decides which summary rows, sections and detail columns its
+report type has, and is itself a stateless module-level instance.
+
+Most of the remaining time goes to drawing table cells and encoding page
+streams, which ReportLab speeds up with its C accelerator (``rl_accel``, in
+the requirements; pure Python fallbacks otherwise). Page streams are also
+written binary instead of ASCII85, which saves encoding work and about 15% of
+the file size.
+
+Report types:
+
+- ``portfolio``: portfolio statistics and the credit detail.
+- ``overdue_aging``: overdue balance per days-past-due bucket, in total and
+  per zone and manager, and the most overdue credits.
+- ``manager_performance``: managements, promises and recovered installments
+  of every manager over the reported credits.
+
+Every report type shares the portfolio statistics (``total_clients``,
+``total_credits``, ``total_amount``) of the credits selected by the filters.
+"""
+
+import datetime
+import functools
+import itertools
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import (
+    Flowable,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from ..schemas.Report import ReportFilters
+from .AgingBuckets import AGING_BUCKETS
+
+# Rows per detail table when the detail is streamed (about one page)
+STREAM_TABLE_ROWS = 40
+
+rl_config.useA85 = 0
+
+
+class ReportStyles:
+    """Paragraph and table styles of the reports, built once per process."""
+
+    def __init__(self):
+        sheet = getSampleStyleSheet()
+        self.normal = sheet["Normal"]
+        self.italic = sheet["Italic"]
+        self.title = ParagraphStyle(
+            "CustomTitle",
+            parent=sheet["Heading1"],
+            fontSize=24,
+            textColor=colors.HexColor("#1a237e"),
+            spaceAfter=30,
+            alignment=1,  # Center
+        )
+        self.heading = ParagraphStyle(
+            "CustomHeading",
+            parent=sheet["Heading2"],
+            fontSize=14,
+            textColor=colors.HexColor("#283593"),
+            spaceAfter=12,
+        )
+        self.filters = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ]
+        )
+        self.statistics = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#e3f2fd")),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+                ("ALIGN", (0, 0), (0, -1), "LEFT"),
+                ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 11),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ]
+        )
+        self.detail = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a237e")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), 9),
+                ("FONTSIZE", (0, 1), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                (
+                    "ROWBACKGROUNDS",
+                    (0, 1),
+                    (-1, -1),
+                    [colors.white, colors.lightgrey],
+                ),
+            ]
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def report_styles() -> ReportStyles:
+    return ReportStyles()
+
+
+def _money(value: Any) -> str:
+    return f"${int(value or 0):,}"
+
+
+def _date(value: Optional[datetime.date]) -> str:
+    return value.strftime("%d/%m/%Y") if value else "-"
+
+
+def chunked(rows: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _StreamedStory(list):
+    """
+    Story whose tail is produced on demand. Platypus consumes the story from
+    the front and checks ``len`` before every flowable, so the next one is
+    pulled from the iterator only when the current ones have been laid out;
+    finished pages keep only their drawing operations until the file is saved.
+    """
+
+    def __init__(self, head: List[Flowable], tail: Iterator[Flowable]):
+        super().__init__(head)
+        self._tail = tail
+
+    def __len__(self) -> int:
+        if not super().__len__():
+            flowable = next(self._tail, None)
+            if flowable is not None:
+                self.append(flowable)
+        return super().__len__()
+
+
+class ReportTemplate:
+    """
+    Layout of a report type: title, period, filters and statistics, the
+    sections of the type, then a detail table of ``data["rows"]``.
+    Subclasses set the detail columns and format the rows.
+    """
+
+    report_type = ""
+    detail_title = ""
+    detail_header: List[str] = []
+    detail_col_widths: List[float] = []
+    # Statistic counting every detail row, to note a truncated listing
+    total_key = ""
+    rows_noun = ""
+
+    def statistics_rows(self, statistics: Mapping[str, Any]) -> List[List[str]]:
+        return [
+            ["Total de Clientes:", f"{statistics['total_clients']:,}"],
+            ["Total de Créditos:", f"{statistics['total_credits']:,}"],
+            ["Monto Total:", _money(statistics["total_amount"])],
+        ]
+
+    def sections(self, data: Mapping[str, Any]) -> List[Flowable]:
+        """Flowables between the statistics and the detail"""
+        return []
+
+    def detail_row(self, row: Mapping[str, Any]) -> List[str]:
+        raise NotImplementedError
+
+    def detail_table(self, rows: Iterable[Mapping[str, Any]]) -> Table:
+        table_data = [self.detail_header]
+        table_data.extend(self.detail_row(row) for row in rows)
+        table = Table(table_data, colWidths=self.detail_col_widths, repeatRows=1)
+        table.setStyle(report_styles().detail)
+        return table
+
+    def summary_story(
+        self,
+        report_name: str,
+        statistics: Mapping[str, Any],
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+    ) -> List[Flowable]:
+        """Title, period, filters and statistics"""
+        styles = report_styles()
+        story = [
+            Paragraph(report_name, styles.title),
+            Paragraph(
+                f"Generado el: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M')}",
+                styles.normal,
+            ),
+            Spacer(1, 0.3 * inch),
+        ]
+
+        # Period information
+        if period_start or period_end:
+            period_text = "Período: "
+            if period_start:
+                period_text += f"Desde {period_start.strftime('%d/%m/%Y')} "
+            if period_end:
+                period_text += f"Hasta {period_end.strftime('%d/%m/%Y')}"
+            story.append(Paragraph(period_text, styles.normal))
+            story.append(Spacer(1, 0.2 * inch))
+
+        # Filters applied
+        if filters:
+            story.append(Paragraph("Filtros Aplicados:", styles.heading))
+            filter_data = []
+            if filters.credit_state:
+                filter_data.append(["Estado de Crédito:", filters.credit_state])
+            if filters.client_zone:
+                filter_data.append(["Zona de Cliente:", filters.client_zone])
+            if filters.manager_id:
+                filter_data.append(["ID de Gestor:", str(filters.manager_id)])
+            if filters.debt_age_min is not None:
+                filter_data.append(
+                    ["Antigüedad Mínima (días):", str(filters.debt_age_min)]
+                )
+            if filters.debt_age_max is not None:
+                filter_data.append(
+                    ["Antigüedad Máxima (días):", str(filters.debt_age_max)]
+                )
+            if filters.days_past_due_min is not None:
+                filter_data.append(
+                    ["Días de Mora Mínimos:", str(filters.days_past_due_min)]
+                )
+            if filters.days_past_due_max is not None:
+                filter_data.append(
+                    ["Días de Mora Máximos:", str(filters.days_past_due_max)]
+                )
+
+            if filter_data:
+                filter_table = Table(filter_data, colWidths=[2.5 * inch, 3 * inch])
+                filter_table.setStyle(styles.filters)
+                story.append(filter_table)
+                story.append(Spacer(1, 0.3 * inch))
+
+        # Statistics
+        story.append(Paragraph("Resumen Estadístico:", styles.heading))
+        stats_table = Table(
+            self.statistics_rows(statistics), colWidths=[2.5 * inch, 3 * inch]
+        )
+        stats_table.setStyle(styles.statistics)
+        story.append(stats_table)
+        story.append(Spacer(1, 0.4 * inch))
+
+        return story
+
+    def story(
+        self,
+        report_name: str,
+        data: Mapping[str, Any],
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+    ) -> List[Flowable]:
+        styles = report_styles()
+        story = self.summary_story(
+            report_name, data["statistics"], filters, period_start, period_end
+        )
+        story.extend(self.sections(data))
+
+        rows = data["rows"]
+        if rows:
+            story.append(Paragraph(self.detail_title, styles.heading))
+            story.append(Spacer(1, 0.1 * inch))
+            story.append(self.detail_table(rows))
+
+            total = data["statistics"][self.total_key]
+            if total > len(rows):
+                story.append(Spacer(1, 0.2 * inch))
+                story.append(
+                    Paragraph(
+                        f"<i>Mostrando los primeros {len(rows)} {self.rows_noun} de {total} totales.</i>",
+                        styles.italic,
+                    )
+                )
+        return story
+
+    def render(
+        self,
+        target: Union[str, IO[bytes]],
+        report_name: str,
+        data: Mapping[str, Any],
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+    ):
+        """Render the report into a file path or a binary file object"""
+        doc = SimpleDocTemplate(target, pagesize=letter)
+        doc.build(self.story(report_name, data, filters, period_start, period_end))
+
+    def render_stream(
+        self,
+        target: IO[bytes],
+        report_name: str,
+        statistics: Mapping[str, Any],
+        rows: Iterator[Mapping[str, Any]],
+        filters: Optional[ReportFilters],
+        period_start: Optional[datetime.date],
+        period_end: Optional[datetime.date],
+        part: Optional[int] = None,
+    ):
+        """
+        Render the report with every row of ``rows`` into ``target``, building
+        the detail one page-sized table at a time as rows arrive.
+
+        ``part`` numbers the documents of a report split in several files:
+        the first has the summary, the others only the title and their rows.
+        """
+        styles = report_styles()
+        doc = SimpleDocTemplate(target, pagesize=letter)
+        if part is None or part == 1:
+            story = self.summary_story(
+                report_name, statistics, filters, period_start, period_end
+            )
+        else:
+            story = [
+                Paragraph(f"{report_name} (parte {part})", styles.title),
+                Spacer(1, 0.1 * inch),
+            ]
+        if statistics[self.total_key]:
+            story.append(Paragraph(self.detail_title, styles.heading))
+            story.append(Spacer(1, 0.1 * inch))
+
+        tables = (
+            self.detail_table(chunk) for chunk in chunked(rows, STREAM_TABLE_ROWS)
+        )
+        doc.build(_StreamedStory(story, tables))
+
+
+class PortfolioTemplate(ReportTemplate):
+    report_type = "portfolio"
+    detail_title = "Detalle de Créditos:"
+    detail_header = [
+        "Ref. Pago",
+        "Cliente",
+        "Documento",
+        "Monto",
+        "Fecha",
+        "Estado",
+        "Gestor",
+    ]
+    detail_col_widths = [
+        1 * inch,
+        1.2 * inch,
+        0.9 * inch,
+        0.9 * inch,
+        0.8 * inch,
+        0.8 * inch,
+        1 * inch,
+    ]
+    total_key = "total_credits"
+    rows_noun = "créditos"
+
+    def detail_row(self, row: Mapping[str, Any]) -> List[str]:
+        return [
+            row["payment_reference"][:15],
+            row["client_name"][:20],
+            row["client_document"],
+            f"${row['disbursement_amount']:,}",
+            row["disbursement_date"].strftime("%d/%m/%Y"),
+            row["credit_state"],
+            (row["manager_name"] or "Sin asignar")[:15],
+        ]
+
+
+class OverdueAgingTemplate(ReportTemplate):
+    report_type = "overdue_aging"
+    detail_title = "Créditos con Mayor Mora:"
+    detail_header = [
+        "Ref. Pago",
+        "Cliente",
+        "Zona",
+        "Días Mora",
+        "Cuotas",
+        "Saldo Vencido",
+        "Gestor",
+    ]
+    detail_col_widths = [
+        1 * inch,
+        1.3 * inch,
+        0.8 * inch,
+        0.7 * inch,
+        0.6 * inch,
+        1.1 * inch,
+        1.1 * inch,
+    ]
+    total_key = "overdue_credits"
+    rows_noun = "créditos en mora"
+
+    def statistics_rows(self, statistics: Mapping[str, Any]) -> List[List[str]]:
+        rows = super().statistics_rows(statistics)
+        rows.append(["Créditos en Mora:", f"{statistics['overdue_credits']:,}"])
+        rows.append(["Saldo Vencido:", _money(statistics["overdue_amount"])])
+        return rows
+
+    def sections(self, data: Mapping[str, Any]) -> List[Flowable]:
+        styles = report_styles()
+        overdue_amount = data["statistics"]["overdue_amount"] or 0
+        table_data = [["Días de Mora", "Créditos", "Saldo Vencido", "% del Saldo"]]
+        for bucket in data["buckets"]:
+            share = bucket["amount"] / overdue_amount * 100 if overdue_amount else 0
+            table_data.append(
+                [
+                    bucket["label"],
+                    f"{bucket['credits']:,}",
+                    _money(bucket["amount"]),
+                    f"{share:.1f}%",
+                ]
+            )
+        table = Table(
+            table_data, colWidths=[1.5 * inch, 1.2 * inch, 1.6 * inch, 1.2 * inch]
+        )
+        table.setStyle(styles.detail)
+        story = [
+            Paragraph("Antigüedad de la Mora:", styles.heading),
+            table,
+            Spacer(1, 0.4 * inch),
+        ]
+
+        # Breakdowns with a single group (e.g. a batch partition) repeat the
+        # table above
+        for key, title, column in (
+            ("zones", "Antigüedad de la Mora por Zona:", "Zona"),
+            ("managers", "Antigüedad de la Mora por Gestor:", "Gestor"),
+        ):
+            groups = data.get(key) or []
+            if len(groups) > 1:
+                story.extend(
+                    [
+                        Paragraph(title, styles.heading),
+                        self.breakdown_table(column, groups),
+                        Spacer(1, 0.4 * inch),
+                    ]
+                )
+        return story
+
+    def breakdown_table(self, column: str, groups: List[Mapping[str, Any]]) -> Table:
+        """Overdue balance of every group per bucket, largest first"""
+        header = [column, "Créditos"]
+        header.extend(label for label, _ in AGING_BUCKETS)
+        header.append("Saldo Vencido")
+        table_data = [header]
+        for group in groups:
+            row = [group["label"][:18], f"{group['credits']:,}"]
+            row.extend(_money(bucket["amount"]) for bucket in group["buckets"])
+            row.append(_money(group["amount"]))
+            table_data.append(row)
+        table = Table(
+            table_data,
+            colWidths=[1.3 * inch, 0.7 * inch]
+            + [0.95 * inch] * (len(header) - 3)
+            + [1.1 * inch],
+            repeatRows=1,
+        )
+        table.setStyle(report_styles().detail)
+        return table
+
+    def detail_row(self, row: Mapping[str, Any]) -> List[str]:
+        return [
+            row["payment_reference"][:15],
+            row["client_name"][:20],
+            row["client_zone"],
+            str(row["days_past_due"]),
+            str(row["overdue_installments"]),
+            _money(row["overdue_amount"]),
+            (row["manager_name"] or "Sin asignar")[:15],
+        ]
+
+
+class ManagerPerformanceTemplate(ReportTemplate):
+    report_type = "manager_performance"
+    detail_title = "Desempeño por Gestor:"
+    detail_header = [
+        "Gestor",
+        "Zona",
+        "Gestiones",
+        "Créditos",
+        "Promesas",
+        "Cuotas Pagadas",
+        "Recuperación",
+        "Última Gestión",
+    ]
+    detail_col_widths = [
+        1.3 * inch,
+        0.7 * inch,
+        0.7 * inch,
+        0.7 * inch,
+        0.7 * inch,
+        0.9 * inch,
+        0.8 * inch,
+        0.9 * inch,
+    ]
+    total_key = "total_managers"
+    rows_noun = "gestores"
+
+    def statistics_rows(self, statistics: Mapping[str, Any]) -> List[List[str]]:
+        rows = super().statistics_rows(statistics)
+        rows.append(["Gestores:", f"{statistics['total_managers']:,}"])
+        rows.append(["Gestiones:", f"{statistics['total_managements']:,}"])
+        return rows
+
+    def detail_row(self, row: Mapping[str, Any]) -> List[str]:
+        managed = row["managed_installments"]
+        recovery = row["paid_installments"] / managed * 100 if managed else 0
+        return [
+            row["manager_name"][:20],
+            row["manager_zone"][:10],
+            f"{row['managements']:,}",
+            f"{row['credits_managed']:,}",
+            f"{row['promises']:,}",
+            f"{row['paid_installments']:,}",
+            f"{recovery:.1f}%",
+            _date(row["last_management_date"]),
+        ]
+
+
+REPORT_TEMPLATES: Dict[str, ReportTemplate] = {
+    template.report_type: template
+    for template in (
+        PortfolioTemplate(),
+        OverdueAgingTemplate(),
+        ManagerPerformanceTemplate(),
+    )
+}
@@ -0,0 +1,111 @@
+"""
+Benchmark of the report output formats: throughput and peak memory.
+
+Feeds the same synthetic credit rows, generated lazily as the server-side
+cursor delivers them, to every writer: CSV, XLSX (write-only), Parquet (when
+pyarrow is installed) and the full-detail streamed PDF. Each format runs in
+a fresh process, so its peak RSS is not hidden by a previous one. Output goes
+to a spooled file, as in the API.
+
+Requires the service settings (``.env`` or environment variables); no
+database connection is made.
+
+Usage:
+    python scripts/benchmark_exports.py [rows]
+"""
+
+import datetime
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Add the parent directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+ZONES = ["Rural", "Urbano"]
+STATES = ["Vigente", "Cancelado", "Vencido"]
+MANAGERS = ["Gestor de zona rural", "Gestor urbano", None]
+
+
+def rows(count: int):
+    today = datetime.date(2025, 1, 1)
+    for i in range(1, count + 1):
+        yield {
+            "credit_id": i,
+            "payment_reference": f"REF-{i:08d}",
+            "client_id": i,
+            "client_name": f"Cliente número {i}",
+            "client_document": str(1_000_000_000 + i),
+            "client_zone": ZONES[i % 2],
+            "client_status": "Activo",
+            "disbursement_amount": 1_000_000 + (i % 500) * 10_000,
+            "disbursement_date": today - datetime.timedelta(days=i % 1500),
+            "credit_state": STATES[i % 3],
+            "total_quotas": 12 + i % 24,
+            "manager_name": MANAGERS[i % 3],
+        }
+
+
+def run_format(name: str, count: int, results):
+    from analytics.app.utils import ReportExportService as exports
+    from analytics.app.utils.ReportGeneratorService import (
+        STREAM_FETCH_ROWS,
+        STREAM_SPOOL_BYTES,
+        render_report_pdf_stream,
+    )
+    from analytics.app.utils.ReportTemplates import chunked
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    output = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+    started = time.perf_counter()
+
+    if name == "csv":
+        output.write(exports.csv_header())
+        for block in chunked(rows(count), STREAM_FETCH_ROWS):
+            output.write(exports.csv_block(block))
+    elif name == "pdf":
+        statistics = {
+            "total_clients": count,
+            "total_credits": count,
+            "total_amount": 0,
+        }
+        render_report_pdf_stream(
+            output, "Benchmark", statistics, rows(count), None, None, None
+        )
+    else:
+        exports.FILE_WRITERS[name](output, rows(count))
+
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((name, elapsed, output.tell(), baseline_kb, peak_kb))
+
+
+def benchmark(count: int):
+    # Imported here too, to know which formats are available
+    from analytics.app.utils.ReportExportService import available_formats
+
+    formats = available_formats() + ["pdf"]
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    print(f"Filas por formato: {count:,}")
+    for name in formats:
+        process = context.Process(target=run_format, args=(name, count, results))
+        process.start()
+        name, elapsed, size, baseline_kb, peak_kb = results.get()
+        process.join()
+        print(
+            f"{name:8} {count / elapsed:10,.0f} filas/s  {elapsed:7.2f} s  "
+            f"{size / 1024 / 1024:7.1f} MB  "
+            f"RSS pico {peak_kb / 1024:6.0f} MB (+{(peak_kb - baseline_kb) / 1024:.0f} MB)"
+        )
+    if "parquet" not in formats:
+        print("parquet  no disponible (instale pyarrow)")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,62 @@
+"""
+Script to generate the per-manager and per-zone report batches
+Schedule it once a day, after the overdue transitions of the night:
+    python scripts/generate_report_batches.py [report_type] [partition_by ...]
+report_type is portfolio (default) or overdue_aging; partition_by is manager
+and/or zone (default: both). Every batch reads the portfolio once and renders
+one report per partition in the report workers. The reports are stored in
+REPORTS_DIR and served by the API as the latest batch:
+    GET /reports/batches/latest/{report_type}/{partition_by}
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the parent directory to sys.path to import the app
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from analytics.app.config.database import sessionmanager
+from analytics.app.utils.ReportBatchService import BATCH_REPORT_TYPES, PARTITION_BY
+from analytics.app.utils.ReportJobService import report_jobs
+
+REPORT_TITLES = {
+    "portfolio": "Reporte de Cartera",
+    "overdue_aging": "Reporte de Antigüedad de Mora",
+}
+
+
+async def generate_report_batches(report_type: str, partitions: list):
+    """Run one batch per partition and print its reports"""
+    for partition_by in partitions:
+        job = await report_jobs.run_batch(
+            REPORT_TITLES[report_type], None, None, None, report_type, partition_by
+        )
+        if job["status"] == "failed":
+            print(f"❌ Lote {report_type} por {partition_by}: {job['error_message']}")
+            continue
+
+        result = job["result"]
+        print(
+            f"✅ Lote {report_type} por {partition_by}: "
+            f"{len(result['partitions'])} reportes, "
+            f"{result['total_credits']} créditos (job {job['job_id']})"
+        )
+        for entry in result["partitions"]:
+            print(
+                f"   {entry['label']}: {entry['total_credits']} créditos, "
+                f"{entry['file_size'] / 1024:.0f} KB"
+            )
+
+    await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    report_type = sys.argv[1] if len(sys.argv) > 1 else "portfolio"
+    partitions = sys.argv[2:] or list(PARTITION_BY)
+    if report_type not in BATCH_REPORT_TYPES or not set(partitions) <= set(
+        PARTITION_BY
+    ):
+        sys.exit(__doc__)
+    asyncio.run(generate_report_batches(report_type, partitions))
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+# Settings require the database variables; the tests never connect with them
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.utils.QueryInstrumentation import query_budget as _query_budget  # noqa: E402
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Query budget for the test: the block fails the test with
+    ``QueryBudgetExceeded`` if it, or any request served while it is open
+    (e.g. through ``TestClient``), executes more than ``max_queries``
+    statements.
+
+        def test_credit_detail(client, query_budget):
+            with query_budget(5):
+                client.get("/api/.../get_credits_detailed/1")
+    """
+    return _query_budget
@@ -0,0 +1,66 @@
+import pytest
+from app.utils.Metrics import DB_QUERIES_PER_REQUEST, DB_TIME_SECONDS
+from app.utils.QueryInstrumentation import QueryBudgetExceeded, QueryStatsMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items/{count}")
+    def items(count: int):
+        # One statement per item, as an N+1 would
+        with engine.connect() as connection:
+            return [
+                connection.execute(text("SELECT :id"), {"id": i}).scalar()
+                for i in range(count)
+            ]
+
+    with TestClient(app) as test_client:
+        yield test_client
+    engine.dispose()
+
+
+def test_request_within_budget(client, query_budget):
+    with query_budget(3) as stats:
+        response = client.get("/items/3")
+
+    assert response.json() == [0, 1, 2]
+    assert stats.count == 3
+
+
+def test_request_stats_reach_metrics(client):
+    queries = DB_QUERIES_PER_REQUEST.labels("GET", "/items/{count}")
+    db_time = DB_TIME_SECONDS.labels("GET", "/items/{count}")
+    requests, total_queries = sum(queries.counts), queries.sum
+
+    client.get("/items/2")
+
+    assert sum(queries.counts) == requests + 1
+    assert queries.sum == total_queries + 2
+    assert sum(db_time.counts) == requests + 1
+
+
+def test_request_over_budget_fails(client, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="GET /items/{count}: 4 consultas"):
+        with query_budget(3):
+            client.get("/items/4")
+
+
+def test_block_over_budget_fails(query_budget):
+    engine = create_engine("sqlite://")
+    with pytest.raises(QueryBudgetExceeded, match="2 consultas"):
+        with query_budget(1), engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    engine.dispose()
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,11 +12,19 @@ from ....models import (
     Client,
     Credit,
     Installment,
+    JobLease,
+    JobRun,
     Manager,
+    PaymentAllocation,
     Portfolio,
+    PortfolioSnapshot,
     Reconciliation,
 )
 from ....models.base import Base
+from ....schemas.Job import JobInfo, JobRunList, JobRunResponse
+from ....utils.InstallmentStateService import InstallmentStateService
+from ....utils.QueryInstrumentation import query_stats_registry
+from ....utils.ScheduledJobs import scheduler
 
 router = APIRouter()
 
@@ -28,6 +39,10 @@ async def create_tables():
         "portfolio",
         "alert",
         "reconciliation",
+        "payment_allocation",
+        "job_lease",
+        "job_run",
+        "portfolio_snapshot",
     ]
 
     created_tables = []
@@ -109,3 +124,59 @@ async def debug_foreign_keys():
         return {"foreign_key_relationships": fk_info}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analizando FK: {str(e)}")
+
+
+@router.get("/query-stats")
+async def get_query_stats():
+    """SQL statements and database time per route since the process started."""
+    return query_stats_registry.snapshot()
+
+
+@router.post("/apply-overdue-transitions")
+async def apply_overdue_transitions(
+    as_of: Optional[datetime.date] = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    # Una fecha futura vencería cuotas que aún no vencen, y nada lo revierte
+    if as_of is not None and as_of > datetime.date.today():
+        raise HTTPException(
+            status_code=400, detail="La fecha as_of no puede ser posterior a hoy"
+        )
+    try:
+        service = InstallmentStateService()
+        return await service.apply_overdue_transitions(session, as_of)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error aplicando transiciones: {str(e)}"
+        )
+
+
+@router.get("/jobs", response_model=List[JobInfo])
+async def list_jobs():
+    return scheduler.list_jobs()
+
+
+@router.post("/jobs/{job_name}/run")
+async def run_job(job_name: str, background_tasks: BackgroundTasks):
+    if not scheduler.get_job(job_name):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    background_tasks.add_task(scheduler.run_job, job_name, "manual")
+
+    return {
+        "job_name": job_name,
+        "status": "accepted",
+        "message": f"Trabajo {job_name} en ejecución; consulte /admin/jobs/history",
+    }
+
+
+@router.get("/jobs/history", response_model=JobRunList)
+async def get_job_history(
+    job_name: Optional[str] = None,
+    limit: int = Query(50, gt=0, le=500),
+    session: AsyncSession = Depends(get_db_session),
+):
+    runs = await scheduler.get_history(session, job_name, limit)
+    return JobRunList(
+        items=[JobRunResponse.model_validate(run, from_attributes=True) for run in runs]
+    )
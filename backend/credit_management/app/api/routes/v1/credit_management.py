@@ -1,7 +1,8 @@
 import os
 import tempfile
+import time
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
 from fastapi import (
     APIRouter,
@@ -10,6 +11,7 @@ from fastapi import (
     FastAPI,
     File,
     HTTPException,
+    Query,
     UploadFile,
 )
 from fastapi.responses import JSONResponse
@@ -17,9 +19,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....utils.ExcelLoaderService import ExcelLoaderService
+from ....utils.ExcelUpsertService import ExcelUpsertService
+from ....utils.Metrics import IMPORT_ROWS, IMPORT_SECONDS
 
 router = APIRouter()
 
+IMPORTED_ENTITIES = (
+    "clients",
+    "managers",
+    "credits",
+    "installments",
+    "portfolios",
+    "alerts",
+    "reconciliations",
+)
+
 loading_tasks = {}
 
 
@@ -27,6 +41,13 @@ loading_tasks = {}
 async def upload_excel(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    mode: Literal["insert", "upsert"] = Query(
+        "insert",
+        description=(
+            "insert: carga todas las filas como registros nuevos; "
+            "upsert: actualiza los registros existentes por su clave natural"
+        ),
+    ),
     session: AsyncSession = Depends(get_db_session),
 ):
 
@@ -46,12 +67,13 @@ async def upload_excel(
         loading_tasks[task_id] = {
             "status": "processing",
             "filename": file.filename,
+            "mode": mode,
             "results": None,
             "error": None,
         }
 
         background_tasks.add_task(
-            process_excel_background, task_id, tmp_file_path, session
+            process_excel_background, task_id, tmp_file_path, session, mode
         )
 
         return {
@@ -66,22 +88,32 @@ async def upload_excel(
         )
 
 
-async def process_excel_background(task_id: str, file_path: str, session: AsyncSession):
+async def process_excel_background(
+    task_id: str, file_path: str, session: AsyncSession, mode: str = "insert"
+):
+    started = time.perf_counter()
     try:
         loading_tasks[task_id]["status"] = "processing"
 
-        loader = ExcelLoaderService()
+        loader = ExcelUpsertService() if mode == "upsert" else ExcelLoaderService()
 
         results = await loader.load_excel_to_database(file_path, session)
 
         loading_tasks[task_id]["status"] = "completed"
         loading_tasks[task_id]["results"] = results
 
+        for entity in IMPORTED_ENTITIES:
+            if results.get(entity):
+                IMPORT_ROWS.labels(mode, entity).inc(results[entity])
+
     except Exception as e:
         loading_tasks[task_id]["status"] = "error"
         loading_tasks[task_id]["error"] = str(e)
 
     finally:
+        IMPORT_SECONDS.labels(mode, loading_tasks[task_id]["status"]).observe(
+            time.perf_counter() - started
+        )
         try:
             os.unlink(file_path)
         except:
@@ -5,7 +5,7 @@ Dashboard API routes
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....config.database import get_db_session
+from ....config.database import get_read_session
 from ....controllers.alert import AlertController
 from ....controllers.client import ClientController
 from ....controllers.credit import CreditController
@@ -15,13 +15,14 @@ from ....controllers.portfolio import PortfolioController
 from ....controllers.reconciliation import ReconciliationController
 from ....schemas.base import PaginationParams
 from ....schemas.Dashboard import DashboardData, DashboardStats
+from ....utils.FastJSONResponse import FastJSONResponse
 
 router = APIRouter()
 
 
 @router.post("/get_dashboard_data", response_model=DashboardData, tags=["Dashboard"])
 async def get_dashboard_data(
-    pagination: PaginationParams, session: AsyncSession = Depends(get_db_session)
+    pagination: PaginationParams, session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get consolidated dashboard data in a single request.
@@ -84,4 +85,4 @@ async def get_dashboard_data(
         recent_reconciliations=reconciliations_data.items,
     )
 
-    return dashboard_data
+    return FastJSONResponse(dashboard_data)
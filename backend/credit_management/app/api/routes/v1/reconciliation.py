@@ -3,8 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.reconciliation import ReconciliationController
-from ....schemas.base import PaginationParams
+from ....schemas.base import ChangeFeedParams, PaginationParams
 from ....schemas.Reconciliation import (
+    ReconciliationChanges,
     ReconciliationCreate,
     ReconciliationList,
     ReconciliationResponse,
@@ -35,6 +36,18 @@ async def get_reconciliations(
     return await controller.get_multi_paginated(session, pagination)
 
 
+@router.post(
+    "/get_reconciliation_changes",
+    response_model=ReconciliationChanges,
+    tags=["Reconciliations"],
+)
+async def get_reconciliation_changes(
+    params: ChangeFeedParams, session: AsyncSession = Depends(get_db_session)
+):
+    controller = ReconciliationController()
+    return await controller.get_changes(session, params)
+
+
 @router.post(
     "/create_reconciliation",
     response_model=ReconciliationResponse,
@@ -1,4 +1,5 @@
 import pathlib
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +23,22 @@ class BackendBaseSettings(BaseSettings):
     DEBUG: bool = Field(default=False, env="DEBUG")
     ENVIRONMENT: str = Field(default="local", env="ENVIRONMENT")
     LOG_LEVEL: str = Field(default="DEBUG", env="LOG_LEVEL")
+    # Records buffered for the log writer thread; beyond this they are dropped
+    LOG_QUEUE_SIZE: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    # One of every N per-row import messages is kept after the first ones
+    LOG_ROW_SAMPLE_RATE: int = Field(default=100, env="LOG_ROW_SAMPLE_RATE")
+    LOG_SQL: bool = Field(default=False, env="LOG_SQL")
+
+    # Authentication. HS* algorithms use the shared secret; asymmetric ones
+    # (RS*, ES*, PS*) a PEM public key or the key set published at a JWKS URL
+    JWT_SECRET_KEY: Optional[str] = Field(default=None, env="JWT_SECRET_KEY")
+    JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")
+    JWT_PUBLIC_KEY: Optional[str] = Field(default=None, env="JWT_PUBLIC_KEY")
+    JWT_JWKS_URL: Optional[str] = Field(default=None, env="JWT_JWKS_URL")
+    JWT_JWKS_CACHE_SECONDS: int = Field(default=3600, env="JWT_JWKS_CACHE_SECONDS")
+    # Verified tokens kept in memory, each until its exp or this TTL
+    JWT_CACHE_SIZE: int = Field(default=1024, env="JWT_CACHE_SIZE")
+    JWT_CACHE_TTL_SECONDS: int = Field(default=300, env="JWT_CACHE_TTL_SECONDS")
 
     API_PREFIX: str = "/api"
     DOCS_URL: str = "/docs"
@@ -37,10 +54,46 @@ class BackendBaseSettings(BaseSettings):
     DB_PORT: int = Field(default=1433, env="DB_PORT")
     DB_NAME: str = Field(..., env="DB_NAME")
 
+    # Read replica (optional). When set, reporting and KPI reads use it; user,
+    # password, port and database default to the primary's.
+    DB_READ_HOST: Optional[str] = Field(default=None, env="DB_READ_HOST")
+    DB_READ_PORT: Optional[int] = Field(default=None, env="DB_READ_PORT")
+    DB_READ_USER: Optional[str] = Field(default=None, env="DB_READ_USER")
+    DB_READ_PASSWORD: Optional[str] = Field(default=None, env="DB_READ_PASSWORD")
+    DB_READ_NAME: Optional[str] = Field(default=None, env="DB_READ_NAME")
+    # Staleness policy: maximum replica lag tolerated before reads fall back
+    # to the primary (negative disables the check), and how often it is measured
+    DB_READ_MAX_LAG_SECONDS: int = Field(default=30, env="DB_READ_MAX_LAG_SECONDS")
+    DB_READ_LAG_CHECK_SECONDS: int = Field(default=10, env="DB_READ_LAG_CHECK_SECONDS")
+
+    # Change feeds stop before the oldest open write transaction, read from
+    # sys.dm_tran_* (needs VIEW SERVER STATE, VIEW DATABASE STATE on Azure SQL);
+    # off, they only hold back the last CHANGE_FEED_SETTLE_SECONDS
+    CHANGE_FEED_TRANSACTION_BOUND: bool = Field(
+        default=True, env="CHANGE_FEED_TRANSACTION_BOUND"
+    )
+
+    # Payment allocation engine (reconciliation upload and payment_allocation
+    # job); enable it only after credit_management/scripts/
+    # payment_allocation_backfill.sql has recorded the older reconciliations
+    PAYMENT_ALLOCATION_ENABLED: bool = Field(
+        default=False, env="PAYMENT_ALLOCATION_ENABLED"
+    )
+
     @property
     def DATABASE_URL(self) -> str:
         return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes"
 
+    @property
+    def READ_DATABASE_URL(self) -> Optional[str]:
+        if not self.DB_READ_HOST:
+            return None
+        user = self.DB_READ_USER or self.DB_USER
+        password = self.DB_READ_PASSWORD or self.DB_PASSWORD
+        port = self.DB_READ_PORT or self.DB_PORT
+        name = self.DB_READ_NAME or self.DB_NAME
+        return f"{self.DB_DRIVER}://{user}:{password}@{self.DB_READ_HOST}:{port}/{name}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes&ApplicationIntent=ReadOnly"
+
     @property
     def fastapi_kwargs(self) -> dict:
         return {
@@ -1,5 +1,6 @@
 from ..models.Installment import Installment
 from ..schemas.Installment import (
+    InstallmentChanges,
     InstallmentCreate,
     InstallmentList,
     InstallmentResponse,
@@ -18,5 +19,6 @@ class InstallmentController(BaseController):
             create_schema=InstallmentCreate,
             update_schema=InstallmentUpdate,
             list_schema=InstallmentList,
+            changes_schema=InstallmentChanges,
             not_found_message="Installment not found",
         )
@@ -2,7 +2,11 @@ from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes.routes import router as principal_router
+from .config.database import sessionmanager
 from .config.settings import settings
+from .utils.Compression import CompressionMiddleware
+from .utils.Metrics import MetricsMiddleware, metrics_endpoint, register_pool_metrics
+from .utils.QueryInstrumentation import QueryStatsMiddleware
 
 
 def create_app() -> FastAPI:
@@ -15,6 +19,11 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(QueryStatsMiddleware)
+    application.add_middleware(CompressionMiddleware)
+    application.add_middleware(MetricsMiddleware)
+    application.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    register_pool_metrics(sessionmanager.pools)
 
     application.include_router(principal_router, prefix=f"/api/{settings.APP_NAME}/v1")
 
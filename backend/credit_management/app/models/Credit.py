@@ -1,6 +1,7 @@
 import datetime
+from typing import Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, String, text
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.mssql import DATETIME2
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,15 +12,33 @@ INTEREST_RATE_MULTIPLIER = 10000
 
 class Credit(Base):
     __tablename__ = "credit"
+    __table_args__ = (Index("ix_credit_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    client_id: Mapped[int] = mapped_column(ForeignKey("client.id"), nullable=False)
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("client.id"), nullable=False, index=True
+    )
     disbursement_amount: Mapped[int] = mapped_column(Integer, nullable=False)
     disbursement_date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
     interest_rate: Mapped[int] = mapped_column(Integer, nullable=False)
     total_quotas: Mapped[int] = mapped_column(Integer, nullable=False)
-    credit_state: Mapped[str] = mapped_column(String(50), nullable=False)
-    payment_reference: Mapped[str] = mapped_column(String(50), nullable=False)
+    credit_state: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    payment_reference: Mapped[str] = mapped_column(
+        String(50), nullable=False, index=True
+    )
+
+    # Balances derived from the allocation ledger and the installments.
+    # Maintained by CreditBalanceService; never written directly.
+    total_paid: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    total_pending: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    last_payment_date: Mapped[Optional[datetime.date]] = mapped_column(Date)
+    overdue_installments: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
 
     created_at: Mapped[datetime.datetime] = mapped_column(
         DATETIME2, nullable=False, server_default=text("GETDATE()")
@@ -1,7 +1,7 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric, String, text
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.dialects.mssql import DATETIME2
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,15 @@ from .base import Base
 
 class Installment(Base):
     __tablename__ = "installment"
+    __table_args__ = (
+        Index("ix_installment_updated_at_id", "updated_at", "id"),
+        Index("ix_installment_state_due_date", "installment_state", "due_date"),
+        Index(
+            "ix_installment_credit_id_installments_number",
+            "credit_id",
+            "installments_number",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     credit_id: Mapped[int] = mapped_column(ForeignKey("credit.id"), nullable=False)
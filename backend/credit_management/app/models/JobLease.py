@@ -0,0 +1,26 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import String, text
+from sqlalchemy.dialects.mssql import DATETIME2
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JobLease(Base):
+    """One row per scheduled job; the replica holding the lease runs it."""
+
+    __tablename__ = "job_lease"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    lease_until: Mapped[datetime.datetime] = mapped_column(
+        DATETIME2, nullable=False, server_default=text("GETDATE()")
+    )
+    last_slot: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DATETIME2, nullable=True
+    )
+
+    def __repr__(self):
+        return f"<JobLease(job_name={self.job_name}, owner={self.owner}, lease_until={self.lease_until})>"
@@ -0,0 +1,33 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import Index, Integer, String, text
+from sqlalchemy.dialects.mssql import DATETIME2
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JobRun(Base):
+    __tablename__ = "job_run"
+    __table_args__ = (
+        Index("ix_job_run_job_name_started_at", "job_name", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    trigger: Mapped[str] = mapped_column(String(20), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    owner: Mapped[str] = mapped_column(String(255), nullable=False)
+    started_at: Mapped[datetime.datetime] = mapped_column(
+        DATETIME2, nullable=False, server_default=text("GETDATE()")
+    )
+    finished_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DATETIME2, nullable=True
+    )
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    result: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String(2000), nullable=True)
+
+    def __repr__(self):
+        return f"<JobRun(id={self.id}, job_name={self.job_name}, status={self.status}, started_at={self.started_at})>"
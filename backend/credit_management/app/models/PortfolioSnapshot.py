@@ -0,0 +1,30 @@
+import datetime
+
+from sqlalchemy import Date, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PortfolioSnapshot(Base):
+    """
+    Daily state of every open credit, written once per day by the
+    portfolio_snapshot job and never updated. The primary key leads with the
+    date, so each day is a contiguous range; scripts/portfolio_snapshot.sql
+    partitions the table by month. No foreign key: the history outlives the
+    credits.
+    """
+
+    __tablename__ = "portfolio_snapshot"
+
+    snapshot_date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    credit_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=False
+    )
+    # Delinquency bucket, see PortfolioSnapshotService.SNAPSHOT_BUCKETS
+    bucket: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    # Pending balance of the credit (credit.total_pending)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<PortfolioSnapshot(snapshot_date={self.snapshot_date}, credit_id={self.credit_id}, bucket={self.bucket})>"
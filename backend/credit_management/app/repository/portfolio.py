@@ -1,11 +1,13 @@
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from ..models.Manager import Manager
 from ..models.Portfolio import Portfolio
-from ..schemas.base import PaginationParams
-from ..schemas.Portfolio import PortfolioList, PortfolioResponse
+from ..schemas.base import ChangeFeedParams, PaginationParams
+from ..schemas.Portfolio import PortfolioChanges, PortfolioList, PortfolioResponse
 from .base import BaseRepository
 
 
@@ -17,6 +19,7 @@ class PortfolioRepository(BaseRepository):
             model=Portfolio,
             get_schema=PortfolioResponse,
             list_schema=PortfolioList,
+            changes_schema=PortfolioChanges,
         )
 
     async def get_by_id(self, db: AsyncSession, id: int) -> PortfolioResponse | None:
@@ -36,9 +39,11 @@ class PortfolioRepository(BaseRepository):
         db: AsyncSession,
         pagination: PaginationParams,
         estimate_count: bool = True,
+        fields: Optional[List[str]] = None,
     ) -> PortfolioList:
         """Get paginated portfolios with manager information."""
-        from sqlalchemy import func
+        if fields:
+            return await self._get_sparse_page(db, pagination, estimate_count, fields)
 
         # Get items with manager data
         result = await db.execute(
@@ -54,17 +59,7 @@ class PortfolioRepository(BaseRepository):
         if has_next:
             db_items = db_items[:-1]
 
-        total = 0
-        pages = 0
-
-        if estimate_count:
-            total_result = await db.execute(select(func.count()).select_from(Portfolio))
-            total = total_result.scalar_one()
-            pages = (
-                (total + pagination.page_size - 1) // pagination.page_size
-                if total > 0
-                else 0
-            )
+        total, pages = await self._count_pages(db, pagination, estimate_count)
 
         items = [self._to_response_schema(item) for item in db_items]
 
@@ -77,6 +72,27 @@ class PortfolioRepository(BaseRepository):
             has_next=has_next,
         )
 
+    async def get_changes(
+        self, db: AsyncSession, params: ChangeFeedParams
+    ) -> PortfolioChanges:
+        """Get changed portfolios with manager information."""
+        result = await self._execute_changes(
+            db,
+            lambda: self._changes_query(params).options(joinedload(Portfolio.manager)),
+        )
+        return self._changes_page(
+            result.unique().scalars().all(), params, self._to_response_schema
+        )
+
+    def _sparse_columns(self) -> Dict[str, Any]:
+        return {**super()._sparse_columns(), "manager_name": Manager.name}
+
+    def _sparse_query(self, fields: List[str], columns: List[Any]) -> Select:
+        query = select(*columns).select_from(Portfolio)
+        if "manager_name" in fields:
+            query = query.outerjoin(Manager, Manager.id == Portfolio.manager_id)
+        return query
+
     def _to_response_schema(self, db_obj: Portfolio) -> PortfolioResponse:
         """Convert Portfolio model to response schema with manager name."""
         return PortfolioResponse(
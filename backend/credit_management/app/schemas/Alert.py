@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from .base import BaseResponseSchema, BaseSchema, ListBase
+from .base import BaseResponseSchema, BaseSchema, ChangeFeedBase, ListBase
 
 
 class AlertCreate(BaseModel):
@@ -37,3 +37,7 @@ class AlertResponse(BaseResponseSchema):
 
 class AlertList(ListBase):
     items: List[AlertResponse]
+
+
+class AlertChanges(ChangeFeedBase):
+    items: List[AlertResponse]
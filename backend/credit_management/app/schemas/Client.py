@@ -109,6 +109,8 @@ class CreditDetailResponse(BaseModel):
 class CreditCalculatedInstallmentResponse(CreditDetailResponse):
     total_paid: Optional[int] = None
     total_pending: Optional[int] = None
+    last_payment_date: Optional[date] = None
+    overdue_installments: Optional[int] = None
 
 
 class AlertDetailResponse(BaseModel):
@@ -4,7 +4,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from .base import BaseResponseSchema, BaseSchema, ListBase
+from .base import BaseResponseSchema, BaseSchema, ChangeFeedBase, ListBase
 
 
 class InstallmentCreate(BaseModel):
@@ -46,3 +46,7 @@ class InstallmentResponse(BaseResponseSchema):
 
 class InstallmentList(ListBase):
     items: List[InstallmentResponse]
+
+
+class InstallmentChanges(ChangeFeedBase):
+    items: List[InstallmentResponse]
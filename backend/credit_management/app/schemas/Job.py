@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class JobInfo(BaseModel):
+    name: str
+    schedule: str
+    description: str
+    next_run_at: datetime
+
+
+class JobRunResponse(BaseModel):
+    id: int
+    job_name: str
+    trigger: str
+    status: str
+    owner: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[int] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobRunList(BaseModel):
+    items: List[JobRunResponse]
@@ -0,0 +1,230 @@
+import datetime
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import (
+    Boolean,
+    Date,
+    Select,
+    String,
+    and_,
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from ..config.logger import logger
+from ..models.Alert import Alert
+from ..models.Credit import Credit
+from ..models.Installment import Installment
+from ..models.Portfolio import Portfolio
+
+ALERT_NO_RESPONSE = "No respuesta"
+ALERT_ARREARS_RISK = "Riesgo de mora"
+ALERT_VISIT_REQUIRED = "Requiere visita"
+
+# Rule thresholds
+NO_RESPONSE_CONTACTS = 3  # latest N contacts of a credit all "Sin respuesta"
+UPCOMING_DUE_DAYS = 7  # installment due within X days ...
+# ... on a client that already paid late or has overdue installments
+OVERDUE_VISIT_DAYS = 30  # unpaid installment more than N days past due
+
+# An alert is not repeated for the same credit and type inside this window
+DEDUP_WINDOW_DAYS = 7
+
+# Rows inserted per statement; each batch is committed on its own so locks
+# and log growth stay bounded on large portfolios
+INSERT_BATCH_SIZE = 5000
+
+# Credits that no longer need follow-up
+CLOSED_CREDIT_STATES = ("Cancelado", "Pagado")
+OPEN_INSTALLMENT_STATES = ("Pendiente", "Vencida")
+
+
+class AlertGenerationService:
+    """
+    Generates automatic risk alerts over the whole portfolio.
+
+    Each rule is a single ``INSERT ... SELECT`` that finds the qualifying
+    credits in SQL, so the database does the work in bulk instead of loading
+    installments into Python:
+
+    - ``No respuesta``: the last ``NO_RESPONSE_CONTACTS`` portfolio contacts of
+      the credit were all "Sin respuesta".
+    - ``Riesgo de mora``: a pending installment is due within
+      ``UPCOMING_DUE_DAYS`` days and the client has paid late before or has
+      overdue installments.
+    - ``Requiere visita``: an installment is unpaid more than
+      ``OVERDUE_VISIT_DAYS`` days after its due date.
+
+    Alerts are deduplicated per credit and type over ``DEDUP_WINDOW_DAYS``
+    days, so the job can run daily (or be re-run) without flooding.
+    """
+
+    async def generate_alerts(
+        self, session: AsyncSession, as_of: Optional[datetime.date] = None
+    ) -> Dict[str, Any]:
+        as_of = as_of or datetime.date.today()
+        started = time.perf_counter()
+
+        rules = {
+            ALERT_NO_RESPONSE: self._no_response_candidates(),
+            ALERT_ARREARS_RISK: self._arrears_risk_candidates(as_of),
+            ALERT_VISIT_REQUIRED: self._visit_required_candidates(as_of),
+        }
+
+        results = {"as_of": as_of.isoformat(), "alerts": {}}
+        try:
+            for alert_type, candidates in rules.items():
+                results["alerts"][alert_type] = await self._insert_alerts(
+                    session, alert_type, candidates, as_of
+                )
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error generando alertas automáticas: {str(e)}")
+            raise
+
+        results["total"] = sum(results["alerts"].values())
+        results["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Alertas automáticas generadas: {results}")
+        return results
+
+    async def _insert_alerts(
+        self,
+        session: AsyncSession,
+        alert_type: str,
+        candidates: Select,
+        as_of: datetime.date,
+    ) -> int:
+        """Insert one alert per candidate credit, in committed batches."""
+        candidates = candidates.subquery()
+        recent_alert = aliased(Alert)
+        not_alerted = ~exists().where(
+            and_(
+                recent_alert.credit_id == candidates.c.credit_id,
+                recent_alert.alert_type == alert_type,
+                recent_alert.alert_date
+                > as_of - datetime.timedelta(days=DEDUP_WINDOW_DAYS),
+            )
+        )
+
+        batch = (
+            select(
+                candidates.c.credit_id,
+                candidates.c.client_id,
+                literal(alert_type, String(50)),
+                literal(False, Boolean),
+                literal(as_of, Date),
+            )
+            .where(not_alerted)
+            .order_by(candidates.c.credit_id)
+            .limit(INSERT_BATCH_SIZE)
+        )
+        statement = insert(Alert).from_select(
+            [
+                "credit_id",
+                "client_id",
+                "alert_type",
+                "manually_generated",
+                "alert_date",
+            ],
+            batch,
+        )
+
+        # Inserted rows fall inside the dedup window, so every pass moves on
+        # to the next candidates until none are left
+        inserted = 0
+        while True:
+            result = await session.execute(statement)
+            await session.commit()
+            inserted += result.rowcount
+            if result.rowcount < INSERT_BATCH_SIZE:
+                return inserted
+
+    def _no_response_candidates(self) -> Select:
+        ranked = (
+            select(
+                Installment.credit_id,
+                Portfolio.contact_result,
+                func.row_number()
+                .over(
+                    partition_by=Installment.credit_id,
+                    order_by=(Portfolio.management_date.desc(), Portfolio.id.desc()),
+                )
+                .label("contact_rank"),
+            )
+            .join(Installment, Installment.id == Portfolio.installment_id)
+            .subquery()
+        )
+        unanswered = (
+            select(ranked.c.credit_id)
+            .where(ranked.c.contact_rank <= NO_RESPONSE_CONTACTS)
+            .group_by(ranked.c.credit_id)
+            .having(
+                func.sum(case((ranked.c.contact_result == "Sin respuesta", 1), else_=0))
+                == NO_RESPONSE_CONTACTS
+            )
+            .subquery()
+        )
+        return select(
+            Credit.id.label("credit_id"), Credit.client_id.label("client_id")
+        ).where(
+            Credit.id.in_(select(unanswered.c.credit_id)),
+            Credit.credit_state.not_in(CLOSED_CREDIT_STATES),
+        )
+
+    def _arrears_risk_candidates(self, as_of: datetime.date) -> Select:
+        upcoming = exists().where(
+            and_(
+                Installment.credit_id == Credit.id,
+                Installment.installment_state == "Pendiente",
+                Installment.due_date.between(
+                    as_of, as_of + datetime.timedelta(days=UPCOMING_DUE_DAYS)
+                ),
+            )
+        )
+
+        history_credit = aliased(Credit)
+        history_installment = aliased(Installment)
+        late_history = exists().where(
+            and_(
+                history_credit.client_id == Credit.client_id,
+                history_installment.credit_id == history_credit.id,
+                or_(
+                    history_installment.installment_state == "Vencida",
+                    history_installment.payment_date > history_installment.due_date,
+                ),
+            )
+        )
+
+        return select(
+            Credit.id.label("credit_id"), Credit.client_id.label("client_id")
+        ).where(
+            Credit.credit_state.not_in(CLOSED_CREDIT_STATES),
+            upcoming,
+            late_history,
+        )
+
+    def _visit_required_candidates(self, as_of: datetime.date) -> Select:
+        long_overdue = exists().where(
+            and_(
+                Installment.credit_id == Credit.id,
+                Installment.installment_state.in_(OPEN_INSTALLMENT_STATES),
+                Installment.payment_date.is_(None),
+                Installment.due_date
+                < as_of - datetime.timedelta(days=OVERDUE_VISIT_DAYS),
+            )
+        )
+
+        return select(
+            Credit.id.label("credit_id"), Credit.client_id.label("client_id")
+        ).where(
+            Credit.credit_state.not_in(CLOSED_CREDIT_STATES),
+            long_overdue,
+        )
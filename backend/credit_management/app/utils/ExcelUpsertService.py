@@ -0,0 +1,788 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.logger import logger
+from ..models.Credit import INTEREST_RATE_MULTIPLIER, Credit
+from .CreditBalanceService import CreditBalanceService
+from .ExcelLoaderService import (
+    ALERT_TYPE_MAPPING,
+    CLIENT_STATE_MAPPING,
+    CONTACT_METHOD_MAPPING,
+    CONTACT_RESULT_MAPPING,
+    CREDIT_STATE_MAPPING,
+    INSTALLMENT_STATE_MAPPING,
+    MANAGER_ZONE_MAPPING,
+    PAYMENT_CHANNEL_MAPPING,
+)
+
+# Rows sent per executemany round trip when filling the staging tables
+STAGING_BATCH_SIZE = 1000
+
+# Session-scoped staging tables. They live on the connection held by the
+# session, so they are dropped explicitly before the connection goes back
+# to the pool.
+STAGING_TABLES = {
+    "#stg_client": """
+        CREATE TABLE #stg_client (
+            row_no INT NOT NULL,
+            source_id INT NOT NULL,
+            name NVARCHAR(100) NOT NULL,
+            document NVARCHAR(20) NOT NULL,
+            phone NVARCHAR(20) NOT NULL,
+            email NVARCHAR(100) NOT NULL,
+            address NVARCHAR(255) NOT NULL,
+            zone NVARCHAR(100) NULL,
+            status NVARCHAR(50) NOT NULL
+        )
+    """,
+    "#stg_manager": """
+        CREATE TABLE #stg_manager (
+            row_no INT NOT NULL,
+            source_id INT NOT NULL,
+            name NVARCHAR(100) NOT NULL,
+            manager_zone NVARCHAR(50) NOT NULL
+        )
+    """,
+    "#stg_credit": """
+        CREATE TABLE #stg_credit (
+            row_no INT NOT NULL,
+            source_id INT NOT NULL,
+            client_source_id INT NOT NULL,
+            credit_state NVARCHAR(50) NOT NULL,
+            disbursement_amount INT NOT NULL,
+            payment_reference NVARCHAR(50) NOT NULL,
+            disbursement_date DATE NOT NULL,
+            interest_rate INT NOT NULL,
+            total_quotas INT NOT NULL
+        )
+    """,
+    "#stg_installment": """
+        CREATE TABLE #stg_installment (
+            row_no INT NOT NULL,
+            source_id INT NOT NULL,
+            credit_source_id INT NOT NULL,
+            installment_state NVARCHAR(50) NOT NULL,
+            installments_number INT NOT NULL,
+            installments_value NUMERIC(18, 0) NOT NULL,
+            due_date DATE NOT NULL,
+            payment_date DATE NULL
+        )
+    """,
+    "#stg_portfolio": """
+        CREATE TABLE #stg_portfolio (
+            row_no INT NOT NULL,
+            installment_source_id INT NOT NULL,
+            manager_source_id INT NOT NULL,
+            contact_method NVARCHAR(50) NOT NULL,
+            contact_result NVARCHAR(50) NOT NULL,
+            management_date DATE NOT NULL,
+            observation NVARCHAR(500) NULL
+        )
+    """,
+    "#stg_alert": """
+        CREATE TABLE #stg_alert (
+            row_no INT NOT NULL,
+            credit_source_id INT NOT NULL,
+            alert_type NVARCHAR(50) NOT NULL,
+            manually_generated BIT NOT NULL,
+            alert_date DATE NOT NULL
+        )
+    """,
+    "#stg_reconciliation": """
+        CREATE TABLE #stg_reconciliation (
+            row_no INT NOT NULL,
+            payment_channel NVARCHAR(50) NOT NULL,
+            payment_reference NVARCHAR(50) NOT NULL,
+            payment_amount INT NOT NULL,
+            transaction_date DATE NOT NULL,
+            observation NVARCHAR(500) NULL
+        )
+    """,
+    "#merge_log": """
+        CREATE TABLE #merge_log (
+            entity NVARCHAR(20) NOT NULL,
+            action NVARCHAR(10) NOT NULL
+        )
+    """,
+}
+
+# Natural key lookups. MIN(id) keeps the merge deterministic on databases
+# that already hold duplicates from earlier insert-only imports.
+CLIENT_KEYS = "(SELECT document, MIN(id) AS id FROM client GROUP BY document)"
+MANAGER_KEYS = "(SELECT name, MIN(id) AS id FROM manager GROUP BY name)"
+CREDIT_KEYS = (
+    "(SELECT payment_reference, MIN(id) AS id, MIN(client_id) AS client_id "
+    "FROM credit GROUP BY payment_reference)"
+)
+INSTALLMENT_KEYS = (
+    "(SELECT credit_id, installments_number, MIN(id) AS id "
+    "FROM installment GROUP BY credit_id, installments_number)"
+)
+
+# Resolved merge sources, one row per natural key (latest sheet row wins)
+CLIENT_SOURCE = """
+    SELECT name, document, phone, email, address, zone, status
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY document ORDER BY row_no DESC
+        ) AS rn
+        FROM #stg_client
+    ) s
+    WHERE s.rn = 1
+"""
+
+MANAGER_SOURCE = """
+    SELECT name, manager_zone
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY name ORDER BY row_no DESC
+        ) AS rn
+        FROM #stg_manager
+    ) s
+    WHERE s.rn = 1
+"""
+
+CREDIT_SOURCE = f"""
+    SELECT s.payment_reference, ck.id AS client_id, s.credit_state,
+           s.disbursement_amount, s.disbursement_date, s.interest_rate,
+           s.total_quotas
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY payment_reference ORDER BY row_no DESC
+        ) AS rn
+        FROM #stg_credit
+    ) s
+    JOIN #stg_client sc ON sc.source_id = s.client_source_id
+    JOIN {CLIENT_KEYS} ck ON ck.document = sc.document
+    WHERE s.rn = 1
+"""
+
+INSTALLMENT_SOURCE = f"""
+    SELECT credit_id, installments_number, installment_state,
+           installments_value, due_date, payment_date
+    FROM (
+        SELECT crk.id AS credit_id, s.installments_number, s.installment_state,
+               s.installments_value, s.due_date, s.payment_date,
+               ROW_NUMBER() OVER (
+                   PARTITION BY crk.id, s.installments_number
+                   ORDER BY s.row_no DESC
+               ) AS rn
+        FROM #stg_installment s
+        JOIN #stg_credit sc ON sc.source_id = s.credit_source_id
+        JOIN {CREDIT_KEYS} crk ON crk.payment_reference = sc.payment_reference
+    ) r
+    WHERE r.rn = 1
+"""
+
+PORTFOLIO_SOURCE = f"""
+    SELECT installment_id, manager_id, contact_method, contact_result,
+           management_date, observation
+    FROM (
+        SELECT ik.id AS installment_id, mk.id AS manager_id, s.contact_method,
+               s.contact_result, s.management_date, s.observation,
+               ROW_NUMBER() OVER (
+                   PARTITION BY ik.id, mk.id, s.management_date, s.contact_method
+                   ORDER BY s.row_no DESC
+               ) AS rn
+        FROM #stg_portfolio s
+        JOIN #stg_installment si ON si.source_id = s.installment_source_id
+        JOIN #stg_credit sc ON sc.source_id = si.credit_source_id
+        JOIN {CREDIT_KEYS} crk ON crk.payment_reference = sc.payment_reference
+        JOIN {INSTALLMENT_KEYS} ik
+            ON ik.credit_id = crk.id
+            AND ik.installments_number = si.installments_number
+        JOIN #stg_manager sm ON sm.source_id = s.manager_source_id
+        JOIN {MANAGER_KEYS} mk ON mk.name = sm.name
+    ) r
+    WHERE r.rn = 1
+"""
+
+ALERT_SOURCE = f"""
+    SELECT credit_id, client_id, alert_type, manually_generated, alert_date
+    FROM (
+        SELECT crk.id AS credit_id, crk.client_id, s.alert_type,
+               s.manually_generated, s.alert_date,
+               ROW_NUMBER() OVER (
+                   PARTITION BY crk.id, s.alert_type, s.alert_date
+                   ORDER BY s.row_no DESC
+               ) AS rn
+        FROM #stg_alert s
+        JOIN #stg_credit sc ON sc.source_id = s.credit_source_id
+        JOIN {CREDIT_KEYS} crk ON crk.payment_reference = sc.payment_reference
+    ) r
+    WHERE r.rn = 1
+"""
+
+RECONCILIATION_SOURCE = """
+    SELECT payment_channel, payment_reference, payment_amount,
+           transaction_date, observation
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY payment_reference, transaction_date,
+                         payment_amount, payment_channel
+            ORDER BY row_no DESC
+        ) AS rn
+        FROM #stg_reconciliation
+    ) s
+    WHERE s.rn = 1
+"""
+
+# Client and manager rows are staged after the target rows exist, so the
+# dependent sources can be resolved in the same transaction.
+MERGE_STATEMENTS = [
+    (
+        "clients",
+        "#stg_client",
+        CLIENT_SOURCE,
+        f"""
+        MERGE client WITH (HOLDLOCK) AS t
+        USING ({CLIENT_SOURCE}) AS s
+            ON t.document = s.document
+        WHEN MATCHED AND (
+            t.name <> s.name OR t.phone <> s.phone OR t.email <> s.email
+            OR t.address <> s.address OR t.status <> s.status
+            OR ISNULL(t.zone, '') <> ISNULL(s.zone, '')
+        ) THEN UPDATE SET
+            name = s.name, phone = s.phone, email = s.email,
+            address = s.address, zone = s.zone, status = s.status
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (name, document, phone, email, address, zone, status)
+            VALUES (s.name, s.document, s.phone, s.email, s.address, s.zone,
+                    s.status)
+        OUTPUT 'clients', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "managers",
+        "#stg_manager",
+        MANAGER_SOURCE,
+        f"""
+        MERGE manager WITH (HOLDLOCK) AS t
+        USING ({MANAGER_SOURCE}) AS s
+            ON t.name = s.name
+        WHEN MATCHED AND t.manager_zone <> s.manager_zone THEN
+            UPDATE SET manager_zone = s.manager_zone
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (name, manager_zone) VALUES (s.name, s.manager_zone)
+        OUTPUT 'managers', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "credits",
+        "#stg_credit",
+        CREDIT_SOURCE,
+        f"""
+        MERGE credit WITH (HOLDLOCK) AS t
+        USING ({CREDIT_SOURCE}) AS s
+            ON t.payment_reference = s.payment_reference
+        WHEN MATCHED AND (
+            t.client_id <> s.client_id OR t.credit_state <> s.credit_state
+            OR t.disbursement_amount <> s.disbursement_amount
+            OR t.disbursement_date <> s.disbursement_date
+            OR t.interest_rate <> s.interest_rate
+            OR t.total_quotas <> s.total_quotas
+        ) THEN UPDATE SET
+            client_id = s.client_id, credit_state = s.credit_state,
+            disbursement_amount = s.disbursement_amount,
+            disbursement_date = s.disbursement_date,
+            interest_rate = s.interest_rate, total_quotas = s.total_quotas
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (client_id, credit_state, disbursement_amount,
+                    payment_reference, disbursement_date, interest_rate,
+                    total_quotas)
+            VALUES (s.client_id, s.credit_state, s.disbursement_amount,
+                    s.payment_reference, s.disbursement_date, s.interest_rate,
+                    s.total_quotas)
+        OUTPUT 'credits', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "installments",
+        "#stg_installment",
+        INSTALLMENT_SOURCE,
+        f"""
+        MERGE installment WITH (HOLDLOCK) AS t
+        USING ({INSTALLMENT_SOURCE}) AS s
+            ON t.credit_id = s.credit_id
+            AND t.installments_number = s.installments_number
+        WHEN MATCHED AND (
+            t.installment_state <> s.installment_state
+            OR t.installments_value <> s.installments_value
+            OR t.due_date <> s.due_date
+            OR ISNULL(t.payment_date, '19000101')
+                <> ISNULL(s.payment_date, '19000101')
+        ) THEN UPDATE SET
+            installment_state = s.installment_state,
+            installments_value = s.installments_value,
+            due_date = s.due_date, payment_date = s.payment_date
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (credit_id, installment_state, installments_number,
+                    installments_value, due_date, payment_date)
+            VALUES (s.credit_id, s.installment_state, s.installments_number,
+                    s.installments_value, s.due_date, s.payment_date)
+        OUTPUT 'installments', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "portfolios",
+        "#stg_portfolio",
+        PORTFOLIO_SOURCE,
+        f"""
+        MERGE portfolio WITH (HOLDLOCK) AS t
+        USING ({PORTFOLIO_SOURCE}) AS s
+            ON t.installment_id = s.installment_id
+            AND t.manager_id = s.manager_id
+            AND t.management_date = s.management_date
+            AND t.contact_method = s.contact_method
+        WHEN MATCHED AND (
+            t.contact_result <> s.contact_result
+            OR ISNULL(t.observation, '') <> ISNULL(s.observation, '')
+        ) THEN UPDATE SET
+            contact_result = s.contact_result, observation = s.observation
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (installment_id, manager_id, contact_method, contact_result,
+                    management_date, observation)
+            VALUES (s.installment_id, s.manager_id, s.contact_method,
+                    s.contact_result, s.management_date, s.observation)
+        OUTPUT 'portfolios', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "alerts",
+        "#stg_alert",
+        ALERT_SOURCE,
+        f"""
+        MERGE alert WITH (HOLDLOCK) AS t
+        USING ({ALERT_SOURCE}) AS s
+            ON t.credit_id = s.credit_id
+            AND t.alert_type = s.alert_type
+            AND t.alert_date = s.alert_date
+        WHEN MATCHED AND t.manually_generated <> s.manually_generated THEN
+            UPDATE SET manually_generated = s.manually_generated
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (credit_id, client_id, alert_type, manually_generated,
+                    alert_date)
+            VALUES (s.credit_id, s.client_id, s.alert_type,
+                    s.manually_generated, s.alert_date)
+        OUTPUT 'alerts', $action INTO #merge_log (entity, action);
+        """,
+    ),
+    (
+        "reconciliations",
+        "#stg_reconciliation",
+        RECONCILIATION_SOURCE,
+        f"""
+        MERGE reconciliation WITH (HOLDLOCK) AS t
+        USING ({RECONCILIATION_SOURCE}) AS s
+            ON t.payment_reference = s.payment_reference
+            AND t.transaction_date = s.transaction_date
+            AND t.payment_amount = s.payment_amount
+            AND t.payment_channel = s.payment_channel
+        WHEN MATCHED AND ISNULL(t.observation, '') <> ISNULL(s.observation, '')
+        THEN UPDATE SET observation = s.observation
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (payment_channel, payment_reference, payment_amount,
+                    transaction_date, observation)
+            VALUES (s.payment_channel, s.payment_reference, s.payment_amount,
+                    s.transaction_date, s.observation)
+        OUTPUT 'reconciliations', $action INTO #merge_log (entity, action);
+        """,
+    ),
+]
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Return a sheet column, or an all-missing column when it is absent."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(pd.NA, index=df.index, dtype="object")
+
+
+def _text(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip()
+
+
+def _mapped(series: pd.Series, mapping: Dict[str, str], default: str) -> pd.Series:
+    return _text(series).map(mapping).fillna(default)
+
+
+def _integer(series: pd.Series, multiplier: int = 1) -> pd.Series:
+    # Same truncation as int(float(value)) in the row-by-row loader
+    values = pd.to_numeric(series, errors="coerce") * multiplier
+    return np.trunc(values).astype("Int64")
+
+
+def _date(series: pd.Series) -> pd.Series:
+    # Sheets mix "dd/mm/yyyy" strings with native Excel dates, parse per value
+    return pd.to_datetime(
+        series, dayfirst=True, errors="coerce", format="mixed"
+    ).dt.date
+
+
+class ExcelUpsertService:
+    """
+    Idempotent variant of ``ExcelLoaderService``.
+
+    Each sheet is normalized with pandas, bulk-loaded into a staging table and
+    applied with one ``MERGE`` per entity keyed by natural identifiers, so
+    re-uploading a workbook (or a monthly refresh file) updates existing rows
+    instead of duplicating them:
+
+    - Clientes: ``document``
+    - Gestores: ``name``
+    - Créditos: ``payment_reference``
+    - Detalle Cuotas: ``(credit, installments_number)``
+    - Cartera: ``(installment, manager, management_date, contact_method)``
+    - Alertas: ``(credit, alert_type, alert_date)``
+    - Conciliaciones: ``(payment_reference, transaction_date, payment_amount,
+      payment_channel)``
+    """
+
+    async def load_excel_to_database(
+        self, file_path: str, session: AsyncSession
+    ) -> Dict[str, Any]:
+        results = {
+            "mode": "upsert",
+            "clients": 0,
+            "credits": 0,
+            "installments": 0,
+            "managers": 0,
+            "portfolios": 0,
+            "alerts": 0,
+            "reconciliations": 0,
+            "inserted": {},
+            "updated": {},
+            "skipped": {},
+            "errors": [],
+        }
+
+        try:
+            excel_data = pd.read_excel(file_path, sheet_name=None)
+
+            staged = {
+                "#stg_client": self._normalize_clients(
+                    excel_data.get("Clientes", pd.DataFrame()), results
+                ),
+                "#stg_manager": self._normalize_managers(
+                    excel_data.get("Gestores", pd.DataFrame()), results
+                ),
+                "#stg_credit": self._normalize_credits(
+                    excel_data.get("Créditos", pd.DataFrame()), results
+                ),
+                "#stg_installment": self._normalize_installments(
+                    excel_data.get("Detalle Cuotas", pd.DataFrame()), results
+                ),
+                "#stg_portfolio": self._normalize_portfolio(
+                    excel_data.get("Cartera", pd.DataFrame()), results
+                ),
+                "#stg_alert": self._normalize_alerts(
+                    excel_data.get("Alertas", pd.DataFrame()), results
+                ),
+                "#stg_reconciliation": self._normalize_reconciliations(
+                    excel_data.get("Conciliaciones", pd.DataFrame()), results
+                ),
+            }
+
+            await self._drop_staging_tables(session)
+            for ddl in STAGING_TABLES.values():
+                await session.execute(text(ddl))
+
+            for table, df in staged.items():
+                await self._stage(session, table, df)
+
+            for entity, table, source_sql, merge_sql in MERGE_STATEMENTS:
+                if staged[table].empty:
+                    continue
+
+                resolved = await session.execute(
+                    text(f"SELECT COUNT(*) FROM ({source_sql}) r")
+                )
+                skipped = len(staged[table]) - resolved.scalar_one()
+                if skipped > 0:
+                    results["skipped"][entity] = skipped
+                    results["errors"].append(
+                        f"{skipped} filas de {entity} omitidas: "
+                        "referencias no encontradas o duplicadas en el archivo"
+                    )
+
+                await session.execute(text(merge_sql))
+
+            merge_log = await session.execute(
+                text(
+                    "SELECT entity, action, COUNT(*) FROM #merge_log "
+                    "GROUP BY entity, action"
+                )
+            )
+            for entity, action, count in merge_log.all():
+                bucket = "inserted" if action == "INSERT" else "updated"
+                results[bucket][entity] = count
+                results[entity] += count
+
+            # Every staged installment belongs to a staged credit
+            results["balances_refreshed"] = await CreditBalanceService().refresh(
+                session,
+                Credit.payment_reference.in_(
+                    select(column("payment_reference")).select_from(
+                        table("#stg_credit")
+                    )
+                ),
+            )
+
+            await self._drop_staging_tables(session)
+            await session.commit()
+            logger.info(
+                f"Upsert completado: insertados={results['inserted']}, "
+                f"actualizados={results['updated']}, omitidos={results['skipped']}"
+            )
+            return results
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error en el proceso de upsert: {str(e)}")
+            raise
+
+    async def _drop_staging_tables(self, session: AsyncSession):
+        for table in STAGING_TABLES:
+            await session.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+    async def _stage(self, session: AsyncSession, table: str, df: pd.DataFrame):
+        if df.empty:
+            return
+
+        columns = list(df.columns)
+        insert_sql = text(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f':{column}' for column in columns)})"
+        )
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+        for start in range(0, len(records), STAGING_BATCH_SIZE):
+            await session.execute(
+                insert_sql, records[start : start + STAGING_BATCH_SIZE]
+            )
+
+    def _finalize(
+        self,
+        df: pd.DataFrame,
+        required: List[str],
+        sheet: str,
+        results: Dict[str, Any],
+        unique: List[str] = None,
+    ) -> pd.DataFrame:
+        """Drop incomplete rows and duplicated source ids, reporting both."""
+        incomplete = df[required].isna().any(axis=1)
+        if incomplete.any():
+            error_msg = (
+                f"{int(incomplete.sum())} filas de '{sheet}' omitidas por datos "
+                "incompletos o inválidos"
+            )
+            logger.warning(error_msg)
+            results["errors"].append(error_msg)
+            df = df[~incomplete]
+
+        if unique:
+            duplicated = df.duplicated(subset=unique, keep="last")
+            if duplicated.any():
+                error_msg = (
+                    f"{int(duplicated.sum())} filas de '{sheet}' con identificador "
+                    "repetido; se conserva la última"
+                )
+                logger.warning(error_msg)
+                results["errors"].append(error_msg)
+                df = df[~duplicated]
+
+        return df
+
+    def _normalize_clients(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de clientes")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "source_id": _integer(_column(df, "ID_Cliente")),
+                "name": _text(_column(df, "Nombre")),
+                "document": _text(_column(df, "Documento")),
+                "phone": _text(_column(df, "Teléfono")),
+                "email": _text(_column(df, "Correo")),
+                "address": _text(_column(df, "Dirección")).fillna(""),
+                "zone": _text(_column(df, "Zona")),
+                "status": _mapped(
+                    _column(df, "Estado_Cliente"), CLIENT_STATE_MAPPING, "Activo"
+                ),
+            }
+        )
+        return self._finalize(
+            out,
+            ["source_id", "name", "document", "phone", "email"],
+            "Clientes",
+            results,
+            unique=["source_id"],
+        )
+
+    def _normalize_managers(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de gestores")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "source_id": _integer(_column(df, "Numero_Gestor")),
+                "name": _text(_column(df, "Nombre_Gestor")),
+                "manager_zone": _mapped(
+                    _column(df, "Zona_Asignada"), MANAGER_ZONE_MAPPING, "Rural"
+                ),
+            }
+        )
+        return self._finalize(
+            out, ["source_id", "name"], "Gestores", results, unique=["source_id"]
+        )
+
+    def _normalize_credits(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de créditos")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "source_id": _integer(_column(df, "Numero_Credito")),
+                "client_source_id": _integer(_column(df, "Numero_Cliente")),
+                "credit_state": _mapped(
+                    _column(df, "Estado_Credito"), CREDIT_STATE_MAPPING, "Pendiente"
+                ),
+                "disbursement_amount": _integer(_column(df, "Monto_Original")),
+                "payment_reference": _text(_column(df, "Referencia_Pago")),
+                "disbursement_date": _date(_column(df, "Fecha_Desembolso")),
+                "interest_rate": _integer(
+                    _column(df, "Tasa_Interes"), INTEREST_RATE_MULTIPLIER
+                ),
+                "total_quotas": _integer(_column(df, "Cuotas_Totales")),
+            }
+        )
+        return self._finalize(
+            out,
+            list(out.columns),
+            "Créditos",
+            results,
+            unique=["source_id"],
+        )
+
+    def _normalize_installments(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de cuotas")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "source_id": _integer(_column(df, "Numero_Cuota")),
+                "credit_source_id": _integer(_column(df, "Numero_Credito")),
+                "installment_state": _mapped(
+                    _column(df, "Estado_Cuota"), INSTALLMENT_STATE_MAPPING, "Pendiente"
+                ),
+                "installments_number": _integer(_column(df, "Numero_Cuota2")),
+                "installments_value": _integer(_column(df, "Valor_Cuota")),
+                "due_date": _date(_column(df, "Fecha_Vencimiento")),
+                "payment_date": _date(_column(df, "Fecha_Pago")),
+            }
+        )
+        return self._finalize(
+            out,
+            [column for column in out.columns if column != "payment_date"],
+            "Detalle Cuotas",
+            results,
+            unique=["source_id"],
+        )
+
+    def _normalize_portfolio(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de gestiones")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "installment_source_id": _integer(_column(df, "Numero_Cuota")),
+                "manager_source_id": _integer(_column(df, "Numero del Gestor")),
+                "contact_method": _mapped(
+                    _column(df, "Medio_Contacto"), CONTACT_METHOD_MAPPING, "Telefono"
+                ),
+                "contact_result": _mapped(
+                    _column(df, "Resultado"), CONTACT_RESULT_MAPPING, "Sin respuesta"
+                ),
+                "management_date": _date(_column(df, "Fecha_Gestion")),
+                "observation": _text(_column(df, "Observaciones")),
+            }
+        )
+        return self._finalize(
+            out,
+            ["installment_source_id", "manager_source_id", "management_date"],
+            "Cartera",
+            results,
+        )
+
+    def _normalize_alerts(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de alertas")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "credit_source_id": _integer(_column(df, "Numero_Credito")),
+                "alert_type": _mapped(
+                    _column(df, "Tipo_Alerta"), ALERT_TYPE_MAPPING, "No respuesta"
+                ),
+                "manually_generated": _text(_column(df, "Generada_Manualmente"))
+                .str.lower()
+                .isin(["si", "yes", "true"]),
+                "alert_date": _date(_column(df, "Fecha_Alerta")),
+            }
+        )
+        return self._finalize(
+            out, ["credit_source_id", "alert_date"], "Alertas", results
+        )
+
+    def _normalize_reconciliations(
+        self, df: pd.DataFrame, results: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if df.empty:
+            logger.warning("No se encontraron datos de transacciones")
+            return df
+
+        out = pd.DataFrame(
+            {
+                "row_no": df.index,
+                "payment_channel": _mapped(
+                    _column(df, "Canal_Pago"), PAYMENT_CHANNEL_MAPPING, "Oficina"
+                ),
+                "payment_reference": _text(_column(df, "Referencia_Pago")),
+                "payment_amount": _integer(_column(df, "Valor_Pagado")),
+                "transaction_date": _date(_column(df, "Fecha_Transaccion")),
+                "observation": _text(_column(df, "Observaciones")),
+            }
+        )
+        return self._finalize(
+            out,
+            ["payment_reference", "payment_amount", "transaction_date"],
+            "Conciliaciones",
+            results,
+        )
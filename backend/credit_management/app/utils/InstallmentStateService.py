@@ -0,0 +1,109 @@
+import datetime
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, exists, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.logger import logger
+from ..models.Credit import Credit
+from ..models.Installment import Installment
+from .CreditBalanceService import CreditBalanceService
+
+INSTALLMENT_PENDING = "Pendiente"
+INSTALLMENT_OVERDUE = "Vencida"
+
+CREDIT_IN_ARREARS = "En Mora"
+CREDIT_CURRENT = "Vigente"
+# Credit states that move to "En Mora" once one of their installments is overdue
+CREDIT_STATES_AT_RISK = ("Vigente", "Pendiente")
+
+
+class InstallmentStateService:
+    """
+    Applies the date-driven state transitions that nothing else performs:
+
+    1. ``Pendiente`` installments whose ``due_date`` has passed become ``Vencida``.
+    2. Open credits with at least one ``Vencida`` installment become ``En Mora``.
+    3. ``En Mora`` credits left without ``Vencida`` installments (every overdue
+       installment was paid) go back to ``Vigente``.
+
+    Each step is a single set-based ``UPDATE`` served by the
+    ``(installment_state, due_date)`` and ``credit_state`` indexes, so the cost
+    does not depend on how many days passed since the previous run.
+    """
+
+    async def apply_overdue_transitions(
+        self, session: AsyncSession, as_of: Optional[datetime.date] = None
+    ) -> Dict[str, Any]:
+        as_of = as_of or datetime.date.today()
+        # A future date would mark installments not yet due as Vencida, which
+        # no later run reverts
+        if as_of > datetime.date.today():
+            raise ValueError(
+                f"La fecha {as_of.isoformat()} es posterior a hoy; no se aplican "
+                "transiciones de mora"
+            )
+        started = time.perf_counter()
+
+        overdue_installment = exists().where(
+            and_(
+                Installment.credit_id == Credit.id,
+                Installment.installment_state == INSTALLMENT_OVERDUE,
+            )
+        )
+
+        try:
+            installments_result = await session.execute(
+                update(Installment)
+                .where(
+                    Installment.installment_state == INSTALLMENT_PENDING,
+                    Installment.due_date < as_of,
+                )
+                .values(installment_state=INSTALLMENT_OVERDUE)
+                .execution_options(synchronize_session=False)
+            )
+
+            arrears_result = await session.execute(
+                update(Credit)
+                .where(
+                    Credit.credit_state.in_(CREDIT_STATES_AT_RISK),
+                    overdue_installment,
+                )
+                .values(credit_state=CREDIT_IN_ARREARS)
+                .execution_options(synchronize_session=False)
+            )
+
+            cured_result = await session.execute(
+                update(Credit)
+                .where(
+                    Credit.credit_state == CREDIT_IN_ARREARS,
+                    ~overdue_installment,
+                )
+                .values(credit_state=CREDIT_CURRENT)
+                .execution_options(synchronize_session=False)
+            )
+
+            # Overdue counts of the credits that have or had overdue installments
+            balances_refreshed = await CreditBalanceService().refresh(
+                session,
+                or_(Credit.overdue_installments > 0, overdue_installment),
+            )
+
+            await session.commit()
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error aplicando transiciones de mora: {str(e)}")
+            raise
+
+        results = {
+            "as_of": as_of.isoformat(),
+            "installments_overdue": installments_result.rowcount,
+            "credits_in_arrears": arrears_result.rowcount,
+            "credits_cured": cured_result.rowcount,
+            "balances_refreshed": balances_refreshed,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        logger.info(f"Transiciones de mora aplicadas: {results}")
+        return results
@@ -0,0 +1,352 @@
+import asyncio
+import datetime
+import json
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, insert, literal_column, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.database import sessionmanager
+from ..config.logger import logger
+from ..models.JobLease import JobLease
+from ..models.JobRun import JobRun
+
+JobFunction = Callable[[AsyncSession], Awaitable[Optional[Dict[str, Any]]]]
+
+# Upper bound for a single sleep, so clock adjustments (NTP, DST) are noticed
+# without waiting for the next scheduled slot
+MAX_SLEEP_SECONDS = 60
+
+
+class CronSchedule:
+    """
+    Standard five-field cron expression: minute hour day-of-month month
+    day-of-week. Supports ``*``, lists, ranges and steps (``*/15``, ``1-5``).
+    Day-of-week uses 0-6 with 0 = Sunday (7 is accepted as Sunday too).
+    """
+
+    # Day-of-week accepts 7 as an alias of Sunday, folded to 0 after parsing
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expresión cron inválida: '{expression}'")
+
+        self.expression = expression
+        (
+            self.minutes,
+            self.hours,
+            self.days,
+            self.months,
+            weekdays,
+        ) = [
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        # Cron semantics: when both day fields are restricted, either matches
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_str, end_str = part.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Valor fuera de rango en campo cron: '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _matches_day(self, day: datetime.date) -> bool:
+        in_days = day.day in self.days
+        # isoweekday: Monday=1 ... Sunday=7 -> cron Sunday=0
+        in_weekdays = day.isoweekday() % 7 in self.weekdays
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """First matching minute strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(
+            minutes=1
+        )
+        # Four years covers every valid combination, including Feb 29
+        limit = candidate + datetime.timedelta(days=4 * 366)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._matches_day(
+                candidate.date()
+            ):
+                candidate = datetime.datetime.combine(
+                    candidate.date() + datetime.timedelta(days=1), datetime.time()
+                )
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + datetime.timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"La expresión cron nunca se cumple: '{self.expression}'")
+
+
+class ScheduledJob:
+    def __init__(
+        self,
+        name: str,
+        schedule: str,
+        function: JobFunction,
+        lease_seconds: int = 900,
+        description: str = "",
+    ):
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.function = function
+        self.lease_seconds = lease_seconds
+        self.description = description
+        self.next_run_at: Optional[datetime.datetime] = None
+
+
+class JobScheduler:
+    """
+    In-process scheduler for periodic maintenance jobs.
+
+    Every replica may run the scheduler; a row per job in ``job_lease`` makes
+    sure each schedule slot is executed by a single replica. The lease is
+    taken with a conditional ``UPDATE`` (expired lease and slot not yet run),
+    so no extra locking service is needed. Every execution is recorded in
+    ``job_run`` with its status, duration and result.
+    """
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._stopping = asyncio.Event()
+
+    def register(
+        self,
+        name: str,
+        schedule: str,
+        function: JobFunction,
+        lease_seconds: int = 900,
+        description: str = "",
+    ) -> ScheduledJob:
+        if name in self.jobs:
+            raise ValueError(f"El trabajo '{name}' ya está registrado")
+        job = ScheduledJob(name, schedule, function, lease_seconds, description)
+        self.jobs[name] = job
+        return job
+
+    def get_job(self, name: str) -> Optional[ScheduledJob]:
+        return self.jobs.get(name)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        now = datetime.datetime.now()
+        return [
+            {
+                "name": job.name,
+                "schedule": job.schedule.expression,
+                "description": job.description,
+                "next_run_at": job.schedule.next_after(now),
+            }
+            for job in self.jobs.values()
+        ]
+
+    def stop(self):
+        self._stopping.set()
+
+    async def run_forever(self):
+        """Main loop of the worker process."""
+        logger.info(
+            f"Scheduler iniciado ({self.owner}) con trabajos: {list(self.jobs)}"
+        )
+        await self._ensure_lease_rows()
+
+        now = datetime.datetime.now()
+        for job in self.jobs.values():
+            job.next_run_at = job.schedule.next_after(now)
+
+        while not self._stopping.is_set():
+            now = datetime.datetime.now()
+            due = [job for job in self.jobs.values() if job.next_run_at <= now]
+
+            for job in due:
+                slot = job.next_run_at
+                job.next_run_at = job.schedule.next_after(now)
+                try:
+                    await self.run_job(job.name, trigger="schedule", slot=slot)
+                except Exception as e:
+                    # Lease/history bookkeeping failed (e.g. database down);
+                    # keep the loop alive for the next slot
+                    logger.error(f"Error programando trabajo '{job.name}': {str(e)}")
+
+            sleep_seconds = MAX_SLEEP_SECONDS
+            if self.jobs:
+                next_wake = min(job.next_run_at for job in self.jobs.values())
+                sleep_seconds = (next_wake - datetime.datetime.now()).total_seconds()
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(),
+                    timeout=max(0.0, min(sleep_seconds, MAX_SLEEP_SECONDS)),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info(f"Scheduler detenido ({self.owner})")
+
+    async def run_job(
+        self,
+        name: str,
+        trigger: str = "manual",
+        slot: Optional[datetime.datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run a job once if this replica obtains its lease.
+
+        Returns the recorded run, or None when another replica already holds
+        the lease or has run this slot.
+        """
+        job = self.jobs[name]
+        slot = slot or datetime.datetime.now()
+
+        async with sessionmanager.session() as session:
+            if not await self._acquire_lease(session, job, slot):
+                logger.info(f"Trabajo '{name}' omitido: lease tomado por otra réplica")
+                return None
+
+            run_id = (
+                await session.execute(
+                    insert(JobRun)
+                    .values(
+                        job_name=name,
+                        trigger=trigger,
+                        status="running",
+                        owner=self.owner,
+                    )
+                    .returning(JobRun.id)
+                )
+            ).scalar_one()
+            await session.commit()
+
+        started = time.perf_counter()
+        status, result, error = "succeeded", None, None
+        try:
+            async with sessionmanager.session() as session:
+                result = await job.function(session)
+        except Exception as e:
+            status, error = "failed", str(e)[:2000]
+            logger.error(f"Error ejecutando trabajo '{name}': {error}")
+        duration_ms = int((time.perf_counter() - started) * 1000)
+
+        async with sessionmanager.session() as session:
+            await session.execute(
+                update(JobRun)
+                .where(JobRun.id == run_id)
+                .values(
+                    status=status,
+                    finished_at=func.getdate(),
+                    duration_ms=duration_ms,
+                    result=json.dumps(result, default=str) if result else None,
+                    error=error,
+                )
+            )
+            await self._release_lease(session, job)
+            await session.commit()
+
+        logger.info(f"Trabajo '{name}' {status} en {duration_ms} ms")
+        return {
+            "id": run_id,
+            "job_name": name,
+            "trigger": trigger,
+            "status": status,
+            "duration_ms": duration_ms,
+            "result": result,
+            "error": error,
+        }
+
+    async def get_history(
+        self, session: AsyncSession, job_name: Optional[str] = None, limit: int = 50
+    ) -> List[JobRun]:
+        query = select(JobRun).order_by(JobRun.started_at.desc(), JobRun.id.desc())
+        if job_name:
+            query = query.where(JobRun.job_name == job_name)
+        result = await session.execute(query.limit(limit))
+        return result.scalars().all()
+
+    async def _ensure_lease_rows(self):
+        async with sessionmanager.session() as session:
+            existing = set(
+                (await session.execute(select(JobLease.job_name))).scalars().all()
+            )
+            for name in self.jobs:
+                if name in existing:
+                    continue
+                try:
+                    await session.execute(insert(JobLease).values(job_name=name))
+                    await session.commit()
+                except IntegrityError:
+                    # Another replica created it first
+                    await session.rollback()
+
+    async def _acquire_lease(
+        self, session: AsyncSession, job: ScheduledJob, slot: datetime.datetime
+    ) -> bool:
+        lease_until = func.dateadd(
+            literal_column("second"), job.lease_seconds, func.getdate()
+        )
+        values = {"owner": self.owner, "lease_until": lease_until, "last_slot": slot}
+
+        result = await session.execute(
+            update(JobLease)
+            .where(
+                JobLease.job_name == job.name,
+                JobLease.lease_until < func.getdate(),
+                or_(JobLease.last_slot.is_(None), JobLease.last_slot < slot),
+            )
+            .values(**values)
+        )
+        if result.rowcount == 1:
+            await session.commit()
+            return True
+
+        # First run of a job registered after the worker started elsewhere
+        exists = await session.execute(
+            select(JobLease.job_name).where(JobLease.job_name == job.name)
+        )
+        if exists.scalar_one_or_none() is not None:
+            await session.rollback()
+            return False
+
+        try:
+            await session.execute(insert(JobLease).values(job_name=job.name, **values))
+            await session.commit()
+            return True
+        except IntegrityError:
+            await session.rollback()
+            return False
+
+    async def _release_lease(self, session: AsyncSession, job: ScheduledJob):
+        await session.execute(
+            update(JobLease)
+            .where(and_(JobLease.job_name == job.name, JobLease.owner == self.owner))
+            .values(lease_until=func.getdate())
+        )
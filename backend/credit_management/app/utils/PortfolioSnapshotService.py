@@ -0,0 +1,107 @@
+import datetime
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Date, case, exists, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.logger import logger
+from ..models.Credit import Credit
+from ..models.Installment import Installment
+from ..models.PortfolioSnapshot import PortfolioSnapshot
+
+INSTALLMENT_PAID = "Pagada"
+
+# Credits that left the portfolio are not snapshotted; their absence from a
+# later snapshot is what the roll-rate engine counts as an exit
+CLOSED_CREDIT_STATES = ("Cancelado", "Pagado")
+
+# Delinquency buckets stored in portfolio_snapshot.bucket: label and last day
+# past due of the oldest unpaid installment (None: open)
+SNAPSHOT_BUCKETS = (
+    ("Al día", 0),
+    ("1-30 días", 30),
+    ("31-60 días", 60),
+    ("61-90 días", 90),
+    ("Más de 90 días", None),
+)
+
+
+class PortfolioSnapshotService:
+    """
+    Writes the daily portfolio snapshot: one ``portfolio_snapshot`` row per
+    open credit with its delinquency bucket and pending balance.
+
+    Installment and credit states are overwritten in place, so the snapshots
+    are the only record of how credits move between buckets over time (see
+    the roll-rate KPI). The whole day is written by a single
+    ``INSERT ... SELECT`` computed in SQL, consistent as of one point in
+    time, and a day that already has a snapshot is never written again.
+    """
+
+    async def take_snapshot(
+        self, session: AsyncSession, as_of: Optional[datetime.date] = None
+    ) -> Dict[str, Any]:
+        as_of = as_of or datetime.date.today()
+        started = time.perf_counter()
+
+        oldest_overdue = (
+            select(
+                Installment.credit_id,
+                func.min(Installment.due_date).label("oldest_due_date"),
+            )
+            .where(
+                Installment.installment_state != INSTALLMENT_PAID,
+                Installment.due_date < as_of,
+            )
+            .group_by(Installment.credit_id)
+            .subquery()
+        )
+        # Oldest due date against fixed bounds: no day difference per row
+        bucket = case(
+            (oldest_overdue.c.oldest_due_date.is_(None), 0),
+            *(
+                (
+                    oldest_overdue.c.oldest_due_date
+                    >= as_of - datetime.timedelta(days=days),
+                    position,
+                )
+                for position, (_, days) in enumerate(SNAPSHOT_BUCKETS)
+                if days
+            ),
+            else_=len(SNAPSHOT_BUCKETS) - 1,
+        )
+        already_taken = exists().where(PortfolioSnapshot.snapshot_date == as_of)
+
+        rows = (
+            select(
+                literal(as_of, Date),
+                Credit.id,
+                bucket,
+                Credit.total_pending,
+            )
+            .outerjoin(oldest_overdue, oldest_overdue.c.credit_id == Credit.id)
+            .where(Credit.credit_state.not_in(CLOSED_CREDIT_STATES), ~already_taken)
+        )
+        statement = insert(PortfolioSnapshot).from_select(
+            ["snapshot_date", "credit_id", "bucket", "balance"], rows
+        )
+
+        try:
+            result = await session.execute(statement)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error guardando la instantánea de cartera: {str(e)}")
+            raise
+
+        results = {
+            "as_of": as_of.isoformat(),
+            "credits": result.rowcount,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if not result.rowcount:
+            logger.info(f"Instantánea de cartera ya existente o vacía: {results}")
+        else:
+            logger.info(f"Instantánea de cartera guardada: {results}")
+        return results
@@ -0,0 +1,45 @@
+from .AlertGenerationService import AlertGenerationService
+from .CreditBalanceService import CreditBalanceService
+from .InstallmentStateService import InstallmentStateService
+from .JobSchedulerService import JobScheduler
+from .PaymentAllocationService import PaymentAllocationService
+from .PortfolioSnapshotService import PortfolioSnapshotService
+
+# Shared registry: the worker process runs it on schedule and the admin
+# routes use it for listing and manual triggering.
+scheduler = JobScheduler()
+
+scheduler.register(
+    "overdue_transitions",
+    "5 0 * * *",
+    InstallmentStateService().apply_overdue_transitions,
+    description="Cuotas Pendiente vencidas a Vencida y créditos a En Mora",
+)
+
+scheduler.register(
+    "alert_generation",
+    "30 0 * * *",
+    AlertGenerationService().generate_alerts,
+    description="Alertas automáticas de riesgo sobre toda la cartera",
+)
+
+scheduler.register(
+    "portfolio_snapshot",
+    "45 0 * * *",
+    PortfolioSnapshotService().take_snapshot,
+    description="Instantánea diaria del tramo de mora y saldo de cada crédito",
+)
+
+scheduler.register(
+    "payment_allocation",
+    "*/15 * * * *",
+    PaymentAllocationService().allocate_pending,
+    description="Aplicación de conciliaciones pendientes a las cuotas",
+)
+
+scheduler.register(
+    "credit_balance_verification",
+    "0 3 * * *",
+    CreditBalanceService().verify_balances,
+    description="Detección y corrección de saldos de créditos desactualizados",
+)
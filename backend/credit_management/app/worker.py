@@ -0,0 +1,33 @@
+"""
+Scheduler worker for periodic maintenance jobs.
+
+Run it next to the API process (one or more replicas):
+    python -m app.worker
+"""
+
+import asyncio
+import signal
+
+from .config.database import sessionmanager
+from .config.logger import logger
+from .utils.ScheduledJobs import scheduler
+
+
+async def run_worker():
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, scheduler.stop)
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers
+            pass
+
+    try:
+        await scheduler.run_forever()
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    logger.info("Iniciando worker de trabajos programados")
+    asyncio.run(run_worker())
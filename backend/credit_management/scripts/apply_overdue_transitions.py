@@ -0,0 +1,42 @@
+"""
+Script to apply the daily overdue state transitions
+Schedule it once a day, right after midnight:
+    python scripts/apply_overdue_transitions.py [YYYY-MM-DD]
+1. Pendiente installments past their due date become Vencida
+2. Credits with overdue installments become En Mora
+3. En Mora credits without overdue installments go back to Vigente
+The date defaults to today and cannot be later than today.
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+
+# Add the parent directory to sys.path to import the app
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from credit_management.app.config.database import sessionmanager
+from credit_management.app.utils.InstallmentStateService import InstallmentStateService
+
+
+async def apply_overdue_transitions(as_of: datetime.date = None):
+    """Run the overdue transitions once and print the affected row counts"""
+    async with sessionmanager.session() as session:
+        results = await InstallmentStateService().apply_overdue_transitions(
+            session, as_of
+        )
+
+    print("✅ Overdue transitions applied")
+    for key, value in results.items():
+        print(f"   {key}: {value}")
+
+    await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    as_of = datetime.date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    if as_of is not None and as_of > datetime.date.today():
+        sys.exit("❌ The date cannot be later than today")
+    asyncio.run(apply_overdue_transitions(as_of))
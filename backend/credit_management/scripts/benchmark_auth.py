@@ -0,0 +1,73 @@
+"""
+Benchmark of the authentication cost per request.
+
+Measures ``get_current_user`` with the verified-token cache disabled (every
+request verifies the signature, as before the cache) and enabled (the same
+token repeated, as a dashboard does), for HS256 and RS256.
+
+Usage:
+    python scripts/benchmark_auth.py [requests]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import rsa
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+# Add the parent directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from credit_management.app.auth import dependencies
+from credit_management.app.auth.tokens import KeySet, TokenCache, TokenVerifier
+
+
+def build_cases():
+    claims = {"sub": "1", "exp": int(time.time()) + 3600}
+
+    secret = "benchmark-secret"
+    public_key, private_key = rsa.newkeys(2048)
+
+    return [
+        ("HS256", secret, jwt.encode(claims, secret, algorithm="HS256")),
+        (
+            "RS256",
+            public_key.save_pkcs1().decode(),
+            jwt.encode(claims, private_key.save_pkcs1().decode(), algorithm="RS256"),
+        ),
+    ]
+
+
+async def run(requests: int, token: str) -> float:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await dependencies.get_current_user(credentials)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def benchmark(requests: int):
+    print(f"Peticiones por caso: {requests}")
+    for algorithm, key, token in build_cases():
+        results = {}
+        for label, cache_size in (("sin caché", 0), ("con caché", 1024)):
+            dependencies.token_verifier = TokenVerifier(
+                algorithm, KeySet(algorithm, key=key), TokenCache(cache_size, 300)
+            )
+            # Fewer rounds for uncached RSA, which is orders of magnitude slower
+            rounds = requests if cache_size or algorithm == "HS256" else requests // 20
+            await run(10, token)
+            results[label] = await run(max(rounds, 1), token)
+            print(f"{algorithm} {label}: {results[label]:10.2f} µs/petición")
+        print(
+            f"{algorithm} ahorro:    {results['sin caché'] - results['con caché']:10.2f} "
+            f"µs/petición (x{results['sin caché'] / results['con caché']:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
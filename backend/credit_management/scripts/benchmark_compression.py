@@ -0,0 +1,94 @@
+"""
+Benchmark of response compression: bytes on the wire and CPU cost.
+
+For the largest JSON payloads (see benchmark_serialization.py) and every
+encoding available in this environment, reports the compressed size, the
+compression time at the per-request and precompressed levels, the cost of
+streaming the same body in 16 KB flushed chunks, and the estimated transfer
+time on a slow rural link.
+
+Usage:
+    python scripts/benchmark_compression.py [rounds]
+"""
+
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from benchmark_serialization import client_complete, dashboard, installments_by_month
+from credit_management.app.utils.Compression import (
+    ENCODINGS,
+    LEVELS,
+    PRECOMPRESSED_LEVELS,
+    compress,
+)
+from credit_management.app.utils.FastJSONResponse import dumps
+
+STREAM_CHUNK_SIZE = 16 * 1024
+RURAL_LINK_BITS_PER_SECOND = 1_000_000
+
+
+def timed(rounds: int, function, *args):
+    result = function(*args)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        function(*args)
+    return result, (time.perf_counter() - started) / rounds * 1000
+
+
+def stream(body: bytes, encoding: str) -> bytes:
+    compressor = ENCODINGS[encoding][1](LEVELS[encoding])
+    chunks = [
+        compressor.compress(body[start : start + STREAM_CHUNK_SIZE])
+        for start in range(0, len(body), STREAM_CHUNK_SIZE)
+    ]
+    chunks.append(compressor.finish())
+    return b"".join(chunks)
+
+
+def transfer_ms(size: int) -> float:
+    return size * 8 / RURAL_LINK_BITS_PER_SECOND * 1000
+
+
+def benchmark(rounds: int):
+    payloads = [
+        ("ClientCompleteResponse", dumps(client_complete())),
+        ("DashboardData", dumps(dashboard())),
+        ("KPI installments/by-month", dumps(installments_by_month())),
+    ]
+
+    print(f"Codificaciones disponibles: {', '.join(ENCODINGS)}  (rondas: {rounds})")
+    for name, body in payloads:
+        print(
+            f"\n{name}: {len(body) / 1024:.0f} KB sin comprimir, "
+            f"{transfer_ms(len(body)):.0f} ms a 1 Mbit/s"
+        )
+        for encoding in ENCODINGS:
+            compressed, request_ms = timed(rounds, compress, body, encoding)
+            precompressed, precompressed_ms = timed(
+                1, compress, body, encoding, PRECOMPRESSED_LEVELS[encoding]
+            )
+            streamed, stream_ms = timed(rounds, stream, body, encoding)
+            print(
+                f"  {encoding:5} nivel {LEVELS[encoding]:>2}: "
+                f"{len(compressed) / 1024:7.1f} KB (x{len(body) / len(compressed):4.1f}) "
+                f"{request_ms:7.2f} ms CPU, {transfer_ms(len(compressed)):6.0f} ms red"
+            )
+            print(
+                f"  {encoding:5} nivel {PRECOMPRESSED_LEVELS[encoding]:>2}: "
+                f"{len(precompressed) / 1024:7.1f} KB "
+                f"(x{len(body) / len(precompressed):4.1f}) "
+                f"{precompressed_ms:7.2f} ms CPU una sola vez (precomprimido)"
+            )
+            print(
+                f"  {encoding:5} stream  : {len(streamed) / 1024:7.1f} KB "
+                f"(x{len(body) / len(streamed):4.1f}) {stream_ms:7.2f} ms CPU"
+            )
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,91 @@
+"""
+Benchmark of the per-request overhead added by MetricsMiddleware.
+
+Runs a minimal ASGI application with and without the middleware and reports
+the difference per request. Exits with an error when the overhead exceeds
+the budget, so it can be used as a check before deploying.
+
+Usage:
+    python scripts/benchmark_metrics.py [requests]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from credit_management.app.utils.Metrics import MetricsMiddleware, registry
+
+OVERHEAD_BUDGET_US = 50.0
+ROUNDS = 5
+
+
+class _Route:
+    path = "/api/credit_management/v1/get_credit_by_id/{credit_id}"
+
+
+async def endpoint(scope, receive, send):
+    # What the router does for a matched request
+    scope["route"] = _Route
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b'{"id": 1}'})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/"}
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+async def benchmark(requests: int):
+    instrumented = MetricsMiddleware(endpoint)
+
+    # Warm up the label cache and the interpreter
+    await run(endpoint, 1000)
+    await run(instrumented, 1000)
+
+    # Best of several rounds to reduce scheduler noise
+    baseline = min([await run(endpoint, requests) for _ in range(ROUNDS)])
+    measured = min([await run(instrumented, requests) for _ in range(ROUNDS)])
+
+    overhead_us = (measured - baseline) / requests * 1_000_000
+    print(f"Peticiones por ronda:  {requests}")
+    print(f"Sin middleware:        {baseline / requests * 1_000_000:.2f} µs/petición")
+    print(f"Con middleware:        {measured / requests * 1_000_000:.2f} µs/petición")
+    print(f"Sobrecosto:            {overhead_us:.2f} µs/petición")
+
+    started = time.perf_counter()
+    exposition = registry.render()
+    print(
+        f"Render de /metrics:    {(time.perf_counter() - started) * 1000:.2f} ms "
+        f"({len(exposition)} bytes)"
+    )
+
+    if overhead_us > OVERHEAD_BUDGET_US:
+        print(f"❌ Sobrecosto por encima de {OVERHEAD_BUDGET_US} µs")
+        sys.exit(1)
+    print(f"✅ Sobrecosto dentro del presupuesto de {OVERHEAD_BUDGET_US} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,255 @@
+"""
+Benchmark of response serialization for the largest payloads.
+
+Compares FastAPI's default path (validation against ``response_model``,
+conversion to plain Python and ``json.dumps``) with ``FastJSONResponse`` for:
+
+- ``ClientCompleteResponse`` of a client with many credits and installments
+- ``DashboardData`` with large pages of recent items
+- the ``/installments/by-month`` KPI dict (no response model)
+
+Both paths must produce the same JSON; the script fails otherwise.
+
+Usage:
+    python scripts/benchmark_serialization.py [rounds]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+# Add the parent directory to sys.path to import the application
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, "../..")))
+
+from credit_management.app.schemas.Client import ClientCompleteResponse
+from credit_management.app.schemas.Dashboard import DashboardData
+from credit_management.app.utils.FastJSONResponse import FastJSONResponse
+
+CREDITS_PER_CLIENT = 20
+INSTALLMENTS_PER_CREDIT = 36
+MANAGEMENTS_PER_INSTALLMENT = 2
+DASHBOARD_PAGE_SIZE = 500
+KPI_INSTALLMENTS = 20_000
+
+NOW = datetime(2025, 1, 1, 8, 30)
+TODAY = date(2025, 1, 1)
+MONTHS = [
+    "enero",
+    "febrero",
+    "marzo",
+    "abril",
+    "mayo",
+    "junio",
+    "julio",
+    "agosto",
+    "septiembre",
+    "octubre",
+    "noviembre",
+    "diciembre",
+]
+
+
+def _timestamps():
+    return {"created_at": NOW, "updated_at": NOW}
+
+
+def _installment(installment_id: int, credit_id: int, number: int):
+    return {
+        "id": installment_id,
+        "credit_id": credit_id,
+        "installment_state": "Pagada" if number % 3 else "Pendiente",
+        "installments_number": number,
+        "installments_value": Decimal("125000.50"),
+        "due_date": TODAY + timedelta(days=30 * number),
+        "payment_date": TODAY + timedelta(days=30 * number) if number % 3 else None,
+        **_timestamps(),
+    }
+
+
+def _management(management_id: int, installment_id: int):
+    return {
+        "id": management_id,
+        "installment_id": installment_id,
+        "manager_id": 7,
+        "manager_name": "Gestor de zona rural",
+        "contact_method": "Llamada",
+        "contact_result": "Promesa de pago",
+        "management_date": TODAY,
+        "observation": "Cliente indica que pagará el viernes",
+        "payment_promise_date": TODAY + timedelta(days=5),
+        **_timestamps(),
+    }
+
+
+def client_complete() -> ClientCompleteResponse:
+    credits = []
+    for c in range(CREDITS_PER_CLIENT):
+        installments = []
+        for n in range(1, INSTALLMENTS_PER_CREDIT + 1):
+            installment = _installment(c * 100 + n, c, n)
+            installment["portfolio"] = [
+                _management(c * 1000 + n * 10 + m, c * 100 + n)
+                for m in range(MANAGEMENTS_PER_INSTALLMENT)
+            ]
+            installments.append(installment)
+        credits.append(
+            {
+                "id": c,
+                "client_id": 1,
+                "disbursement_amount": 4_500_000,
+                "payment_reference": f"REF-{c:06d}",
+                "interest_rate": 0.021,
+                "total_quotas": INSTALLMENTS_PER_CREDIT,
+                "disbursement_date": TODAY,
+                "credit_state": "Activo",
+                "installments": installments,
+                **_timestamps(),
+            }
+        )
+    return ClientCompleteResponse.model_validate(
+        {
+            "id": 1,
+            "name": "María Fernanda Gómez",
+            "document": "1012345678",
+            "email": "maria@example.com",
+            "phone": "3001234567",
+            "address": "Vereda El Salitre",
+            "zone": "Rural",
+            "status": "Activo",
+            "credits": credits,
+            "total_credits": len(credits),
+            **_timestamps(),
+        }
+    )
+
+
+def dashboard() -> DashboardData:
+    size = DASHBOARD_PAGE_SIZE
+    return DashboardData.model_validate(
+        {
+            "stats": {
+                "total_clients": 12000,
+                "total_credits": 30000,
+                "total_alerts": 4000,
+                "total_installments": 900000,
+                "total_portfolio_managements": 250000,
+                "total_reconciliations": 600000,
+                "total_managers": 40,
+            },
+            "recent_alerts": [
+                {
+                    "id": i,
+                    "credit_id": i + 1,
+                    "client_id": i + 1,
+                    "alert_type": "Mora",
+                    "manually_generated": False,
+                    "alert_date": TODAY,
+                    **_timestamps(),
+                }
+                for i in range(size)
+            ],
+            "recent_installments": [
+                _installment(i, i + 1, 1 + i % 36) for i in range(size)
+            ],
+            "recent_portfolio_managements": [
+                _management(i, i + 1) for i in range(size)
+            ],
+            "recent_reconciliations": [
+                {
+                    "id": i,
+                    "transaction_date": TODAY,
+                    "payment_reference": f"REF-{i:06d}",
+                    "payment_amount": 125000,
+                    "payment_channel": "PSE",
+                    "observation": None,
+                    **_timestamps(),
+                }
+                for i in range(size)
+            ],
+        }
+    )
+
+
+def installments_by_month() -> dict:
+    installments = {month: [] for month in MONTHS}
+    for i in range(KPI_INSTALLMENTS):
+        installments[MONTHS[i % 12]].append(
+            {
+                "id": i,
+                "credit_id": i // 36,
+                "installments_number": 1 + i % 36,
+                "due_date": "2025-03-15",
+                "installments_value": 125000.5,
+                "installment_state": "Vencida",
+                "payment_date": None,
+            }
+        )
+    series = [float(i * 1000) for i in range(12)]
+    return {
+        "installments": installments,
+        "datos": [{"mes": month, "porcentaje": "12.5"} for month in MONTHS],
+        "DeudaPorMes": series,
+        "MontoPorMes": series,
+        "BalancePorMes": series,
+    }
+
+
+async def default_path(field, content) -> bytes:
+    # What FastAPI does with the value returned by the endpoint
+    serialized = await serialize_response(
+        field=field, response_content=content, is_coroutine=True
+    )
+    return JSONResponse(serialized).body
+
+
+async def fast_path(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+async def measure(rounds: int, path, *args) -> float:
+    await path(*args)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await path(*args)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+async def benchmark(rounds: int):
+    cases = [
+        ("ClientCompleteResponse", ClientCompleteResponse, client_complete()),
+        ("DashboardData", DashboardData, dashboard()),
+        ("KPI installments/by-month", None, installments_by_month()),
+    ]
+
+    print(f"Rondas por caso: {rounds}")
+    for name, model, content in cases:
+        field = None
+        if model is not None:
+            route = APIRoute("/", lambda: None, response_model=model)
+            field = route.secure_cloned_response_field or route.response_field
+
+        default_body = await default_path(field, content)
+        fast_body = await fast_path(content)
+        if json.loads(default_body) != json.loads(fast_body):
+            print(f"❌ {name}: el JSON generado difiere")
+            sys.exit(1)
+
+        default_ms = await measure(rounds, default_path, field, content)
+        fast_ms = await measure(rounds, fast_path, content)
+        print(
+            f"{name:27} {len(fast_body) / 1024:8.0f} KB  "
+            f"FastAPI {default_ms:8.2f} ms  "
+            f"FastJSONResponse {fast_ms:7.2f} ms  (x{default_ms / fast_ms:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
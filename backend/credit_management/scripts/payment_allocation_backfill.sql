@@ -0,0 +1,121 @@
+-- Registro en payment_allocation de las conciliaciones cargadas antes del libro
+-- Ejecutar una vez en Azure Data Studio o SQL Server Management Studio, con
+-- PAYMENT_ALLOCATION_ENABLED=false, y solo después activar la aplicación de
+-- pagos (carga de conciliaciones y trabajo payment_allocation)
+-- Esas conciliaciones ya se reflejan en el estado de las cuotas (importadas como
+-- Pagada) y de los créditos; sin filas en el libro el motor las tomaría como
+-- pagos nuevos y las aplicaría a las cuotas Pendiente. El script las registra
+-- como aplicadas sin cambiar el estado de cuotas ni créditos:
+-- - cada conciliación cubre, en orden de fecha, las cuotas Pagada de su crédito
+--   por vencimiento, con el mismo reparto por intervalos que el motor
+-- - lo que excede el valor de las cuotas pagadas queda como saldo a favor
+--   (installment_id NULL)
+-- Solo toma conciliaciones sin filas en el libro: volver a ejecutarlo no
+-- duplica nada
+
+-- 1. Libro de las conciliaciones previas
+BEGIN TRANSACTION;
+
+EXEC sp_getapplock
+    @Resource = 'payment_allocation',
+    @LockMode = 'Exclusive',
+    @LockOwner = 'Transaction',
+    @LockTimeout = 60000;
+
+WITH payments AS (
+    SELECT
+        r.id AS reconciliation_id,
+        ck.credit_id,
+        r.payment_amount,
+        SUM(CAST(r.payment_amount AS BIGINT)) OVER (
+            PARTITION BY ck.credit_id
+            ORDER BY r.transaction_date, r.id
+            ROWS UNBOUNDED PRECEDING
+        ) AS pay_end
+    FROM reconciliation r
+    JOIN (
+        SELECT payment_reference, MIN(id) AS credit_id
+        FROM credit
+        GROUP BY payment_reference
+    ) ck ON ck.payment_reference = r.payment_reference
+    WHERE r.payment_amount > 0
+      AND NOT EXISTS (
+          SELECT 1 FROM payment_allocation pa WHERE pa.reconciliation_id = r.id
+      )
+),
+paid_installments AS (
+    SELECT
+        i.id AS installment_id,
+        i.credit_id,
+        CAST(i.installments_value AS BIGINT) - ISNULL(a.applied, 0) AS remaining,
+        i.due_date,
+        i.installments_number
+    FROM installment i
+    LEFT JOIN (
+        SELECT installment_id, SUM(CAST(amount AS BIGINT)) AS applied
+        FROM payment_allocation
+        WHERE installment_id IS NOT NULL
+        GROUP BY installment_id
+    ) a ON a.installment_id = i.id
+    WHERE i.installment_state = 'Pagada'
+      AND i.credit_id IN (SELECT credit_id FROM payments)
+),
+installments AS (
+    SELECT
+        p.*,
+        SUM(p.remaining) OVER (
+            PARTITION BY p.credit_id
+            ORDER BY p.due_date, p.installments_number, p.installment_id
+            ROWS UNBOUNDED PRECEDING
+        ) AS inst_end
+    FROM paid_installments p
+    WHERE p.remaining > 0
+),
+paid_totals AS (
+    SELECT credit_id, SUM(remaining) AS total_paid
+    FROM installments
+    GROUP BY credit_id
+)
+INSERT INTO payment_allocation (reconciliation_id, credit_id, installment_id, amount)
+SELECT
+    p.reconciliation_id,
+    p.credit_id,
+    i.installment_id,
+    (CASE WHEN p.pay_end < i.inst_end THEN p.pay_end ELSE i.inst_end END)
+    - (CASE WHEN p.pay_end - p.payment_amount > i.inst_end - i.remaining
+            THEN p.pay_end - p.payment_amount
+            ELSE i.inst_end - i.remaining END)
+FROM payments p
+JOIN installments i
+    ON i.credit_id = p.credit_id
+    AND i.inst_end - i.remaining < p.pay_end
+    AND p.pay_end - p.payment_amount < i.inst_end
+UNION ALL
+SELECT
+    p.reconciliation_id,
+    p.credit_id,
+    NULL,
+    p.pay_end
+    - (CASE WHEN p.pay_end - p.payment_amount > ISNULL(t.total_paid, 0)
+            THEN p.pay_end - p.payment_amount
+            ELSE ISNULL(t.total_paid, 0) END)
+FROM payments p
+LEFT JOIN paid_totals t ON t.credit_id = p.credit_id
+WHERE p.pay_end > ISNULL(t.total_paid, 0);
+
+COMMIT TRANSACTION;
+GO
+
+-- 2. Comprobación: debe devolver 0 (conciliaciones con crédito sin registrar)
+SELECT COUNT(*) AS pending_reconciliations
+FROM reconciliation r
+WHERE r.payment_amount > 0
+  AND r.payment_reference IN (SELECT payment_reference FROM credit)
+  AND NOT EXISTS (
+      SELECT 1 FROM payment_allocation pa WHERE pa.reconciliation_id = r.id
+  );
+GO
+
+-- 3. Saldos: ejecutar el trabajo credit_balance_verification
+-- (POST /admin/jobs/credit_balance_verification/run) o el paso 2 de
+-- credit_balances.sql, y luego definir PAYMENT_ALLOCATION_ENABLED=true
@@ -0,0 +1,51 @@
+-- Tabla portfolio_snapshot particionada por mes
+-- Ejecutar en Azure Data Studio o SQL Server Management Studio antes de
+-- activar el trabajo portfolio_snapshot (create-tables crea la tabla sin
+-- particionar, suficiente en desarrollo)
+-- Cada partición es un mes de instantáneas: las consultas de tasas de rodamiento
+-- leen solo las de sus dos fechas y los meses antiguos se archivan o
+-- eliminan con SWITCH o TRUNCATE ... WITH (PARTITIONS (...)), sin DELETE
+
+-- 1. Función y esquema de partición (un límite por mes, RANGE RIGHT)
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = 'pf_portfolio_snapshot_month')
+    CREATE PARTITION FUNCTION pf_portfolio_snapshot_month (DATE)
+    AS RANGE RIGHT FOR VALUES ();
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_portfolio_snapshot_month')
+    CREATE PARTITION SCHEME ps_portfolio_snapshot_month
+    AS PARTITION pf_portfolio_snapshot_month ALL TO ([PRIMARY]);
+GO
+
+-- 2. Límites mensuales hasta 24 meses adelante; volver a ejecutar este paso
+-- al menos una vez al año
+DECLARE @month DATE = DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1);
+DECLARE @last DATE = DATEADD(MONTH, 24, @month);
+WHILE @month <= @last
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM sys.partition_range_values v
+        JOIN sys.partition_functions f ON f.function_id = v.function_id
+        WHERE f.name = 'pf_portfolio_snapshot_month' AND CAST(v.value AS DATE) = @month
+    )
+    BEGIN
+        ALTER PARTITION SCHEME ps_portfolio_snapshot_month NEXT USED [PRIMARY];
+        ALTER PARTITION FUNCTION pf_portfolio_snapshot_month () SPLIT RANGE (@month);
+    END
+    SET @month = DATEADD(MONTH, 1, @month);
+END
+GO
+
+-- 3. Tabla: solo inserciones, clave agrupada por fecha y crédito, páginas
+-- comprimidas
+IF OBJECT_ID('portfolio_snapshot', 'U') IS NULL
+    CREATE TABLE portfolio_snapshot (
+        snapshot_date DATE NOT NULL,
+        credit_id INT NOT NULL,
+        bucket SMALLINT NOT NULL,
+        balance INT NOT NULL,
+        CONSTRAINT pk_portfolio_snapshot PRIMARY KEY CLUSTERED (snapshot_date, credit_id)
+            WITH (DATA_COMPRESSION = PAGE)
+    ) ON ps_portfolio_snapshot_month (snapshot_date);
+GO
@@ -21,8 +21,12 @@ from credit_management.app.models import (
     Client,
     Credit,
     Installment,
+    JobLease,
+    JobRun,
     Manager,
+    PaymentAllocation,
     Portfolio,
+    PortfolioSnapshot,
     Reconciliation,
 )
 from credit_management.app.models.base import Base
@@ -87,6 +91,10 @@ def recreate_database():
                 "portfolio",
                 "alert",
                 "reconciliation",
+                "payment_allocation",
+                "job_lease",
+                "job_run",
+                "portfolio_snapshot",
             ]
 
             created_tables = []
@@ -24,6 +24,12 @@ class DatabaseSessionManager:
         self._engine = None
         self._sessionmaker = None
 
+    def pools(self) -> dict[str, Any]:
+        """Connection pools by engine name, for monitoring."""
+        if self._engine is None:
+            return {}
+        return {"primary": self._engine.pool}
+
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
         if self._engine is None:
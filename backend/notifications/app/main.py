@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes import router
+from .config.database import sessionmanager
 from .config.settings import settings
+from .utils.Metrics import MetricsMiddleware, metrics_endpoint, register_pool_metrics
 
 
 def create_app() -> FastAPI:
@@ -15,6 +17,9 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(MetricsMiddleware)
+    application.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    register_pool_metrics(sessionmanager.pools)
 
     # Include the main router
     application.include_router(
@@ -1,12 +1,13 @@
-from app.config.settings import settings
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError
+
+from .tokens import token_verifier
 
 security_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security_scheme),
 ):
     if credentials is None:
@@ -16,9 +17,9 @@ def get_current_user(
 
     token = credentials.credentials
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        # Cached claims for tokens already verified; async so the check does
+        # not hop to the threadpool
+        payload = await token_verifier.verify(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
@@ -136,6 +136,8 @@ class ClientController(BaseController):
     ) -> list[CreditCalculatedInstallmentResponse]:
         """
         Get detailed credit information for a specific client.
+
+        Balances are read from the columns maintained on each credit.
         """
         query = (
             select(Credit)
@@ -179,22 +181,4 @@ class ClientController(BaseController):
             credit_response.installments = installments_data
             credits_data.append(credit_response)
 
-        for credit in credits:
-            query_reconciliations = select(Reconciliation).where(
-                Reconciliation.payment_reference == credit.payment_reference
-            )
-            result_reconciliations = await session.execute(query_reconciliations)
-
-            sum_payments = sum(
-                rec.payment_amount for rec in result_reconciliations.scalars().all()
-            )
-
-            for credit_data in credits_data:
-                if credit_data.id == credit.id:
-                    credit_data.total_paid = sum_payments
-                    credit_data.total_pending = int(
-                        credit_data.disbursement_amount - sum_payments
-                    )
-                    break
-
         return credits_data
@@ -1,18 +1,21 @@
 import datetime
+import time
 
 import httpx
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..controllers.client import ClientController
 from ..models.Credit import Credit
 from ..models.Installment import Installment
+from ..models.PaymentAllocation import PaymentAllocation
 from ..models.Reconciliation import Reconciliation
 from ..schemas.Payment import (
     PaymentInitializationRequest,
     PaymentInitializationResponse,
 )
+from ..utils.Metrics import PAYMENT_GATEWAY_SECONDS
 
 
 class PaymentController:
@@ -86,9 +89,19 @@ class PaymentController:
         # Send request to payment gateway
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.PAYMENT_GATEWAY_URL, json=payment_data
-                )
+                gateway_started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        self.PAYMENT_GATEWAY_URL, json=payment_data
+                    )
+                except httpx.RequestError:
+                    PAYMENT_GATEWAY_SECONDS.labels("initialize", "error").observe(
+                        time.perf_counter() - gateway_started
+                    )
+                    raise
+                PAYMENT_GATEWAY_SECONDS.labels(
+                    "initialize", str(response.status_code)
+                ).observe(time.perf_counter() - gateway_started)
 
                 if response.status_code != 200:
                     error_detail = (
@@ -215,14 +228,32 @@ class PaymentController:
             today = datetime.date.today()
             total_amount_paid = 0
 
+            # Amounts already applied to these installments by partial payments
+            applied_result = await session.execute(
+                select(
+                    PaymentAllocation.installment_id, func.sum(PaymentAllocation.amount)
+                )
+                .where(
+                    PaymentAllocation.installment_id.in_(
+                        [installment.id for installment in pending_installments]
+                    )
+                )
+                .group_by(PaymentAllocation.installment_id)
+            )
+            applied = dict(applied_result.all())
+
             # Update each pending installment
             for installment in pending_installments:
                 # Update installment status
                 installment.installment_state = "Pagada"
                 installment.payment_date = today
 
-                # Calculate amount
-                amount = int(installment.installments_value)
+                # Calculate the amount still owed on the installment
+                amount = int(installment.installments_value) - int(
+                    applied.get(installment.id, 0)
+                )
+                if amount <= 0:
+                    continue
                 total_amount_paid += amount
 
                 # Create reconciliation record directly
@@ -234,6 +265,17 @@ class PaymentController:
                     observation=f"Auto payment - Installment {installment.installments_number} marked as paid via payment gateway",
                 )
                 session.add(reconciliation)
+                await session.flush()  # Flush to get the ID for the ledger
+
+                # Record the allocation so the allocation engine skips it
+                session.add(
+                    PaymentAllocation(
+                        reconciliation_id=reconciliation.id,
+                        credit_id=credit_id,
+                        installment_id=installment.id,
+                        amount=amount,
+                    )
+                )
 
             # Check if all installments for this credit are now paid
             all_installments_query = select(Installment).where(
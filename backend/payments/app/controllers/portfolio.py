@@ -3,8 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.Portfolio import Portfolio
 from ..repository.portfolio import PortfolioRepository
-from ..schemas.base import PaginationParams
 from ..schemas.Portfolio import (
+    PortfolioChanges,
     PortfolioCreate,
     PortfolioList,
     PortfolioResponse,
@@ -23,6 +23,7 @@ class PortfolioController(BaseController):
             create_schema=PortfolioCreate,
             update_schema=PortfolioUpdate,
             list_schema=PortfolioList,
+            changes_schema=PortfolioChanges,
             not_found_message="Portfolio not found",
         )
 
@@ -39,10 +40,3 @@ class PortfolioController(BaseController):
         if not resource:
             raise HTTPException(status_code=404, detail=self.not_found_message)
         return resource
-
-    async def get_multi_paginated(
-        self, session: AsyncSession, pagination: PaginationParams
-    ) -> PortfolioList:
-        """Get multiple portfolios with pagination and manager information."""
-        repository = self._get_repository()
-        return await repository.get_multi_paginated(session, pagination)
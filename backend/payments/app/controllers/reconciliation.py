@@ -1,5 +1,6 @@
 from ..models.Reconciliation import Reconciliation
 from ..schemas.Reconciliation import (
+    ReconciliationChanges,
     ReconciliationCreate,
     ReconciliationList,
     ReconciliationResponse,
@@ -16,5 +17,6 @@ class ReconciliationController(BaseController):
             get_schema=ReconciliationResponse,
             create_schema=ReconciliationCreate,
             list_schema=ReconciliationList,
+            changes_schema=ReconciliationChanges,
             not_found_message="Reconciliation not found",
         )
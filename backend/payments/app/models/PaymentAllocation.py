@@ -0,0 +1,41 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, Integer, text
+from sqlalchemy.dialects.mssql import DATETIME2
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PaymentAllocation(Base):
+    """
+    Ledger of how each reconciliation was applied to a credit's installments.
+
+    Rows with ``installment_id`` NULL hold the unapplied remainder of an
+    overpayment (saldo a favor).
+    """
+
+    __tablename__ = "payment_allocation"
+    __table_args__ = (
+        Index("ix_payment_allocation_reconciliation_id", "reconciliation_id"),
+        Index("ix_payment_allocation_installment_id", "installment_id"),
+        Index("ix_payment_allocation_credit_id", "credit_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    reconciliation_id: Mapped[int] = mapped_column(
+        ForeignKey("reconciliation.id"), nullable=False
+    )
+    credit_id: Mapped[int] = mapped_column(ForeignKey("credit.id"), nullable=False)
+    installment_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("installment.id"), nullable=True
+    )
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DATETIME2, nullable=False, server_default=text("GETDATE()")
+    )
+
+    def __repr__(self):
+        return f"<PaymentAllocation(id={self.id}, reconciliation_id={self.reconciliation_id}, installment_id={self.installment_id}, amount={self.amount})>"
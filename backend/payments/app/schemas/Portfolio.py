@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from .base import BaseResponseSchema, BaseSchema, ListBase
+from .base import BaseResponseSchema, BaseSchema, ChangeFeedBase, ListBase
 
 
 class PortfolioCreate(BaseModel):
@@ -43,3 +43,7 @@ class PortfolioResponse(BaseResponseSchema):
 
 class PortfolioList(ListBase):
     items: List[PortfolioResponse]
+
+
+class PortfolioChanges(ChangeFeedBase):
+    items: List[PortfolioResponse]
@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from .base import BaseResponseSchema, BaseSchema, ListBase
+from .base import BaseResponseSchema, BaseSchema, ChangeFeedBase, ListBase
 
 
 class ReconciliationCreate(BaseModel):
@@ -38,3 +38,7 @@ class ReconciliationResponse(BaseResponseSchema):
 
 class ReconciliationList(ListBase):
     items: List[ReconciliationResponse]
+
+
+class ReconciliationChanges(ChangeFeedBase):
+    items: List[ReconciliationResponse]
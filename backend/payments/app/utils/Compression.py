@@ -0,0 +1,263 @@
+"""
+Negotiated response compression.
+
+``CompressionMiddleware`` compresses text and JSON responses of at least
+``minimum_size`` bytes with the best encoding the client accepts: zstd, then
+brotli, then gzip. zstd and brotli are used only when their packages
+(``zstandard``, ``Brotli``) are installed; gzip is always available.
+
+Buffered responses are compressed in one shot (in the threadpool when they
+are large, so the event loop keeps serving other requests). Streamed
+responses, like report downloads, are compressed chunk by chunk and flushed
+after each one, so the client still receives data as it is produced.
+
+Payloads served many times (cached KPI results) are wrapped in
+``PrecompressedPayload``: the JSON is encoded once and each encoding is
+compressed once, at a higher level, and reused for every request. The
+middleware leaves responses that already carry ``Content-Encoding`` alone.
+"""
+
+import gzip
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .FastJSONResponse import dumps
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Responses smaller than this are not worth the CPU (and often grow)
+MINIMUM_SIZE = 1024
+
+# Buffered bodies above this size are compressed in the threadpool
+THREADPOOL_SIZE = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/xml",
+    "application/javascript",
+)
+
+# Levels for per-request compression (fast) and for precompressed payloads,
+# which are compressed once and served many times
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+PRECOMPRESSED_LEVELS = {"zstd": 12, "br": 9, "gzip": 9}
+
+
+def _gzip_compress(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Encoding -> (one-shot compressor, streaming compressor), by preference
+ENCODINGS: Dict[str, Tuple[Callable[[bytes, int], bytes], Callable[[int], Any]]] = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = (
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        _ZstdStream,
+    )
+if brotli is not None:
+    ENCODINGS["br"] = (
+        lambda data, level: brotli.compress(data, quality=level),
+        _BrotliStream,
+    )
+ENCODINGS["gzip"] = (_gzip_compress, _GzipStream)
+
+
+@lru_cache(maxsize=256)
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred supported encoding allowed by an ``Accept-Encoding`` header."""
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), -position, encoding)
+        for position, encoding in enumerate(ENCODINGS)
+    ]
+    weight, _, encoding = max(candidates)
+    return encoding if weight > 0 else None
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    one_shot, _ = ENCODINGS[encoding]
+    return one_shot(data, LEVELS[encoding] if level is None else level)
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start: Optional[dict] = None
+        self._stream = None
+        self._passthrough = False
+
+    async def send(self, message: dict):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(scope=start)
+            if not _is_compressible(headers) or (
+                not more_body and len(body) < self.minimum_size
+            ):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Length of a streamed response is not known in advance
+                del headers["Content-Length"]
+                self._stream = ENCODINGS[self.encoding][1](LEVELS[self.encoding])
+            else:
+                if len(body) >= THREADPOOL_SIZE:
+                    body = await run_in_threadpool(compress, body, self.encoding)
+                else:
+                    body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(start)
+
+        chunk = self._stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self._stream.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+
+class PrecompressedPayload:
+    """
+    JSON payload encoded once and compressed at most once per encoding, for
+    results served many times from a cache.
+    """
+
+    def __init__(self, content: Any):
+        self.body = dumps(content)
+        self._encoded: Dict[str, bytes] = {}
+
+    async def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = await run_in_threadpool(
+                compress, self.body, encoding, PRECOMPRESSED_LEVELS[encoding]
+            )
+            self._encoded[encoding] = data
+        return data
+
+    async def response(self, request: Request) -> Response:
+        headers = {"Vary": "Accept-Encoding"}
+        body = self.body
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None and len(body) >= MINIMUM_SIZE:
+            body = await self.encoded(encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
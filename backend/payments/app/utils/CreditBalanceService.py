@@ -0,0 +1,240 @@
+import time
+from itertools import chain
+from typing import Any, Dict
+
+from sqlalchemy import (
+    ColumnElement,
+    Subquery,
+    Update,
+    and_,
+    case,
+    event,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config.logger import logger
+from ..models.Credit import Credit
+from ..models.Installment import Installment
+from ..models.PaymentAllocation import PaymentAllocation
+from ..models.Reconciliation import Reconciliation
+
+INSTALLMENT_OVERDUE = "Vencida"
+
+# Credit ids per statement; SQL Server accepts at most 2100 parameters
+REFRESH_CHUNK_SIZE = 1000
+
+# Drifted credit ids reported by the verifier
+DRIFT_SAMPLE_SIZE = 20
+
+# session.info key holding the credits touched by ORM flushes
+_TOUCHED_CREDITS_KEY = "credit_balance_touched"
+
+
+def _balances() -> Subquery:
+    """Balances of every credit recomputed from the ledger and installments."""
+    ledger = (
+        select(
+            PaymentAllocation.credit_id,
+            func.sum(PaymentAllocation.amount).label("paid"),
+            func.sum(
+                case(
+                    (
+                        PaymentAllocation.installment_id.is_not(None),
+                        PaymentAllocation.amount,
+                    ),
+                    else_=0,
+                )
+            ).label("applied"),
+            func.max(Reconciliation.transaction_date).label("last_payment_date"),
+        )
+        .join(Reconciliation, Reconciliation.id == PaymentAllocation.reconciliation_id)
+        .group_by(PaymentAllocation.credit_id)
+        .subquery()
+    )
+    installments = (
+        select(
+            Installment.credit_id,
+            func.sum(Installment.installments_value).label("total"),
+            func.sum(
+                case((Installment.installment_state == INSTALLMENT_OVERDUE, 1), else_=0)
+            ).label("overdue"),
+        )
+        .group_by(Installment.credit_id)
+        .subquery()
+    )
+
+    paid = func.coalesce(ledger.c.paid, 0)
+    open_balance = installments.c.total - func.coalesce(ledger.c.applied, 0)
+    return (
+        select(
+            Credit.id.label("credit_id"),
+            paid.label("total_paid"),
+            # Credits without installments owe their disbursement
+            case(
+                (installments.c.credit_id.is_(None), Credit.disbursement_amount - paid),
+                (open_balance > 0, open_balance),
+                else_=0,
+            ).label("total_pending"),
+            ledger.c.last_payment_date,
+            func.coalesce(installments.c.overdue, 0).label("overdue_installments"),
+        )
+        .outerjoin(ledger, ledger.c.credit_id == Credit.id)
+        .outerjoin(installments, installments.c.credit_id == Credit.id)
+        .subquery("balances")
+    )
+
+
+def _drift(balances: Subquery) -> ColumnElement:
+    """True for credits whose stored balances differ from the computed ones."""
+    stored_date = Credit.last_payment_date
+    computed_date = balances.c.last_payment_date
+    return and_(
+        Credit.id == balances.c.credit_id,
+        or_(
+            Credit.total_paid != balances.c.total_paid,
+            Credit.total_pending != balances.c.total_pending,
+            Credit.overdue_installments != balances.c.overdue_installments,
+            and_(stored_date.is_(None), computed_date.is_not(None)),
+            and_(stored_date.is_not(None), computed_date.is_(None)),
+            stored_date != computed_date,
+        ),
+    )
+
+
+def refresh_statement(*criteria: ColumnElement) -> Update:
+    """
+    ``UPDATE credit`` recomputing the balances of the credits matching
+    ``criteria``. Only rows that actually changed are written, so callers can
+    pass a broad filter without bumping ``updated_at`` on untouched credits.
+    """
+    balances = _balances()
+    return (
+        update(Credit)
+        .where(*criteria, _drift(balances))
+        .values(
+            total_paid=balances.c.total_paid,
+            total_pending=balances.c.total_pending,
+            last_payment_date=balances.c.last_payment_date,
+            overdue_installments=balances.c.overdue_installments,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+class CreditBalanceService:
+    """
+    Keeps the denormalized balance columns of ``credit`` in sync.
+
+    ``total_paid``, ``total_pending``, ``last_payment_date`` and
+    ``overdue_installments`` are derived from the ``payment_allocation`` ledger
+    and the installments. Write paths refresh the credits they touch inside
+    their own transaction:
+
+    - ORM writes (CRUD endpoints, Excel insert loader, gateway payments) are
+      tracked automatically by ``track_credit_balances``.
+    - Set-based writes (allocation engine, overdue transitions, Excel upsert)
+      call ``refresh`` with the filter of the rows they changed.
+
+    ``verify_balances`` recomputes every credit and reports (and repairs) any
+    drift left by writes made outside the application.
+    """
+
+    async def refresh(self, session: AsyncSession, *criteria: ColumnElement) -> int:
+        """Recompute the balances of the credits matching ``criteria``."""
+        result = await session.execute(refresh_statement(*criteria))
+        return result.rowcount
+
+    async def verify_balances(
+        self, session: AsyncSession, repair: bool = True
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        balances = _balances()
+
+        try:
+            checked = (
+                await session.execute(select(func.count()).select_from(Credit))
+            ).scalar_one()
+            drifted = (
+                await session.execute(
+                    select(func.count()).select_from(Credit).where(_drift(balances))
+                )
+            ).scalar_one()
+            sample = (
+                (
+                    await session.execute(
+                        select(Credit.id)
+                        .where(_drift(balances))
+                        .order_by(Credit.id)
+                        .limit(DRIFT_SAMPLE_SIZE)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+            repaired = 0
+            if repair and drifted:
+                repaired = await self.refresh(session)
+                await session.commit()
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error verificando saldos de créditos: {str(e)}")
+            raise
+
+        results = {
+            "credits_checked": checked,
+            "credits_drifted": drifted,
+            "credits_repaired": repaired,
+            "drift_sample": sample,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if drifted:
+            logger.warning(f"Saldos de créditos desactualizados: {results}")
+        else:
+            logger.info(f"Saldos de créditos verificados: {results}")
+        return results
+
+
+def _collect_touched_credits(session: Session, flush_context):
+    touched = session.info.setdefault(_TOUCHED_CREDITS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Installment, PaymentAllocation)):
+            credit_id = obj.credit_id
+        elif isinstance(obj, Credit):
+            credit_id = obj.id
+        else:
+            continue
+        if credit_id is not None:
+            touched.add(credit_id)
+
+
+def _refresh_touched_credits(session: Session):
+    # Flush pending objects first so their credits are collected and their
+    # rows are visible to the refresh
+    session.flush()
+    touched = sorted(session.info.pop(_TOUCHED_CREDITS_KEY, ()))
+    for start in range(0, len(touched), REFRESH_CHUNK_SIZE):
+        chunk = touched[start : start + REFRESH_CHUNK_SIZE]
+        session.execute(refresh_statement(Credit.id.in_(chunk)))
+
+
+def _forget_touched_credits(session: Session):
+    session.info.pop(_TOUCHED_CREDITS_KEY, None)
+
+
+def track_credit_balances():
+    """
+    Refresh, right before each commit, the balances of every credit whose
+    installments, allocations or own row were written through the ORM.
+    """
+    if event.contains(Session, "after_flush", _collect_touched_credits):
+        return
+    event.listen(Session, "after_flush", _collect_touched_credits)
+    event.listen(Session, "before_commit", _refresh_touched_credits)
+    event.listen(Session, "after_rollback", _forget_touched_credits)
@@ -4,7 +4,7 @@ import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config.database import sessionmanager
-from ..config.logger import logger
+from ..config.logger import logger, row_logger
 from ..models.Alert import Alert
 from ..models.Client import Client
 from ..models.Credit import INTEREST_RATE_MULTIPLIER, Credit
@@ -15,6 +15,60 @@ from ..models.Reconciliation import Reconciliation
 
 # INTEREST_RATE_MULTIPLIER = 10000
 
+CLIENT_STATE_MAPPING = {
+    "Activo": "Activo",
+    "Castigado": "Castigado",
+    "En mora": "En Mora",
+    "En Mora": "En Mora",
+}
+
+MANAGER_ZONE_MAPPING = {
+    "Rural": "Rural",
+    "Urbana": "Urbano",
+    "Urbano": "Urbano",
+}
+
+CREDIT_STATE_MAPPING = {
+    "Vigente": "Vigente",
+    "Cancelado": "Cancelado",
+    "En Mora": "En Mora",
+    "Pendiente": "Pendiente",
+}
+
+INSTALLMENT_STATE_MAPPING = {
+    "Pagada": "Pagada",
+    "Pendiente": "Pendiente",
+    "Vencida": "Vencida",
+    "Promesa de pago": "Promesa de pago",
+}
+
+CONTACT_METHOD_MAPPING = {
+    "Telefono": "Telefono",
+    "Correo": "Correo",
+    "WhatsApp": "WhatsApp",
+    "Visita": "Visita",
+}
+
+CONTACT_RESULT_MAPPING = {
+    "Efectiva": "Efectiva",
+    "Sin respuesta": "Sin respuesta",
+    "Numero errado": "Numero errado",
+    "Promesa de pago": "Promesa de pago",
+}
+
+ALERT_TYPE_MAPPING = {
+    "No respuesta": "No respuesta",
+    "Riesgo de mora": "Riesgo de mora",
+    "Requiere visita": "Requiere visita",
+}
+
+PAYMENT_CHANNEL_MAPPING = {
+    "Oficina": "Oficina",
+    "Corresponsal": "Corresponsal",
+    "Transferencia": "Transferencia",
+    "Sucursal": "Sucursal",
+}
+
 
 class ExcelLoaderService:
     def __init__(self):
@@ -63,7 +117,13 @@ class ExcelLoaderService:
             )
 
             await session.commit()
-            logger.info(f"Proceso completado exitosamente: {results}")
+            logger.info(
+                "Proceso completado exitosamente",
+                extra={
+                    "results": {k: v for k, v in results.items() if k != "errors"},
+                    "error_count": len(results["errors"]),
+                },
+            )
             return results
 
         except Exception as e:
@@ -80,13 +140,6 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                state_mapping = {
-                    "Activo": "Activo",
-                    "Castigado": "Castigado",
-                    "En mora": "En Mora",
-                    "En Mora": "En Mora",
-                }
-
                 client = Client(
                     name=str(row["Nombre"]).strip(),
                     document=str(row["Documento"]).strip(),
@@ -98,7 +151,7 @@ class ExcelLoaderService:
                         else ""
                     ),
                     zone=str(row["Zona"]).strip() if pd.notna(row["Zona"]) else None,
-                    status=state_mapping.get(
+                    status=CLIENT_STATE_MAPPING.get(
                         str(row["Estado_Cliente"]).strip(), "Activo"
                     ),
                 )
@@ -113,7 +166,7 @@ class ExcelLoaderService:
                 error_msg = (
                     f"Error procesando cliente {row.get('ID_Cliente', 'N/A')}: {str(e)}"
                 )
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_managers(
@@ -125,15 +178,9 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                zone_mapping = {
-                    "Rural": "Rural",
-                    "Urbana": "Urbano",
-                    "Urbano": "Urbano",
-                }
-
                 manager = Manager(
                     name=str(row["Nombre_Gestor"]).strip(),
-                    manager_zone=zone_mapping.get(
+                    manager_zone=MANAGER_ZONE_MAPPING.get(
                         str(row["Zona_Asignada"]).strip(), "Rural"
                     ),
                 )
@@ -146,7 +193,7 @@ class ExcelLoaderService:
 
             except Exception as e:
                 error_msg = f"Error procesando gestor {row.get('Numero_Gestor', 'N/A')}: {str(e)}"
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_credits(
@@ -158,13 +205,6 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                state_mapping = {
-                    "Vigente": "Vigente",
-                    "Cancelado": "Cancelado",
-                    "En Mora": "En Mora",
-                    "Pendiente": "Pendiente",
-                }
-
                 original_client_id = int(row["Numero_Cliente"])
                 if original_client_id not in self.client_mapping:
                     raise ValueError(f"Cliente {original_client_id} no encontrado")
@@ -175,7 +215,7 @@ class ExcelLoaderService:
 
                 credit = Credit(
                     client_id=self.client_mapping[original_client_id],
-                    credit_state=state_mapping.get(
+                    credit_state=CREDIT_STATE_MAPPING.get(
                         str(row["Estado_Credito"]).strip(), "Pendiente"
                     ),
                     disbursement_amount=int(float(row["Monto_Original"])),
@@ -195,7 +235,7 @@ class ExcelLoaderService:
 
             except Exception as e:
                 error_msg = f"Error procesando crédito {row.get('Numero_Credito', 'N/A')}: {str(e)}"
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_installments(
@@ -207,13 +247,6 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                state_mapping = {
-                    "Pagada": "Pagada",
-                    "Pendiente": "Pendiente",
-                    "Vencida": "Vencida",
-                    "Promesa de pago": "Promesa de pago",
-                }
-
                 original_credit_id = int(row["Numero_Credito"])
                 if original_credit_id not in self.credit_mapping:
                     raise ValueError(f"Crédito {original_credit_id} no encontrado")
@@ -229,7 +262,7 @@ class ExcelLoaderService:
 
                 installment = Installment(
                     credit_id=self.credit_mapping[original_credit_id],
-                    installment_state=state_mapping.get(
+                    installment_state=INSTALLMENT_STATE_MAPPING.get(
                         str(row["Estado_Cuota"]).strip(), "Pendiente"
                     ),
                     installments_number=int(row["Numero_Cuota2"]),
@@ -248,7 +281,7 @@ class ExcelLoaderService:
                 error_msg = (
                     f"Error procesando cuota {row.get('Numero_Cuota', 'N/A')}: {str(e)}"
                 )
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_portfolio(
@@ -260,20 +293,6 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                contact_method_mapping = {
-                    "Telefono": "Telefono",
-                    "Correo": "Correo",
-                    "WhatsApp": "WhatsApp",
-                    "Visita": "Visita",
-                }
-
-                contact_result_mapping = {
-                    "Efectiva": "Efectiva",
-                    "Sin respuesta": "Sin respuesta",
-                    "Numero errado": "Numero errado",
-                    "Promesa de pago": "Promesa de pago",
-                }
-
                 original_installment_id = int(row["Numero_Cuota"])
                 original_manager_id = int(row["Numero del Gestor"])
 
@@ -289,10 +308,10 @@ class ExcelLoaderService:
                 portfolio = Portfolio(
                     installment_id=self.installment_mapping[original_installment_id],
                     manager_id=self.manager_mapping[original_manager_id],
-                    contact_method=contact_method_mapping.get(
+                    contact_method=CONTACT_METHOD_MAPPING.get(
                         str(row["Medio_Contacto"]).strip(), "Telefono"
                     ),
-                    contact_result=contact_result_mapping.get(
+                    contact_result=CONTACT_RESULT_MAPPING.get(
                         str(row["Resultado"]).strip(), "Sin respuesta"
                     ),
                     management_date=management_date,
@@ -309,7 +328,7 @@ class ExcelLoaderService:
 
             except Exception as e:
                 error_msg = f"Error procesando gestión {row.get('Numero_Gestion', 'N/A')}: {str(e)}"
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_alerts(
@@ -321,12 +340,6 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                alert_type_mapping = {
-                    "No respuesta": "No respuesta",
-                    "Riesgo de mora": "Riesgo de mora",
-                    "Requiere visita": "Requiere visita",
-                }
-
                 original_credit_id = int(row["Numero_Credito"])
                 if original_credit_id not in self.credit_mapping:
                     raise ValueError(f"Crédito {original_credit_id} no encontrado")
@@ -358,7 +371,7 @@ class ExcelLoaderService:
                 alert = Alert(
                     credit_id=self.credit_mapping[original_credit_id],
                     client_id=client_id,
-                    alert_type=alert_type_mapping.get(
+                    alert_type=ALERT_TYPE_MAPPING.get(
                         str(row["Tipo_Alerta"]).strip(), "No respuesta"
                     ),
                     manually_generated=manually_generated,
@@ -370,7 +383,7 @@ class ExcelLoaderService:
 
             except Exception as e:
                 error_msg = f"Error procesando alerta: {str(e)}"
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
 
     async def _process_reconciliations(
@@ -382,20 +395,13 @@ class ExcelLoaderService:
 
         for _, row in df.iterrows():
             try:
-                channel_mapping = {
-                    "Oficina": "Oficina",
-                    "Corresponsal": "Corresponsal",
-                    "Transferencia": "Transferencia",
-                    "Sucursal": "Sucursal",
-                }
-
                 transaction_date = pd.to_datetime(
                     row["Fecha_Transaccion"], dayfirst=True
                 ).date()
                 payment_reference = str(row["Referencia_Pago"])
 
                 reconciliation = Reconciliation(
-                    payment_channel=channel_mapping.get(
+                    payment_channel=PAYMENT_CHANNEL_MAPPING.get(
                         str(row["Canal_Pago"]).strip(), "Oficina"
                     ),
                     payment_reference=payment_reference,
@@ -413,5 +419,5 @@ class ExcelLoaderService:
 
             except Exception as e:
                 error_msg = f"Error procesando transacción {row.get('Transaccion', 'N/A')}: {str(e)}"
-                logger.error(error_msg)
+                row_logger.error(error_msg)
                 results["errors"].append(error_msg)
@@ -0,0 +1,61 @@
+"""
+Opt-in fast JSON responses for large payloads.
+
+When an endpoint declares ``response_model``, FastAPI validates the returned
+object against it again, converts it to plain Python with the model serializer
+and then encodes that with the standard ``json`` module. Returning a
+``Response`` skips all of that, so endpoints with large, already-validated
+payloads can return ``FastJSONResponse(content)`` and keep ``response_model``
+only for the OpenAPI schema:
+
+    @router.get("/...", response_model=ClientCompleteResponse)
+    async def endpoint(...):
+        return FastJSONResponse(await controller.get_client_complete_data(...))
+
+Pydantic models (and lists of them) are written to bytes in one pass by their
+own Rust serializer, producing the same JSON FastAPI would. Anything else
+(the KPI dicts) is encoded with orjson.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    # Same conversions as FastAPI's jsonable_encoder for the types orjson
+    # does not handle natively
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    if (
+        isinstance(content, list)
+        and content
+        and isinstance(content[0], BaseModel)
+        and all(type(item) is type(content[0]) for item in content)
+    ):
+        return _list_adapter(type(content[0])).dump_json(content, by_alias=True)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -22,6 +22,7 @@ from credit_management.app.models import (
     Credit,
     Installment,
     Manager,
+    PaymentAllocation,
     Portfolio,
     Reconciliation,
 )
@@ -87,6 +88,7 @@ def recreate_database():
                 "portfolio",
                 "alert",
                 "reconciliation",
+                "payment_allocation",
             ]
 
             created_tables = []
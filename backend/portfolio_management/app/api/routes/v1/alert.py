@@ -3,8 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.alert import AlertController
-from ....schemas.Alert import AlertCreate, AlertList, AlertResponse
-from ....schemas.base import PaginationParams
+from ....schemas.Alert import AlertChanges, AlertCreate, AlertList, AlertResponse
+from ....schemas.base import ChangeFeedParams, PaginationParams
 
 router = APIRouter()
 
@@ -27,6 +27,14 @@ async def get_alerts(
     return await controller.get_multi_paginated(session, pagination)
 
 
+@router.post("/get_alert_changes", response_model=AlertChanges, tags=["Alerts"])
+async def get_alert_changes(
+    params: ChangeFeedParams, session: AsyncSession = Depends(get_db_session)
+):
+    controller = AlertController()
+    return await controller.get_changes(session, params)
+
+
 @router.post("/create_alert", response_model=AlertResponse, tags=["Alerts"])
 async def create_alert(
     alert: AlertCreate, session: AsyncSession = Depends(get_db_session)
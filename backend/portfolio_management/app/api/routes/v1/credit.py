@@ -3,8 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.credit import CreditController
-from ....schemas.base import PaginationParams
-from ....schemas.Credit import CreditCreate, CreditList, CreditResponse, CreditUpdate
+from ....schemas.base import ChangeFeedParams, PaginationParams
+from ....schemas.Credit import (
+    CreditChanges,
+    CreditCreate,
+    CreditList,
+    CreditResponse,
+    CreditUpdate,
+)
 
 router = APIRouter()
 
@@ -27,6 +33,14 @@ async def get_credits(
     return await controller.get_multi_paginated(session, pagination)
 
 
+@router.post("/get_credit_changes", response_model=CreditChanges, tags=["Credits"])
+async def get_credit_changes(
+    params: ChangeFeedParams, session: AsyncSession = Depends(get_db_session)
+):
+    controller = CreditController()
+    return await controller.get_changes(session, params)
+
+
 @router.post("/create_credit", response_model=CreditResponse, tags=["Credits"])
 async def create_credit(
     credit: CreditCreate, session: AsyncSession = Depends(get_db_session)
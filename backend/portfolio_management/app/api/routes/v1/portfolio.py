@@ -3,13 +3,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....controllers.portfolio import PortfolioController
-from ....schemas.base import PaginationParams
+from ....schemas.base import ChangeFeedParams, ListParams
 from ....schemas.Portfolio import (
+    PortfolioChanges,
     PortfolioCreate,
     PortfolioList,
     PortfolioResponse,
     PortfolioUpdate,
 )
+from ....utils.FastJSONResponse import FastJSONResponse
 
 router = APIRouter()
 
@@ -28,10 +30,24 @@ async def get_portfolio_by_id(
 
 @router.post("/get_portfolios", response_model=PortfolioList, tags=["Portfolios"])
 async def get_portfolios(
-    pagination: PaginationParams, session: AsyncSession = Depends(get_db_session)
+    pagination: ListParams, session: AsyncSession = Depends(get_db_session)
 ):
     controller = PortfolioController()
-    return await controller.get_multi_paginated(session, pagination)
+    return FastJSONResponse(
+        await controller.get_multi_paginated(
+            session, pagination, fields=pagination.fields
+        )
+    )
+
+
+@router.post(
+    "/get_portfolio_changes", response_model=PortfolioChanges, tags=["Portfolios"]
+)
+async def get_portfolio_changes(
+    params: ChangeFeedParams, session: AsyncSession = Depends(get_db_session)
+):
+    controller = PortfolioController()
+    return await controller.get_changes(session, params)
 
 
 @router.post("/create_portfolio", response_model=PortfolioResponse, tags=["Portfolios"])
@@ -1,5 +1,6 @@
 import os
 import tempfile
+import time
 import uuid
 from typing import Any, Dict
 
@@ -17,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....config.database import get_db_session
 from ....utils.ExcelLoaderService import ReconciliationExcelService
+from ....utils.Metrics import IMPORT_ROWS, IMPORT_SECONDS
 
 router = APIRouter()
 
@@ -114,6 +116,7 @@ async def process_excel_background(task_id: str, file_path: str, session: AsyncS
     """
     Background task to process reconciliation Excel file.
     """
+    started = time.perf_counter()
     try:
         loading_tasks[task_id]["status"] = "processing"
 
@@ -124,11 +127,21 @@ async def process_excel_background(task_id: str, file_path: str, session: AsyncS
         loading_tasks[task_id]["status"] = "completed"
         loading_tasks[task_id]["results"] = results
 
+        IMPORT_ROWS.labels("reconciliation", "reconciliations").inc(
+            results["reconciliations_loaded"]
+        )
+        IMPORT_ROWS.labels("reconciliation", "skipped").inc(
+            results["reconciliations_skipped"]
+        )
+
     except Exception as e:
         loading_tasks[task_id]["status"] = "error"
         loading_tasks[task_id]["error"] = str(e)
 
     finally:
+        IMPORT_SECONDS.labels(
+            "reconciliation", loading_tasks[task_id]["status"]
+        ).observe(time.perf_counter() - started)
         # Clean up temporary file
         try:
             os.unlink(file_path)
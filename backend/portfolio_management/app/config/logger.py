@@ -1,8 +1,36 @@
+"""
+Application logging.
+
+Log calls never touch the console or the disk on the caller's thread: the
+``app_logger`` and ``sqlalchemy.engine`` loggers only put the record on a
+bounded in-memory queue, and a ``QueueListener`` thread formats it as one JSON
+object per line and writes it to stdout and the rotating log file. When the
+queue is full the record is dropped and counted instead of blocking the event
+loop; the drops are reported in the log once there is room again and exported
+as ``log_records_dropped_total``.
+
+High-volume per-row messages (one per Excel row that fails) go to
+``row_logger``, which keeps the first records of every minute and then one of
+each ``LOG_ROW_SAMPLE_RATE``, so a bad file cannot flood the queue.
+
+Structured fields are passed with ``extra`` and become keys of the JSON line:
+
+    logger.info("Carga completada", extra={"results": summary})
+"""
+
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from ..utils.Metrics import LOG_RECORDS_DROPPED
 from .settings import settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -11,10 +39,117 @@ LOG_DIR.mkdir(exist_ok=True)
 
 LOG_FILE = LOG_DIR / "app.log"
 
-logger = logging.getLogger("app_logger")
-logger.setLevel(settings.LOG_LEVEL)
+# Records kept per sampled logger in each window before sampling starts
+SAMPLING_BURST = 20
+SAMPLING_WINDOW_SECONDS = 60
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the ``extra`` fields as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "service": settings.APP_NAME,
+            "environment": settings.ENVIRONMENT,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep the first ``burst`` records of every window and then one of every
+    ``rate``; the rest are counted as dropped.
+    """
+
+    def __init__(self, rate: int, burst: int = SAMPLING_BURST):
+        super().__init__()
+        self.rate = max(rate, 1)
+        self.burst = burst
+        self._window_started = 0.0
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        if now - self._window_started >= SAMPLING_WINDOW_SECONDS:
+            self._window_started = now
+            self._seen = 0
+        self._seen += 1
+        if self._seen <= self.burst or (self._seen - self.burst) % self.rate == 0:
+            return True
+        LOG_RECORDS_DROPPED.labels(record.name, "sampled").inc()
+        return False
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+class DroppingQueueHandler(QueueHandler):
+    """``QueueHandler`` that drops records, never blocks, when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (arguments may change before
+        # the listener runs) but leave the JSON formatting to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self._dropped:
+            self._report_drops()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            LOG_RECORDS_DROPPED.labels(record.name, "queue_full").inc()
+
+    def _report_drops(self):
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        notice = logging.makeLogRecord(
+            {
+                "name": logger.name,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Cola de logs llena: {dropped} registros descartados",
+                "dropped_records": dropped,
+            }
+        )
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._lock:
+                self._dropped += dropped
+
+
+log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+
+formatter = JsonFormatter()
 
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.DEBUG)
@@ -26,6 +161,24 @@ file_handler = RotatingFileHandler(
 file_handler.setLevel(logging.INFO)
 file_handler.setFormatter(formatter)
 
+listener = QueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True
+)
+
+logger = logging.getLogger("app_logger")
+logger.setLevel(settings.LOG_LEVEL)
+
+row_logger = logger.getChild("rows")
+row_logger.addFilter(SamplingFilter(settings.LOG_ROW_SAMPLE_RATE))
+
+# SQL statements go through the same queue instead of the engine's echo handler
+sql_logger = logging.getLogger("sqlalchemy.engine")
+sql_logger.setLevel(logging.INFO if settings.LOG_SQL else logging.WARNING)
+
 if not logger.hasHandlers():
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+    sql_logger.addHandler(queue_handler)
+    sql_logger.propagate = False
+    listener.start()
+    # Flush what is still queued when the process exits
+    atexit.register(listener.stop)
@@ -1,5 +1,5 @@
 from ..models.Alert import Alert
-from ..schemas.Alert import AlertCreate, AlertList, AlertResponse
+from ..schemas.Alert import AlertChanges, AlertCreate, AlertList, AlertResponse
 from .base import BaseController
 
 
@@ -12,5 +12,6 @@ class AlertController(BaseController):
             get_schema=AlertResponse,
             create_schema=AlertCreate,
             list_schema=AlertList,
+            changes_schema=AlertChanges,
             not_found_message="Alert not found",
         )
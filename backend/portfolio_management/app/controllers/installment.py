@@ -1,5 +1,6 @@
 from ..models.Installment import Installment
 from ..schemas.Installment import (
+    InstallmentChanges,
     InstallmentCreate,
     InstallmentList,
     InstallmentResponse,
@@ -16,5 +17,6 @@ class InstallmentController(BaseController):
             get_schema=InstallmentResponse,
             create_schema=InstallmentCreate,
             list_schema=InstallmentList,
+            changes_schema=InstallmentChanges,
             not_found_message="Installment not found",
         )
@@ -1,7 +1,7 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, String, text
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.mssql import DATETIME2
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,14 @@ from .base import Base
 
 class Portfolio(Base):
     __tablename__ = "portfolio"
+    __table_args__ = (
+        Index("ix_portfolio_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_portfolio_installment_id_management_date",
+            "installment_id",
+            "management_date",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     installment_id: Mapped[int] = mapped_column(
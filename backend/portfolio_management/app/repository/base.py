@@ -1,33 +1,133 @@
-from functools import reduce
-from typing import Any, Generic, Optional, Type, TypeVar
+import re
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar
 
-from pydantic import BaseModel
-from sqlalchemy import Select, func
+from pydantic import BaseModel, create_model
+from sqlalchemy import Select, and_, column, func, literal_column, or_, table
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import select
 
+from ..config.logger import logger
+from ..config.settings import settings
 from ..models.base import Base
-from ..schemas.base import BaseResponseSchema, BaseSchema, PaginationParams
+from ..schemas.base import (
+    BaseResponseSchema,
+    BaseSchema,
+    ChangeFeedParams,
+    PaginationParams,
+)
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseSchema)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseSchema)
 GetSchemaType = TypeVar("GetSchemaType", bound=BaseResponseSchema)
 ListSchemaType = TypeVar("ListSchemaType", bound=BaseModel)
+ChangesSchemaType = TypeVar("ChangesSchemaType", bound=BaseModel)
+
+# A transaction stamps updated_at when each statement runs but its rows only
+# become visible when it commits, possibly much later (alert and allocation
+# batches, the Excel MERGE, overdue transitions). The change feed therefore
+# stops before the oldest write transaction still open in the database, so a
+# client's watermark never moves past rows that are yet to commit. The margin
+# covers a statement that has taken its timestamp but not yet written.
+# Reading the transaction DMVs needs VIEW SERVER STATE (VIEW DATABASE STATE
+# on Azure SQL); without the grant, or with CHANGE_FEED_TRANSACTION_BOUND off,
+# the feed only holds back the margin.
+CHANGE_FEED_SETTLE_SECONDS = 2
+
+# Error raised when the login may not read the transaction DMVs
+_DMV_PERMISSION_DENIED = re.compile(
+    r"VIEW (SERVER|DATABASE) STATE|\((297|300)\)", re.IGNORECASE
+)
+
+_database_transactions = table(
+    "dm_tran_database_transactions",
+    column("transaction_id"),
+    column("database_id"),
+    column("database_transaction_begin_time"),
+    schema="sys",
+)
+_active_transactions = table(
+    "dm_tran_active_transactions",
+    column("transaction_id"),
+    column("transaction_begin_time"),
+    schema="sys",
+)
+
+
+def change_feed_horizon(transaction_bound: bool = True):
+    """
+    Upper bound (exclusive) of updated_at for the change feed: the start of
+    the oldest other transaction that has written to this database, or now,
+    minus ``CHANGE_FEED_SETTLE_SECONDS``. Without ``transaction_bound``, now
+    minus the margin.
+    """
+    if not transaction_bound:
+        return func.dateadd(
+            literal_column("second"), -CHANGE_FEED_SETTLE_SECONDS, func.getdate()
+        )
+    oldest_open_write = (
+        select(func.min(_active_transactions.c.transaction_begin_time))
+        .select_from(
+            _database_transactions.join(
+                _active_transactions,
+                _active_transactions.c.transaction_id
+                == _database_transactions.c.transaction_id,
+            )
+        )
+        .where(
+            _database_transactions.c.database_id == func.db_id(),
+            _database_transactions.c.database_transaction_begin_time.is_not(None),
+            _database_transactions.c.transaction_id != func.current_transaction_id(),
+        )
+        .scalar_subquery()
+    )
+    return func.dateadd(
+        literal_column("second"),
+        -CHANGE_FEED_SETTLE_SECONDS,
+        func.coalesce(oldest_open_write, func.getdate()),
+    )
+
+
+@lru_cache(maxsize=256)
+def sparse_list_schema(
+    list_schema: Type[BaseModel], item_schema: Type[BaseModel], fields: Tuple[str]
+) -> Type[BaseModel]:
+    """
+    Subclass of ``list_schema`` whose items only have ``fields``, with the
+    same types (and therefore the same JSON) as in ``item_schema``.
+    """
+    item = create_model(
+        f"{item_schema.__name__}Sparse",
+        **{
+            name: (Optional[item_schema.model_fields[name].annotation], None)
+            for name in fields
+        },
+    )
+    return create_model(
+        f"{list_schema.__name__}Sparse", __base__=list_schema, items=(List[item], ...)
+    )
 
 
 class BaseRepository(
     Generic[ModelType, GetSchemaType, UpdateSchemaType, ListSchemaType]
 ):
+    # Whether the change feed stops at the oldest open write transaction;
+    # cleared for the process if the login may not read the transaction DMVs
+    transaction_bound: bool = settings.CHANGE_FEED_TRANSACTION_BOUND
+
     def __init__(
         self,
         model: Type[ModelType],
         get_schema: Type[GetSchemaType] = None,
         list_schema: Type[ListSchemaType] = None,
+        changes_schema: Type[ChangesSchemaType] = None,
     ):
         self.model = model
         self.get_schema = get_schema
         self.list_schema = list_schema
+        self.changes_schema = changes_schema
 
     async def get_by_id(self, db: AsyncSession, id: int) -> GetSchemaType | None:
         result = await db.execute(select(self.model).where(self.model.id == id))
@@ -41,7 +141,10 @@ class BaseRepository(
         db: AsyncSession,
         pagination: PaginationParams,
         estimate_count: bool = True,
+        fields: Optional[List[str]] = None,
     ) -> ListSchemaType:
+        if fields:
+            return await self._get_sparse_page(db, pagination, estimate_count, fields)
 
         result = await db.execute(
             select(self.model)
@@ -55,19 +158,7 @@ class BaseRepository(
         if has_next:
             db_items = db_items[:-1]
 
-        total = 0
-        pages = 0
-
-        if estimate_count:
-            total_result = await db.execute(
-                select(func.count()).select_from(self.model)
-            )
-            total = total_result.scalar_one()
-            pages = (
-                (total + pagination.page_size - 1) // pagination.page_size
-                if total > 0
-                else 0
-            )
+        total, pages = await self._count_pages(db, pagination, estimate_count)
 
         items = [
             self.get_schema.model_validate(item, from_attributes=True)
@@ -83,6 +174,158 @@ class BaseRepository(
             has_next=has_next,
         )
 
+    async def _count_pages(
+        self, db: AsyncSession, pagination: PaginationParams, estimate_count: bool
+    ) -> Tuple[int, int]:
+        if not estimate_count:
+            return 0, 0
+        total_result = await db.execute(select(func.count()).select_from(self.model))
+        total = total_result.scalar_one()
+        pages = (
+            (total + pagination.page_size - 1) // pagination.page_size
+            if total > 0
+            else 0
+        )
+        return total, pages
+
+    def _sparse_columns(self) -> Dict[str, Any]:
+        """Response fields that can be selected on their own, by name."""
+        table_columns = self.model.__table__.columns
+        return {
+            name: getattr(self.model, name)
+            for name in self.get_schema.model_fields
+            if name in table_columns
+        }
+
+    def _sparse_query(self, fields: List[str], columns: List[Any]) -> Select:
+        return select(*columns)
+
+    async def _get_sparse_page(
+        self,
+        db: AsyncSession,
+        pagination: PaginationParams,
+        estimate_count: bool,
+        fields: List[str],
+    ) -> ListSchemaType:
+        """
+        Page with only the requested fields. The projection is pushed down to
+        the SELECT and rows are validated straight into slim response
+        objects, without loading ORM entities.
+        """
+        available = self._sparse_columns()
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValueError(
+                f"Campos no disponibles: {', '.join(unknown)}. "
+                f"Permitidos: {', '.join(available)}"
+            )
+
+        # id always first: it identifies the row and orders the page
+        fields = list(dict.fromkeys(["id", *fields]))
+        columns = [available[name].label(name) for name in fields]
+        result = await db.execute(
+            self._sparse_query(fields, columns)
+            .order_by(self.model.id)
+            .offset(pagination.skip)
+            .limit(pagination.page_size + 1)
+        )
+        rows = result.mappings().all()
+
+        has_next = len(rows) > pagination.page_size
+        if has_next:
+            rows = rows[:-1]
+
+        total, pages = await self._count_pages(db, pagination, estimate_count)
+
+        schema = sparse_list_schema(self.list_schema, self.get_schema, tuple(fields))
+        return schema(
+            items=rows,
+            total=total,
+            page=pagination.page,
+            page_size=pagination.page_size,
+            pages=pages,
+            has_next=has_next,
+        )
+
+    async def get_changes(
+        self, db: AsyncSession, params: ChangeFeedParams
+    ) -> ChangesSchemaType:
+        """
+        Return rows changed after the (updated_at, id) watermark, oldest first.
+
+        Keyset pagination on the composite index keeps every page an index
+        seek regardless of how far the client is behind.
+        """
+        result = await self._execute_changes(db, lambda: self._changes_query(params))
+        return self._changes_page(result.scalars().all(), params)
+
+    async def _execute_changes(self, db: AsyncSession, build: Callable[[], Select]):
+        """
+        Run a change feed query. If the login may not read the transaction
+        DMVs, the bound is switched off for the process and the query is run
+        again with the settle margin alone.
+        """
+        try:
+            return await db.execute(build())
+        except DBAPIError as e:
+            if not (
+                BaseRepository.transaction_bound
+                and _DMV_PERMISSION_DENIED.search(str(e))
+            ):
+                raise
+            BaseRepository.transaction_bound = False
+            logger.warning(
+                "Sin permiso para leer las transacciones activas (VIEW SERVER "
+                "STATE): el feed de cambios retiene solo los últimos "
+                f"{CHANGE_FEED_SETTLE_SECONDS} s"
+            )
+            await db.rollback()
+            return await db.execute(build())
+
+    def _changes_query(self, params: ChangeFeedParams) -> Select:
+        horizon = change_feed_horizon(BaseRepository.transaction_bound)
+        query = select(self.model).where(self.model.updated_at < horizon)
+
+        if params.updated_since is not None:
+            query = query.where(
+                or_(
+                    self.model.updated_at > params.updated_since,
+                    and_(
+                        self.model.updated_at == params.updated_since,
+                        self.model.id > params.after_id,
+                    ),
+                )
+            )
+
+        return query.order_by(self.model.updated_at, self.model.id).limit(
+            params.limit + 1
+        )
+
+    def _changes_page(
+        self, db_items: list, params: ChangeFeedParams, to_schema=None
+    ) -> ChangesSchemaType:
+        to_schema = to_schema or (
+            lambda item: self.get_schema.model_validate(item, from_attributes=True)
+        )
+
+        has_more = len(db_items) > params.limit
+        if has_more:
+            db_items = db_items[:-1]
+
+        if db_items:
+            next_updated_since = db_items[-1].updated_at
+            next_after_id = db_items[-1].id
+        else:
+            next_updated_since = params.updated_since
+            next_after_id = params.after_id
+
+        return self.changes_schema(
+            items=[to_schema(item) for item in db_items],
+            next_updated_since=next_updated_since,
+            next_after_id=next_after_id,
+            has_more=has_more,
+        )
+
     async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> GetSchemaType:
         obj_data = obj_in.model_dump(exclude_unset=True)
         db_obj = self.model(**obj_data)
@@ -4,7 +4,7 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from ..models.Credit import INTEREST_RATE_MULTIPLIER
-from .base import BaseResponseSchema, BaseSchema, ListBase
+from .base import BaseResponseSchema, BaseSchema, ChangeFeedBase, ListBase
 
 
 class CreditCreate(BaseModel):
@@ -47,6 +47,10 @@ class CreditResponse(BaseResponseSchema):
     total_quotas: int
     disbursement_date: date
     credit_state: str
+    total_paid: int = 0
+    total_pending: int = 0
+    last_payment_date: Optional[date] = None
+    overdue_installments: int = 0
 
     @field_validator("interest_rate", mode="before")
     @classmethod
@@ -58,3 +62,7 @@ class CreditResponse(BaseResponseSchema):
 
 class CreditList(ListBase):
     items: List[CreditResponse]
+
+
+class CreditChanges(ChangeFeedBase):
+    items: List[CreditResponse]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Generic, Optional, TypeVar
+from typing import Any, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -27,8 +27,37 @@ class PaginationParams(BaseModel):
         return (self.page - 1) * self.page_size
 
 
+class ListParams(PaginationParams):
+    """
+    Pagination for list endpoints plus an optional sparse fieldset: when
+    ``fields`` is given only those response fields (and ``id``) are selected
+    and returned, e.g. ``{"page": 1, "page_size": 50, "fields": ["name",
+    "zone"]}``.
+    """
+
+    fields: Optional[List[str]] = Field(None, min_length=1)
+
+
 class ListBase(BaseModel):
     total: int
     page: int
     page_size: int
     pages: int
+
+
+class ChangeFeedParams(BaseModel):
+    """
+    Watermark for incremental sync. Send back the ``next_updated_since`` and
+    ``next_after_id`` of the previous response to resume; omit both for a
+    full initial sync.
+    """
+
+    updated_since: Optional[datetime] = None
+    after_id: int = 0
+    limit: int = Field(100, gt=0, le=1000)
+
+
+class ChangeFeedBase(BaseModel):
+    next_updated_since: Optional[datetime] = None
+    next_after_id: int = 0
+    has_more: bool
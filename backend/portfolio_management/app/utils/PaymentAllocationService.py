@@ -0,0 +1,272 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.logger import logger
+from ..config.settings import settings
+from ..models.Credit import Credit
+from .CreditBalanceService import CreditBalanceService
+
+# Reconciliations allocated per transaction
+ALLOCATION_BATCH_SIZE = 5000
+
+# Credit state once every installment is paid
+CREDIT_PAID_STATE = "Cancelado"
+
+# Serializes allocation runs (upload, scheduled job, manual trigger) so two
+# runs never read the same open balances
+ALLOCATION_LOCK_SQL = """
+    EXEC sp_getapplock
+        @Resource = 'payment_allocation',
+        @LockMode = 'Exclusive',
+        @LockOwner = 'Transaction',
+        @LockTimeout = 60000
+"""
+
+# Next batch of unallocated reconciliations that match a credit. Duplicated
+# payment references resolve to the lowest credit id, as in the Excel upsert.
+SELECT_BATCH_SQL = """
+    SELECT TOP (:batch_size)
+        r.id AS reconciliation_id,
+        ck.credit_id,
+        r.payment_amount,
+        r.transaction_date
+    INTO #alloc_batch
+    FROM reconciliation r
+    JOIN (
+        SELECT payment_reference, MIN(id) AS credit_id
+        FROM credit
+        GROUP BY payment_reference
+    ) ck ON ck.payment_reference = r.payment_reference
+    WHERE r.payment_amount > 0
+      AND NOT EXISTS (
+          SELECT 1 FROM payment_allocation pa WHERE pa.reconciliation_id = r.id
+      )
+    ORDER BY r.transaction_date, r.id
+"""
+
+# Each payment covers the interval (pay_end - payment_amount, pay_end] of the
+# credit's running payment total, and each open installment the interval
+# (inst_end - remaining, inst_end] of its running open balance, both ordered
+# oldest first. The amount applied is the overlap of the two intervals; what
+# exceeds the total open balance is recorded with a NULL installment.
+INSERT_ALLOCATIONS_SQL = """
+    WITH payments AS (
+        SELECT
+            b.reconciliation_id,
+            b.credit_id,
+            b.payment_amount,
+            SUM(CAST(b.payment_amount AS BIGINT)) OVER (
+                PARTITION BY b.credit_id
+                ORDER BY b.transaction_date, b.reconciliation_id
+                ROWS UNBOUNDED PRECEDING
+            ) AS pay_end
+        FROM #alloc_batch b
+    ),
+    open_installments AS (
+        SELECT
+            i.id AS installment_id,
+            i.credit_id,
+            CAST(i.installments_value AS BIGINT) - ISNULL(a.applied, 0) AS remaining,
+            i.due_date,
+            i.installments_number
+        FROM installment i
+        LEFT JOIN (
+            SELECT installment_id, SUM(CAST(amount AS BIGINT)) AS applied
+            FROM payment_allocation
+            WHERE installment_id IS NOT NULL
+            GROUP BY installment_id
+        ) a ON a.installment_id = i.id
+        WHERE i.installment_state <> 'Pagada'
+          AND i.credit_id IN (SELECT credit_id FROM #alloc_batch)
+    ),
+    installments AS (
+        SELECT
+            o.*,
+            SUM(o.remaining) OVER (
+                PARTITION BY o.credit_id
+                ORDER BY o.due_date, o.installments_number, o.installment_id
+                ROWS UNBOUNDED PRECEDING
+            ) AS inst_end
+        FROM open_installments o
+        WHERE o.remaining > 0
+    ),
+    open_totals AS (
+        SELECT credit_id, SUM(remaining) AS total_open
+        FROM installments
+        GROUP BY credit_id
+    )
+    INSERT INTO payment_allocation (reconciliation_id, credit_id, installment_id, amount)
+    SELECT
+        p.reconciliation_id,
+        p.credit_id,
+        i.installment_id,
+        (CASE WHEN p.pay_end < i.inst_end THEN p.pay_end ELSE i.inst_end END)
+        - (CASE WHEN p.pay_end - p.payment_amount > i.inst_end - i.remaining
+                THEN p.pay_end - p.payment_amount
+                ELSE i.inst_end - i.remaining END)
+    FROM payments p
+    JOIN installments i
+        ON i.credit_id = p.credit_id
+        AND i.inst_end - i.remaining < p.pay_end
+        AND p.pay_end - p.payment_amount < i.inst_end
+    UNION ALL
+    SELECT
+        p.reconciliation_id,
+        p.credit_id,
+        NULL,
+        p.pay_end
+        - (CASE WHEN p.pay_end - p.payment_amount > ISNULL(t.total_open, 0)
+                THEN p.pay_end - p.payment_amount
+                ELSE ISNULL(t.total_open, 0) END)
+    FROM payments p
+    LEFT JOIN open_totals t ON t.credit_id = p.credit_id
+    WHERE p.pay_end > ISNULL(t.total_open, 0)
+"""
+
+# Installments whose allocations now cover their value are paid on the date
+# of the payment that completed them
+UPDATE_INSTALLMENTS_SQL = """
+    UPDATE i
+    SET installment_state = 'Pagada',
+        payment_date = a.last_payment_date
+    FROM installment i
+    JOIN (
+        SELECT
+            pa.installment_id,
+            SUM(CAST(pa.amount AS BIGINT)) AS applied,
+            MAX(r.transaction_date) AS last_payment_date
+        FROM payment_allocation pa
+        JOIN reconciliation r ON r.id = pa.reconciliation_id
+        WHERE pa.credit_id IN (SELECT credit_id FROM #alloc_batch)
+          AND pa.installment_id IS NOT NULL
+        GROUP BY pa.installment_id
+    ) a ON a.installment_id = i.id
+    WHERE i.installment_state <> 'Pagada'
+      AND a.applied >= i.installments_value
+"""
+
+# Credits of the batch left without open installments, kept to close them and
+# report their ids (credit has triggers, so UPDATE ... OUTPUT cannot return them)
+SELECT_CLOSED_CREDITS_SQL = """
+    SELECT c.id
+    INTO #alloc_closed
+    FROM credit c
+    WHERE c.id IN (SELECT credit_id FROM #alloc_batch)
+      AND c.credit_state <> :paid_state
+      AND EXISTS (SELECT 1 FROM installment i WHERE i.credit_id = c.id)
+      AND NOT EXISTS (
+          SELECT 1 FROM installment i
+          WHERE i.credit_id = c.id AND i.installment_state <> 'Pagada'
+      )
+"""
+
+UPDATE_CREDITS_SQL = """
+    UPDATE credit
+    SET credit_state = :paid_state
+    WHERE id IN (SELECT id FROM #alloc_closed)
+"""
+
+
+class PaymentAllocationService:
+    """
+    Applies reconciliation payments to the installments of their credit.
+
+    Payments are applied oldest first (by transaction date) to the open
+    installments oldest first (by due date), supporting partial payments and
+    overpayments. Every applied amount is written to ``payment_allocation``,
+    which doubles as the record of processed reconciliations, so the engine
+    is idempotent and can be re-run at any time. Installments fully covered
+    become ``Pagada`` and credits without open installments ``Cancelado``;
+    the balance columns of the affected credits are refreshed in the same
+    transaction.
+
+    The work is done set-based in SQL Server, one batch of
+    ``ALLOCATION_BATCH_SIZE`` reconciliations per transaction.
+
+    Reconciliations loaded before the ledger existed have no ledger rows and
+    would be applied again to the open installments, so the engine stays off
+    (``PAYMENT_ALLOCATION_ENABLED``) until
+    ``credit_management/scripts/payment_allocation_backfill.sql`` has
+    recorded them.
+    """
+
+    async def allocate_pending(self, session: AsyncSession) -> Dict[str, Any]:
+        started = time.perf_counter()
+        results = {
+            "reconciliations_allocated": 0,
+            "allocations_created": 0,
+            "installments_paid": 0,
+            "credits_closed": 0,
+            "closed_credit_ids": [],
+            "balances_refreshed": 0,
+            "batches": 0,
+        }
+        if not settings.PAYMENT_ALLOCATION_ENABLED:
+            logger.info(
+                "Aplicación de pagos desactivada (PAYMENT_ALLOCATION_ENABLED); "
+                "ejecute credit_management/scripts/payment_allocation_backfill.sql "
+                "antes de activarla"
+            )
+            results["enabled"] = False
+            return results
+
+        try:
+            while True:
+                batch = await self._allocate_batch(session)
+                results["batches"] += 1
+                for key, value in batch.items():
+                    results[key] += value
+                if batch["reconciliations_allocated"] < ALLOCATION_BATCH_SIZE:
+                    break
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error aplicando pagos a cuotas: {str(e)}")
+            raise
+
+        results["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Aplicación de pagos completada: {results}")
+        return results
+
+    async def _allocate_batch(self, session: AsyncSession) -> Dict[str, Any]:
+        await session.execute(text(ALLOCATION_LOCK_SQL))
+        await session.execute(text("DROP TABLE IF EXISTS #alloc_batch"))
+
+        selected = await session.execute(
+            text(SELECT_BATCH_SQL), {"batch_size": ALLOCATION_BATCH_SIZE}
+        )
+        allocations = await session.execute(text(INSERT_ALLOCATIONS_SQL))
+        installments = await session.execute(text(UPDATE_INSTALLMENTS_SQL))
+        await session.execute(text("DROP TABLE IF EXISTS #alloc_closed"))
+        await session.execute(
+            text(SELECT_CLOSED_CREDITS_SQL), {"paid_state": CREDIT_PAID_STATE}
+        )
+        await session.execute(
+            text(UPDATE_CREDITS_SQL), {"paid_state": CREDIT_PAID_STATE}
+        )
+        closed = (
+            (await session.execute(text("SELECT id FROM #alloc_closed")))
+            .scalars()
+            .all()
+        )
+        balances = await CreditBalanceService().refresh(
+            session,
+            Credit.id.in_(
+                select(column("credit_id")).select_from(table("#alloc_batch"))
+            ),
+        )
+
+        await session.execute(text("DROP TABLE #alloc_batch"))
+        await session.execute(text("DROP TABLE #alloc_closed"))
+        await session.commit()
+
+        return {
+            "reconciliations_allocated": selected.rowcount,
+            "allocations_created": allocations.rowcount,
+            "installments_paid": installments.rowcount,
+            "credits_closed": len(closed),
+            "closed_credit_ids": list(closed),
+            "balances_refreshed": balances,
+        }
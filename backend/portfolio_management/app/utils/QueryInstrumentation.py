@@ -0,0 +1,259 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events time every statement and add it to the ``RequestQueryStats`` of
+the current request (a context variable), so the counts are exact even with
+concurrent requests on the same engine. ``QueryStatsMiddleware`` opens the
+context for each HTTP request, aggregates the results per route, records
+them in the ``db_queries_per_request`` and ``db_time_seconds`` histograms
+and, in debug mode, returns them as ``X-DB-*`` response headers.
+
+Outside HTTP requests, ``track_queries`` opens the same context. Tests guard
+hot paths with ``query_budget`` (the fixture of the same name in
+``tests/conftest.py``), which fails when the block, or any request served
+while it is open (e.g. through ``TestClient``), runs too many statements:
+
+    with query_budget(5):
+        response = client.get("/api/.../get_credits_detailed/1")
+"""
+
+import contextlib
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from ..config.logger import logger
+from ..config.settings import settings
+from .Metrics import DB_QUERIES_PER_REQUEST, DB_TIME_SECONDS
+
+# Slowest statements kept per request
+SLOW_STATEMENTS_KEPT = 5
+
+# Same statement (ignoring literals) executed this many times in one request
+# is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+# Characters of SQL kept in reports and logs
+STATEMENT_PREVIEW_LENGTH = 300
+
+_START_TIMES_KEY = "query_instrumentation_start"
+_LITERALS = re.compile(r"'[^']*'|\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+# Every open tracking context; nested ones (a request inside a budget) all
+# receive the statement
+_current_stats: ContextVar[Tuple["RequestQueryStats", ...]] = ContextVar(
+    "current_query_stats", default=()
+)
+
+# Callbacks notified with (route, stats) after each instrumented request
+_request_observers: List[Callable[[str, "RequestQueryStats"], None]] = []
+
+
+def _normalize(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestQueryStats:
+    """Statements executed while a tracking context is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Dict[str, Any]] = []
+        self._repetitions: Dict[str, int] = {}
+
+    def record(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+
+        normalized = _normalize(statement)
+        self._repetitions[normalized] = self._repetitions.get(normalized, 0) + 1
+
+        if (
+            len(self.slowest) < SLOW_STATEMENTS_KEPT
+            or duration_ms > self.slowest[-1]["duration_ms"]
+        ):
+            self.slowest.append(
+                {
+                    "statement": normalized[:STATEMENT_PREVIEW_LENGTH],
+                    "duration_ms": round(duration_ms, 2),
+                }
+            )
+            self.slowest.sort(key=lambda item: item["duration_ms"], reverse=True)
+            del self.slowest[SLOW_STATEMENTS_KEPT:]
+
+    @property
+    def repeated_statements(self) -> Dict[str, int]:
+        """Statements executed at least ``N_PLUS_ONE_THRESHOLD`` times."""
+        return {
+            statement[:STATEMENT_PREVIEW_LENGTH]: count
+            for statement, count in self._repetitions.items()
+            if count >= N_PLUS_ONE_THRESHOLD
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "query_count": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "slowest": self.slowest,
+            "repeated_statements": self.repeated_statements,
+        }
+
+
+class QueryStatsRegistry:
+    """Per-route aggregates of the requests seen by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, stats: RequestQueryStats, duration_ms: float):
+        with self._lock:
+            entry = self._routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_time_ms": 0.0,
+                    "request_time_ms": 0.0,
+                    "n_plus_one_requests": 0,
+                },
+            )
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["db_time_ms"] += stats.total_ms
+            entry["request_time_ms"] += duration_ms
+            if stats.repeated_statements:
+                entry["n_plus_one_requests"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "db_time_ms": round(entry["db_time_ms"], 2),
+                    "request_time_ms": round(entry["request_time_ms"], 2),
+                }
+                for route, entry in self._routes.items()
+            }
+
+
+query_stats_registry = QueryStatsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info[_START_TIMES_KEY].pop()) * 1000
+    for stats in _current_stats.get():
+        stats.record(statement, duration_ms)
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_TIMES_KEY):
+        connection.info[_START_TIMES_KEY].pop()
+
+
+def install_query_instrumentation():
+    """Time every statement of every engine in the process (idempotent)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+@contextlib.contextmanager
+def track_queries() -> Iterator[RequestQueryStats]:
+    """Collect the statements executed inside the block."""
+    install_query_instrumentation()
+    stats = RequestQueryStats()
+    token = _current_stats.set(_current_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextlib.contextmanager
+def query_budget(max_queries: int) -> Iterator[RequestQueryStats]:
+    """
+    Fail with ``QueryBudgetExceeded`` if the block, or any single request
+    served while it runs, executes more than ``max_queries`` statements.
+    """
+    over_budget: List[Tuple[str, RequestQueryStats]] = []
+
+    def observe(route: str, request_stats: RequestQueryStats):
+        if request_stats.count > max_queries:
+            over_budget.append((route, request_stats))
+
+    _request_observers.append(observe)
+    try:
+        with track_queries() as stats:
+            yield stats
+    finally:
+        _request_observers.remove(observe)
+
+    if over_budget:
+        route, request_stats = over_budget[0]
+        raise QueryBudgetExceeded(
+            f"{route}: {request_stats.count} consultas ejecutadas, "
+            f"presupuesto {max_queries}: {request_stats.as_dict()}"
+        )
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{stats.count} consultas ejecutadas, presupuesto {max_queries}: "
+            f"{stats.as_dict()}"
+        )
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        started = time.perf_counter()
+        with track_queries() as stats:
+            response = await call_next(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        # Route template, not the raw path, so ids do not create new entries
+        route = request.scope.get("route")
+        path = route.path if route else "unmatched"
+        route_key = f"{request.method} {path}"
+        query_stats_registry.record(route_key, stats, duration_ms)
+        DB_QUERIES_PER_REQUEST.labels(request.method, path).observe(stats.count)
+        DB_TIME_SECONDS.labels(request.method, path).observe(stats.total_ms / 1000)
+        for observer in list(_request_observers):
+            observer(route_key, stats)
+
+        repeated = stats.repeated_statements
+        if repeated:
+            logger.warning(f"Posible N+1 en {route_key}: {repeated}")
+
+        if settings.DEBUG:
+            response.headers["X-DB-Query-Count"] = str(stats.count)
+            response.headers["X-DB-Time-Ms"] = f"{stats.total_ms:.2f}"
+            if stats.slowest:
+                response.headers["X-DB-Slowest-Ms"] = str(
+                    stats.slowest[0]["duration_ms"]
+                )
+            if repeated:
+                response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+        return response
@@ -0,0 +1,65 @@
+-- Columnas de saldo mantenidas en credit (total pagado, pendiente, última
+-- fecha de pago y cuotas vencidas)
+-- Ejecutar en Azure Data Studio o SQL Server Management Studio sobre bases
+-- creadas antes de que el modelo Credit declarara estas columnas
+
+-- 1. Columnas
+IF COL_LENGTH('credit', 'total_paid') IS NULL
+    ALTER TABLE credit ADD total_paid INT NOT NULL
+        CONSTRAINT df_credit_total_paid DEFAULT 0;
+GO
+
+IF COL_LENGTH('credit', 'total_pending') IS NULL
+    ALTER TABLE credit ADD total_pending INT NOT NULL
+        CONSTRAINT df_credit_total_pending DEFAULT 0;
+GO
+
+IF COL_LENGTH('credit', 'last_payment_date') IS NULL
+    ALTER TABLE credit ADD last_payment_date DATE NULL;
+GO
+
+IF COL_LENGTH('credit', 'overdue_installments') IS NULL
+    ALTER TABLE credit ADD overdue_installments INT NOT NULL
+        CONSTRAINT df_credit_overdue_installments DEFAULT 0;
+GO
+
+-- 2. Carga inicial desde payment_allocation y las cuotas
+-- (equivale a ejecutar el trabajo credit_balance_verification)
+UPDATE c
+SET total_paid = b.total_paid,
+    total_pending = b.total_pending,
+    last_payment_date = b.last_payment_date,
+    overdue_installments = b.overdue_installments
+FROM credit c
+JOIN (
+    SELECT
+        cr.id AS credit_id,
+        ISNULL(l.paid, 0) AS total_paid,
+        CASE
+            WHEN i.credit_id IS NULL THEN cr.disbursement_amount - ISNULL(l.paid, 0)
+            WHEN i.total - ISNULL(l.applied, 0) > 0 THEN i.total - ISNULL(l.applied, 0)
+            ELSE 0
+        END AS total_pending,
+        l.last_payment_date,
+        ISNULL(i.overdue, 0) AS overdue_installments
+    FROM credit cr
+    LEFT JOIN (
+        SELECT
+            pa.credit_id,
+            SUM(pa.amount) AS paid,
+            SUM(CASE WHEN pa.installment_id IS NOT NULL THEN pa.amount ELSE 0 END) AS applied,
+            MAX(r.transaction_date) AS last_payment_date
+        FROM payment_allocation pa
+        JOIN reconciliation r ON r.id = pa.reconciliation_id
+        GROUP BY pa.credit_id
+    ) l ON l.credit_id = cr.id
+    LEFT JOIN (
+        SELECT
+            credit_id,
+            SUM(installments_value) AS total,
+            SUM(CASE WHEN installment_state = 'Vencida' THEN 1 ELSE 0 END) AS overdue
+        FROM installment
+        GROUP BY credit_id
+    ) i ON i.credit_id = cr.id
+) b ON b.credit_id = c.id;
+GO
@@ -0,0 +1,76 @@
+-- Índices declarados en los modelos (claves naturales y marcas de sincronización)
+-- Ejecutar en Azure Data Studio o SQL Server Management Studio sobre bases
+-- creadas antes de que los modelos declararan estos índices
+
+-- 1. Referencia de pago del crédito
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_credit_payment_reference')
+    CREATE INDEX ix_credit_payment_reference ON credit (payment_reference);
+GO
+
+-- 2. Número de cuota por crédito
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_installment_credit_id_installments_number')
+    CREATE INDEX ix_installment_credit_id_installments_number
+    ON installment (credit_id, installments_number);
+GO
+
+-- 3. Nombre del gestor
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_manager_name')
+    CREATE INDEX ix_manager_name ON manager (name);
+GO
+
+-- 4. Referencia de pago de la conciliación
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_reconciliation_payment_reference')
+    CREATE INDEX ix_reconciliation_payment_reference ON reconciliation (payment_reference);
+GO
+
+-- 5. Marca de sincronización (updated_at, id) de credit
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_credit_updated_at_id')
+    CREATE INDEX ix_credit_updated_at_id ON credit (updated_at, id);
+GO
+
+-- 6. Marca de sincronización (updated_at, id) de installment
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_installment_updated_at_id')
+    CREATE INDEX ix_installment_updated_at_id ON installment (updated_at, id);
+GO
+
+-- 7. Marca de sincronización (updated_at, id) de portfolio
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_portfolio_updated_at_id')
+    CREATE INDEX ix_portfolio_updated_at_id ON portfolio (updated_at, id);
+GO
+
+-- 8. Marca de sincronización (updated_at, id) de alert
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_alert_updated_at_id')
+    CREATE INDEX ix_alert_updated_at_id ON alert (updated_at, id);
+GO
+
+-- 9. Marca de sincronización (updated_at, id) de reconciliation
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_reconciliation_updated_at_id')
+    CREATE INDEX ix_reconciliation_updated_at_id ON reconciliation (updated_at, id);
+GO
+
+-- 10. Estado de la cuota y fecha de vencimiento (transiciones de mora)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_installment_state_due_date')
+    CREATE INDEX ix_installment_state_due_date ON installment (installment_state, due_date);
+GO
+
+-- 11. Estado del crédito
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_credit_credit_state')
+    CREATE INDEX ix_credit_credit_state ON credit (credit_state);
+GO
+
+-- 12. Cliente del crédito (historial de pagos por cliente)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_credit_client_id')
+    CREATE INDEX ix_credit_client_id ON credit (client_id);
+GO
+
+-- 13. Deduplicación de alertas por crédito, tipo y fecha
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_alert_credit_id_alert_type_alert_date')
+    CREATE INDEX ix_alert_credit_id_alert_type_alert_date
+    ON alert (credit_id, alert_type, alert_date);
+GO
+
+-- 14. Últimas gestiones por cuota
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_portfolio_installment_id_management_date')
+    CREATE INDEX ix_portfolio_installment_id_management_date
+    ON portfolio (installment_id, management_date);
+GO
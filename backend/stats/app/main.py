@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes import router
+from .utils.Metrics import MetricsMiddleware, metrics_endpoint
 
 
 def create_app() -> FastAPI:
@@ -14,6 +15,8 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(MetricsMiddleware)
+    application.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
     # Include routes under a versioned prefix
     application.include_router(router, prefix="/api/stats/v1", tags=["Stats"])
@@ -0,0 +1,61 @@
+import datetime
+from typing import Optional
+
+from app.config.database import get_read_session
+from app.controllers.aging import (
+    AGING_BUCKETS,
+    calculate_aging_buckets,
+    list_aged_credits,
+)
+from app.schemas.analytics import AgingGroupBy
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+# Los días de mora son relativos a hoy: la fecha forma parte de las claves
+@router.get("/aging/buckets")
+async def aging_buckets(
+    request: Request,
+    group_by: Optional[AgingGroupBy] = None,
+    zone: Optional[str] = None,
+    manager_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_session),
+):
+    payload = await kpi_cache.get(
+        ("aging_buckets", datetime.date.today(), group_by, zone, manager_id),
+        lambda: calculate_aging_buckets(db, group_by, zone, manager_id),
+    )
+    return await payload.response(request)
+
+
+@router.get("/aging/credits")
+async def aging_credits(
+    request: Request,
+    bucket: Optional[int] = Query(
+        None,
+        ge=0,
+        le=len(AGING_BUCKETS) - 1,
+        description="Rango: 0 (0-30 días), 1 (31-60), 2 (61-90) o 3 (más de 90)",
+    ),
+    zone: Optional[str] = None,
+    manager_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_session),
+):
+    payload = await kpi_cache.get(
+        (
+            "aging_credits",
+            datetime.date.today(),
+            bucket,
+            zone,
+            manager_id,
+            limit,
+            offset,
+        ),
+        lambda: list_aged_credits(db, bucket, zone, manager_id, limit, offset),
+    )
+    return await payload.response(request)
@@ -1,4 +1,4 @@
-from app.config.database import get_db_session
+from app.config.database import get_read_session
 from app.config.settings import settings
 from app.controllers.analytics import (
     MONTHS,
@@ -6,7 +6,8 @@ from app.controllers.analytics import (
     calculate_money_recovery_by_month,
 )
 from app.schemas.analytics import MesSeleccion
-from fastapi import APIRouter, Depends
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -18,13 +19,18 @@ async def health():
 
 
 @router.get("/money-recovery-month")
-async def money_recovery(db: AsyncSession = Depends(get_db_session)):
-    return await calculate_money_recovery_by_month(db)
+async def money_recovery(
+    request: Request, db: AsyncSession = Depends(get_read_session)
+):
+    payload = await kpi_cache.get(
+        "money_recovery_by_month", lambda: calculate_money_recovery_by_month(db)
+    )
+    return await payload.response(request)
 
 
 @router.post("/promedio-recuperacion-por-mes")
 async def promedio_recuperacion_por_mes(
-    seleccion: MesSeleccion, db: AsyncSession = Depends(get_db_session)
+    seleccion: MesSeleccion, db: AsyncSession = Depends(get_read_session)
 ):
     meses_seleccionados = [mes for mes in MONTHS if getattr(seleccion, mes) is True]
     if not meses_seleccionados:
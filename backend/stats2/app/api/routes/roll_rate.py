@@ -0,0 +1,37 @@
+import datetime
+from typing import Optional
+
+from app.config.database import get_read_session
+from app.controllers.roll_rate import calculate_roll_rates, resolve_snapshot_dates
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+@router.get("/roll-rates")
+async def roll_rates(
+    request: Request,
+    from_date: Optional[datetime.date] = None,
+    to_date: Optional[datetime.date] = None,
+    db: AsyncSession = Depends(get_read_session),
+):
+    if from_date and to_date and from_date >= to_date:
+        raise HTTPException(
+            status_code=400, detail="from_date debe ser anterior a to_date"
+        )
+    dates = await resolve_snapshot_dates(db, from_date, to_date)
+    if dates[0] is not None and dates[0] == dates[1]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ambas fechas corresponden a la instantánea del {dates[0]}",
+        )
+
+    # Las instantáneas no cambian una vez escritas: la matriz de un par de
+    # fechas vale mientras el par sea el mismo, sin importar su antigüedad
+    # (el caché descarta los pares menos usados)
+    payload = await kpi_cache.get(
+        ("roll_rates", *dates), lambda: calculate_roll_rates(db, *dates), dates
+    )
+    return await payload.response(request)
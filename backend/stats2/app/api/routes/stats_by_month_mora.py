@@ -1,7 +1,8 @@
-from app.config.database import get_db_session
+from app.config.database import get_read_session
 from app.config.settings import settings
 from app.controllers.analytics import calculate_installments_by_month
-from fastapi import APIRouter, Depends
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -13,5 +14,10 @@ async def health():
 
 
 @router.get("/installments/by-month")
-async def installments_by_month(db: AsyncSession = Depends(get_db_session)):
-    return await calculate_installments_by_month(db)
+async def installments_by_month(
+    request: Request, db: AsyncSession = Depends(get_read_session)
+):
+    payload = await kpi_cache.get(
+        "installments_by_month", lambda: calculate_installments_by_month(db)
+    )
+    return await payload.response(request)
@@ -0,0 +1,18 @@
+import datetime
+
+from app.config.database import get_read_session
+from app.controllers.vintage import calculate_vintage, data_version
+from app.utils.PayloadCache import kpi_cache
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+@router.get("/vintage")
+async def vintage(request: Request, db: AsyncSession = Depends(get_read_session)):
+    # La matriz se recalcula solo si cambian los datos o el día; cada
+    # consulta cuesta únicamente la de la versión
+    version = (datetime.date.today(), await data_version(db))
+    payload = await kpi_cache.get("vintage", lambda: calculate_vintage(db), version)
+    return await payload.response(request)
@@ -1,6 +1,10 @@
+import asyncio
 import contextlib
-from typing import Any, AsyncIterator
+import logging
+import time
+from typing import Any, AsyncIterator, Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncSession,
@@ -10,19 +14,73 @@ from sqlalchemy.ext.asyncio import (
 
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Commit time of the last transaction applied to the local copy of the
+# database. NULL outside an availability group (e.g. two independent local
+# databases), in which case the replica is considered up to date.
+LAST_COMMIT_SQL = """
+    SELECT last_commit_time
+    FROM sys.dm_hadr_database_replica_states
+    WHERE is_local = 1 AND database_id = DB_ID()
+"""
+
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    """
+    Primary engine for reads and writes plus an optional read replica.
+
+    ``read_session`` serves reporting and KPI queries from the replica while
+    its lag stays within ``max_lag_seconds`` (a negative value disables the
+    check); otherwise, or when the replica is unreachable, it falls back to
+    the primary. The lag is measured at most every ``lag_check_seconds``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        read_host: Optional[str] = None,
+        max_lag_seconds: int = 30,
+        lag_check_seconds: int = 10,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
 
+        self._read_engine = None
+        self._read_sessionmaker = None
+        if read_host:
+            self._read_engine = create_async_engine(read_host, **engine_kwargs)
+            self._read_sessionmaker = async_sessionmaker(
+                autocommit=False, bind=self._read_engine
+            )
+
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self._replica_usable = True
+        self._replica_checked_at = 0.0
+        self._replica_check_lock = asyncio.Lock()
+
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        if self._read_engine is not None:
+            await self._read_engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._read_engine = None
+        self._read_sessionmaker = None
+
+    def pools(self) -> dict[str, Any]:
+        """Connection pools by engine name, for monitoring."""
+        pools = {}
+        if self._engine is not None:
+            pools["primary"] = self._engine.pool
+        if self._read_engine is not None:
+            pools["replica"] = self._read_engine.pool
+        return pools
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -50,10 +108,82 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Session for read-only work, on the replica when it is fresh enough."""
+        if self._sessionmaker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        sessionmaker = self._sessionmaker
+        if self._read_sessionmaker is not None and await self._replica_is_usable():
+            sessionmaker = self._read_sessionmaker
+
+        session = sessionmaker()
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def _replica_is_usable(self) -> bool:
+        if time.monotonic() - self._replica_checked_at < self.lag_check_seconds:
+            return self._replica_usable
+
+        async with self._replica_check_lock:
+            # Another request refreshed it while this one waited
+            if time.monotonic() - self._replica_checked_at < self.lag_check_seconds:
+                return self._replica_usable
+
+            try:
+                lag = await self._replica_lag_seconds()
+                usable = self.max_lag_seconds < 0 or lag <= self.max_lag_seconds
+                if not usable:
+                    logger.warning(
+                        f"Réplica de lectura con {lag:.0f}s de retraso; "
+                        "las lecturas usan la base principal"
+                    )
+            except Exception as e:
+                usable = False
+                logger.warning(
+                    f"Réplica de lectura no disponible, se usa la base principal: {str(e)}"
+                )
+
+            self._replica_usable = usable
+            self._replica_checked_at = time.monotonic()
+            return usable
 
-sessionmanager = DatabaseSessionManager(settings.DATABASE_URL, {"echo": True})
+    async def _replica_lag_seconds(self) -> float:
+        if self.max_lag_seconds < 0:
+            return 0.0
+
+        async with self._read_engine.connect() as connection:
+            if connection.dialect.name != "mssql":
+                return 0.0
+            replica_commit = (await connection.execute(text(LAST_COMMIT_SQL))).scalar()
+        async with self._engine.connect() as connection:
+            primary_commit = (await connection.execute(text(LAST_COMMIT_SQL))).scalar()
+
+        if replica_commit is None or primary_commit is None:
+            return 0.0
+        return max((primary_commit - replica_commit).total_seconds(), 0.0)
+
+
+sessionmanager = DatabaseSessionManager(
+    settings.DATABASE_URL,
+    {"echo": True},
+    read_host=settings.READ_DATABASE_URL,
+    max_lag_seconds=settings.DB_READ_MAX_LAG_SECONDS,
+    lag_check_seconds=settings.DB_READ_LAG_CHECK_SECONDS,
+)
 
 
 async def get_db_session():
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_session():
+    async with sessionmanager.read_session() as session:
+        yield session
@@ -1,10 +1,11 @@
 import logging  # para manejar los logs o mensajes de error
 import pathlib  # para manejar rutas de archivos
+from typing import Optional
 
 from decouple import Config, RepositoryEnv  # para manejar las variables de entorno
-from pydantic_settings import (
+from pydantic_settings import (  # para manejar las configuraciones de la aplicacion
     BaseSettings,
-)  # para manejar las configuraciones de la aplicacion
+)
 
 logging.basicConfig(
     level=logging.INFO,  # nivel mínimo que quieres mostrar (DEBUG, INFO, WARNING, etc.)
@@ -41,6 +42,27 @@ class Stats2Settings(BaseSettings):
     DB_PORT: int = config("DB_PORT", cast=int, default=1433)
     DB_NAME: str = config("DB_NAME")
 
+    # Read replica (opcional): lecturas de reportes y KPI
+    DB_READ_HOST: Optional[str] = config("DB_READ_HOST", default=None)
+    # decouple también aplica cast al default: int(None) fallaría sin réplica
+    DB_READ_PORT: Optional[int] = config(
+        "DB_READ_PORT", cast=lambda value: int(value) if value else None, default=None
+    )
+    DB_READ_USER: Optional[str] = config("DB_READ_USER", default=None)
+    DB_READ_PASSWORD: Optional[str] = config("DB_READ_PASSWORD", default=None)
+    DB_READ_NAME: Optional[str] = config("DB_READ_NAME", default=None)
+    DB_READ_MAX_LAG_SECONDS: int = config(
+        "DB_READ_MAX_LAG_SECONDS", cast=int, default=30
+    )
+    DB_READ_LAG_CHECK_SECONDS: int = config(
+        "DB_READ_LAG_CHECK_SECONDS", cast=int, default=10
+    )
+
+    # Segundos que los resultados KPI se sirven desde memoria
+    KPI_CACHE_SECONDS: int = config("KPI_CACHE_SECONDS", cast=int, default=60)
+    # Máximo de resultados KPI en memoria; se descartan los menos usados
+    KPI_CACHE_ENTRIES: int = config("KPI_CACHE_ENTRIES", cast=int, default=256)
+
     class Config:
         case_sensitive = True
         env_file = f"{ROOT_DIR}/.env"
@@ -51,6 +73,16 @@ class Stats2Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes"
 
+    @property
+    def READ_DATABASE_URL(self) -> Optional[str]:
+        if not self.DB_READ_HOST:
+            return None
+        user = self.DB_READ_USER or self.DB_USER
+        password = self.DB_READ_PASSWORD or self.DB_PASSWORD
+        port = self.DB_READ_PORT or self.DB_PORT
+        name = self.DB_READ_NAME or self.DB_NAME
+        return f"{self.DB_DRIVER}://{user}:{password}@{self.DB_READ_HOST}:{port}/{name}?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes&Encrypt=yes&ApplicationIntent=ReadOnly"
+
     @property
     def fast_kwargs(self) -> dict:
         return {
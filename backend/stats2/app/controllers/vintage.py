@@ -0,0 +1,203 @@
+import datetime
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from app.models.credit import Credit
+from app.models.installment import Installment
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+INSTALLMENT_PAID = "Pagada"
+
+# Una cuota cuenta como mora de cosecha desde este día después de vencer
+DELINQUENCY_DAYS = 30
+
+COLUMNS = [
+    "credit_id",
+    "disbursement_date",
+    "disbursement_amount",
+    "due_date",
+    "installments_value",
+    "installment_state",
+    "payment_date",
+]
+
+
+async def data_version(session: AsyncSession) -> str:
+    """
+    Versión de los datos de cosechas: el ``updated_at`` más reciente de
+    créditos y cuotas (indexados, mantenidos por triggers) y cuántos hay de
+    cada uno, para notar también los borrados.
+    """
+    query = select(
+        *(
+            select(expression).scalar_subquery()
+            for expression in (
+                func.max(Credit.updated_at),
+                func.count(Credit.id),
+                func.max(Installment.updated_at),
+                func.count(Installment.id),
+            )
+        )
+    )
+    row = (await session.execute(query)).one()
+    return "|".join(str(value) for value in row)
+
+
+async def fetch_vintage_frame(session: AsyncSession) -> pd.DataFrame:
+    """Columnas de todas las cuotas con su crédito, en una sola consulta."""
+    query = select(
+        Credit.id,
+        Credit.disbursement_date,
+        Credit.disbursement_amount,
+        Installment.due_date,
+        # Float en la base: convertir millones de Decimal en Python es lento
+        cast(Installment.installments_value, Float),
+        Installment.installment_state,
+        Installment.payment_date,
+    ).outerjoin(Installment, Installment.credit_id == Credit.id)
+    result = await session.execute(query)
+    return pd.DataFrame.from_records(result.all(), columns=COLUMNS)
+
+
+def _dates(values: pd.Series) -> np.ndarray:
+    """Fechas como ``datetime64[D]``; pandas convierte los ``date`` en C."""
+    return pd.to_datetime(values).to_numpy("datetime64[D]")
+
+
+def _months(dates: np.ndarray) -> np.ndarray:
+    """Meses desde 1970-01 de fechas ``datetime64[D]`` (NaT queda negativo)."""
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+def _cumulative(index: np.ndarray, weights: np.ndarray, shape) -> np.ndarray:
+    """Suma ``weights`` en las celdas planas ``index`` y acumula por mes."""
+    grid = np.bincount(index, weights=weights, minlength=shape[0] * shape[1])
+    return grid.reshape(shape).cumsum(axis=1)
+
+
+def vintage_matrix(frame: pd.DataFrame, today: datetime.date) -> Dict:
+    """
+    Matriz de cosechas: cohorte (mes de desembolso) × meses en libros.
+
+    Para cada cohorte y mes en libros ``k``, observado al cierre del mes
+    (hoy en el mes en curso):
+
+    - ``delinquency``: saldo de cuotas con más de ``DELINQUENCY_DAYS`` días
+      vencidas y sin pagar, sobre el valor total de las cuotas de la cohorte.
+    - ``recovery``: valor pagado de las cuotas vencidas hasta ese mes, sobre
+      el valor vencido.
+
+    Todo se calcula sobre arreglos por columna: cada cuota aporta a la celda
+    del mes en que empieza (y termina) su efecto y la suma acumulada por fila
+    da el valor de cada mes, sin recorrer cuotas ni meses en Python. Las
+    celdas aún no observadas son ``None``. Los créditos con desembolso
+    posterior a ``today`` aún no forman cohorte y se omiten.
+    """
+    as_of = np.datetime64(today, "D")
+    current = _months(np.array([as_of]))[0]
+    frame = frame[_dates(frame["disbursement_date"]) <= as_of]
+
+    credits = frame.drop_duplicates("credit_id")
+    disbursed = _dates(credits["disbursement_date"])
+    if not len(credits):
+        return {
+            "as_of": today.strftime("%Y-%m-%d"),
+            "delinquency_days": DELINQUENCY_DAYS,
+            "months_on_book": [],
+            "cohorts": [],
+        }
+    first = _months(disbursed).min()
+    # Columna extra al final: destino de lo que ocurre después de hoy
+    rows = int(current - first) + 1
+    shape = (rows, rows + 1)
+    beyond = rows
+
+    sizes = (
+        credits.assign(cohort=_months(disbursed) - first)
+        .groupby("cohort")
+        .agg(
+            credits=("credit_id", "size"),
+            disbursed_amount=("disbursement_amount", "sum"),
+        )
+        .reindex(range(rows), fill_value=0)
+    )
+
+    installments = frame[frame["due_date"].notna()]
+    cohort = _months(_dates(installments["disbursement_date"])) - first
+    due = _dates(installments["due_date"])
+    value = installments["installments_value"].to_numpy(dtype=np.float64)
+    paid = installments["installment_state"].to_numpy() == INSTALLMENT_PAID
+    # Pagadas sin fecha de pago: se toman pagadas al vencer
+    payment = _dates(installments["payment_date"])
+    payment = np.where(paid & np.isnat(payment), due, payment)
+
+    def offset(months: np.ndarray) -> np.ndarray:
+        return np.clip(months - first - cohort, 0, beyond)
+
+    due_on_book = offset(_months(due))
+    paid_on_book = np.where(paid, offset(_months(payment)), beyond)
+    row_start = cohort * shape[1]
+
+    scheduled = np.bincount(cohort, weights=value, minlength=rows)
+    due_by = _cumulative(row_start + due_on_book, value, shape)
+    collected = _cumulative(
+        row_start + np.maximum(due_on_book, paid_on_book), value, shape
+    )
+
+    # Mora: desde el mes en que la cuota cumple DELINQUENCY_DAYS días vencida
+    # (si ya ocurrió) hasta el mes en que se paga
+    late = due + np.timedelta64(DELINQUENCY_DAYS + 1, "D")
+    late_on_book = np.where(late <= as_of, offset(_months(late)), beyond)
+    late_on_book = np.minimum(late_on_book, paid_on_book)
+    overdue = _cumulative(row_start + late_on_book, value, shape) - _cumulative(
+        row_start + paid_on_book, value, shape
+    )
+
+    due_by, collected, overdue = (
+        grid[:, :beyond] for grid in (due_by, collected, overdue)
+    )
+    observed = np.arange(rows)[None, :] <= (rows - 1 - np.arange(rows))[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delinquency = np.where(
+            observed & (scheduled[:, None] > 0), overdue / scheduled[:, None], np.nan
+        )
+        recovery = np.where(observed & (due_by > 0), collected / due_by, np.nan)
+    delinquency = np.round(delinquency, 4)
+    recovery = np.round(recovery, 4)
+
+    labels = np.arange(first, first + rows).astype("datetime64[M]").astype(str)
+    cohorts = []
+    for i, label in enumerate(labels):
+        if not sizes["credits"].iat[i]:
+            continue
+        months = rows - i
+        cohorts.append(
+            {
+                "cohort": str(label),
+                "credits": int(sizes["credits"].iat[i]),
+                "disbursed_amount": float(sizes["disbursed_amount"].iat[i]),
+                "scheduled_amount": float(scheduled[i]),
+                "delinquency": [
+                    None if np.isnan(x) else x for x in delinquency[i, :months].tolist()
+                ],
+                "recovery": [
+                    None if np.isnan(x) else x for x in recovery[i, :months].tolist()
+                ],
+            }
+        )
+
+    return {
+        "as_of": today.strftime("%Y-%m-%d"),
+        "delinquency_days": DELINQUENCY_DAYS,
+        "months_on_book": list(range(rows)),
+        "cohorts": cohorts,
+    }
+
+
+async def calculate_vintage(session: AsyncSession) -> Dict:
+    """Matriz de cosechas de toda la cartera (ver ``vintage_matrix``)."""
+    frame = await fetch_vintage_frame(session)
+    return await run_in_threadpool(vintage_matrix, frame, datetime.date.today())
@@ -6,6 +6,7 @@ from .credit import Credit  # noqa: F401
 from .installment import Installment  # noqa: F401
 from .manager import Manager  # noqa: F401
 from .portafolio import Portfolio  # noqa: F401
+from .portfolio_snapshot import PortfolioSnapshot  # noqa: F401
 from .reconciliation import Reconciliation  # noqa: F401
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "Installment",
     "Manager",
     "Portfolio",
+    "PortfolioSnapshot",
     "Reconciliation",
 ]
@@ -0,0 +1,21 @@
+import datetime
+
+from sqlalchemy import Date, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PortfolioSnapshot(Base):
+    # Tabla de solo inserciones, escrita cada noche por credit_management
+    __tablename__ = "portfolio_snapshot"
+
+    snapshot_date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    credit_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=False
+    )
+    bucket: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<PortfolioSnapshot(snapshot_date={self.snapshot_date}, credit_id={self.credit_id}, bucket={self.bucket})>"
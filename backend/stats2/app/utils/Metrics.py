@@ -0,0 +1,369 @@
+"""
+Prometheus metrics for the service, exposed in text format at ``/metrics``.
+
+The registry is a minimal implementation of the exposition format tuned for
+the request path: label values are resolved once to a child object that is
+cached by a tuple key, and samples are plain attribute updates on the event
+loop thread, so recording a request takes no locks and allocates no label
+dictionaries. Values are only formatted when ``/metrics`` is scraped.
+
+Usage from application code:
+
+    IMPORT_ROWS.labels("upsert", "credits").inc(120)
+    with REPORT_RENDER_SECONDS.labels("pdf").time():
+        ...
+"""
+
+import abc
+import bisect
+import contextlib
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; made cumulative when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        registry.register(self)
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """Sample holder for one combination of label values."""
+
+    def labels(self, *values: Any):
+        """Child for the given label values, in ``labelnames`` order."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} espera las etiquetas {self.labelnames}, "
+                    f"recibió {values}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            labels = _label_text(self.labelnames, [str(value) for value in values])
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        bucket_names = self.labelnames + ("le",)
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for values, child in list(self._children.items()):
+            values = [str(value) for value in values]
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                labels = _label_text(bucket_names, values + [bound])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _label_text(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Callback run before each scrape to refresh sampled gauges."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                # A failing collector must not break the whole scrape
+                pass
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Peticiones HTTP atendidas",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por ruta",
+    ("method", "route"),
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Tamaño del cuerpo de las respuestas HTTP",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Peticiones HTTP en curso",
+)
+
+# Database work per request (QueryStatsMiddleware)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Sentencias SQL ejecutadas por petición HTTP",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_SECONDS = Histogram(
+    "db_time_seconds",
+    "Tiempo en base de datos por petición HTTP",
+    ("method", "route"),
+)
+
+# Database connection pools
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Conexiones del pool por motor y estado",
+    ("engine", "state"),
+)
+
+# Background work
+IMPORT_ROWS = Counter(
+    "excel_import_rows_total",
+    "Filas procesadas por las cargas de Excel",
+    ("mode", "entity"),
+)
+IMPORT_SECONDS = Histogram(
+    "excel_import_duration_seconds",
+    "Duración de las cargas de Excel",
+    ("mode", "status"),
+    buckets=JOB_BUCKETS,
+)
+REPORT_RENDER_SECONDS = Histogram(
+    "report_render_duration_seconds",
+    "Tiempo de generación de reportes",
+    ("format", "status"),
+    buckets=JOB_BUCKETS,
+)
+REPORT_CACHE_REQUESTS = Counter(
+    "report_cache_requests_total",
+    "Consultas a la caché de reportes por resultado",
+    ("result",),
+)
+PAYMENT_GATEWAY_SECONDS = Histogram(
+    "payment_gateway_request_duration_seconds",
+    "Latencia de las llamadas a la pasarela de pagos",
+    ("operation", "outcome"),
+)
+
+# Logging
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Registros de log descartados por muestreo o por cola llena",
+    ("logger", "reason"),
+)
+
+
+def register_pool_metrics(pools: Callable[[], Dict[str, Any]]):
+    """
+    Sample the connection pools returned by ``pools`` (name -> SQLAlchemy
+    pool) on every scrape.
+    """
+
+    def collect():
+        for name, pool in pools().items():
+            for state, value in (
+                ("size", pool.size()),
+                ("checked_out", pool.checkedout()),
+                ("checked_in", pool.checkedin()),
+                ("overflow", max(pool.overflow(), 0)),
+            ):
+                DB_POOL_CONNECTIONS.labels(name, state).set(value)
+
+    registry.add_collector(collect)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request count, latency, response
+    size and in-flight requests. Routes are labelled with their template
+    (``/get_credit_by_id/{credit_id}``) to keep cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # (method, route, status) -> (count, latency, size) children
+        self._children: Dict[Tuple[str, str, int], Tuple[Any, Any, Any]] = {}
+        self._in_flight = HTTP_IN_FLIGHT.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self._in_flight.value += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_flight.value -= 1
+            route: Optional[Any] = scope.get("route")
+            key = (scope["method"], route.path if route else "unmatched", status)
+            children = self._children.get(key)
+            if children is None:
+                method, path, _ = key
+                children = self._children[key] = (
+                    HTTP_REQUESTS.labels(method, path, str(status)),
+                    HTTP_REQUEST_SECONDS.labels(method, path),
+                    HTTP_RESPONSE_BYTES.labels(method, path),
+                )
+            children[0].value += 1
+            children[1].observe(time.perf_counter() - started)
+            children[2].observe(size)
@@ -0,0 +1,93 @@
+import datetime
+
+import pandas as pd
+from app.controllers.vintage import COLUMNS, vintage_matrix
+
+TODAY = datetime.date(2025, 1, 15)
+
+
+def frame(*rows) -> pd.DataFrame:
+    return pd.DataFrame.from_records(rows, columns=COLUMNS)
+
+
+def test_vintage_matrix_by_cohort():
+    result = vintage_matrix(
+        frame(
+            (
+                1,
+                datetime.date(2024, 11, 5),
+                1000.0,
+                datetime.date(2024, 12, 5),
+                600.0,
+                "Pagada",
+                datetime.date(2024, 12, 5),
+            ),
+            (
+                1,
+                datetime.date(2024, 11, 5),
+                1000.0,
+                datetime.date(2025, 1, 5),
+                600.0,
+                "Vencida",
+                None,
+            ),
+        ),
+        TODAY,
+    )
+
+    assert result["months_on_book"] == [0, 1, 2]
+    [cohort] = result["cohorts"]
+    assert cohort["cohort"] == "2024-11"
+    assert cohort["credits"] == 1
+    assert cohort["scheduled_amount"] == 1200.0
+    assert cohort["recovery"] == [None, 1.0, 0.5]
+    # La segunda cuota lleva 10 días vencida: aún no es mora de cosecha
+    assert cohort["delinquency"] == [0.0, 0.0, 0.0]
+
+
+def test_vintage_matrix_skips_credits_disbursed_after_today():
+    result = vintage_matrix(
+        frame(
+            (
+                1,
+                datetime.date(2024, 5, 1),
+                1000.0,
+                datetime.date(2024, 6, 1),
+                100.0,
+                "Pagada",
+                datetime.date(2024, 6, 1),
+            ),
+            (
+                2,
+                datetime.date(2025, 3, 1),
+                500.0,
+                datetime.date(2025, 4, 1),
+                100.0,
+                "Pendiente",
+                None,
+            ),
+        ),
+        TODAY,
+    )
+
+    assert [cohort["cohort"] for cohort in result["cohorts"]] == ["2024-05"]
+    assert len(result["months_on_book"]) == 9
+
+
+def test_vintage_matrix_only_future_credits():
+    result = vintage_matrix(
+        frame(
+            (
+                2,
+                datetime.date(2025, 3, 1),
+                500.0,
+                datetime.date(2025, 4, 1),
+                100.0,
+                "Pendiente",
+                None,
+            ),
+        ),
+        TODAY,
+    )
+
+    assert result["cohorts"] == []